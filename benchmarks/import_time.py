@@ -0,0 +1,58 @@
+"""
+Measures how long importing parts of fisher_py takes in a fresh interpreter and whether
+the import loads the .NET runtime. Usage:
+
+    python -m benchmarks.import_time [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+STATEMENTS = [
+    'import fisher_py',
+    'import fisher_py.scan_index_cache',
+    'import fisher_py.export.numpress',
+    'from fisher_py import RawFile',
+]
+
+_MEASURE = '''
+import sys, time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start, 'clr' in sys.modules)
+'''
+
+
+def measure_import(statement: str, repeat: int):
+    """
+    Run an import statement in fresh interpreters
+    :param statement: The import statement
+    :param repeat: Number of interpreters to start
+    :returns: Tuple of (median seconds, whether the .NET runtime was loaded)
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([SRC_DIR] + ([env['PYTHONPATH']] if 'PYTHONPATH' in env else []))
+
+    times, runtime_loaded = list(), False
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', _MEASURE.format(statement=statement)], env=env, check=True, capture_output=True, text=True).stdout
+        seconds, loaded = output.split()
+        times.append(float(seconds))
+        runtime_loaded = loaded == 'True'
+    return statistics.median(times), runtime_loaded
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='number of fresh interpreters per statement')
+    args = parser.parse_args()
+
+    for statement in STATEMENTS:
+        seconds, runtime_loaded = measure_import(statement, args.repeat)
+        print(f'{statement:<40} {seconds * 1000:8.1f} ms   .NET runtime loaded: {runtime_loaded}')
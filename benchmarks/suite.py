@@ -0,0 +1,300 @@
+"""
+Benchmark suite for fisher_py. The raw file benchmarks run on the bundled test file (or any
+other raw file), the synthetic benchmarks on generated data of configurable size. Results
+are written as JSON and can be compared against a stored baseline:
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.2
+
+With --compare the exit code is 1 if a benchmark got slower than the threshold allows.
+"""
+
+from typing import Callable, Dict, List, Tuple
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import numpy as np
+
+DEFAULT_RAW_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'data', 'Angiotensin_325-CID.raw')
+PRECURSOR_MZ = 325.0
+FRAGMENT_MZ = 464.2491
+
+# name -> (group, factory). A factory receives the benchmark context and returns the
+# function to time together with the number of items it processes per run.
+_BENCHMARKS: Dict[str, Tuple[str, Callable[[dict], Tuple[Callable[[], None], int]]]] = dict()
+
+
+def benchmark(name: str, group: str):
+    """
+    Register a benchmark factory
+    :param name: Unique name of the benchmark (key in the result file)
+    :param group: 'raw' for benchmarks reading the raw file, 'synthetic' for generated data
+    """
+    def register(factory):
+        _BENCHMARKS[name] = (group, factory)
+        return factory
+    return register
+
+
+@benchmark('raw_file_init', 'raw')
+def _raw_file_init(context: dict):
+    from fisher_py.raw_file import RawFile
+    path = context['raw_file_path']
+    return lambda: RawFile(path), 1
+
+
+@benchmark('scan_reads', 'raw')
+def _scan_reads(context: dict):
+    from fisher_py.raw_file import RawFile
+    raw_file = RawFile(context['raw_file_path'], spectrum_cache_size=0, event_string_cache_size=0)
+    scan_numbers = list(range(raw_file.first_scan, raw_file.last_scan + 1)) * context['replicate']
+
+    def run():
+        for scan_number in scan_numbers:
+            raw_file.get_scan_from_scan_number(scan_number)
+    return run, len(scan_numbers)
+
+
+@benchmark('store_scan_reads', 'raw')
+def _store_scan_reads(context: dict):
+    from fisher_py.store import SpectralStore, write_store
+    # the directory is removed when the benchmark function is garbage collected
+    temp_dir = tempfile.TemporaryDirectory()
+    path = os.path.join(temp_dir.name, 'store')
+    write_store(context['raw_file_path'], path)
+    store = SpectralStore(path)
+    scan_numbers = np.random.default_rng(0).permutation(np.arange(store.first_scan, store.last_scan + 1).repeat(context['replicate'])).tolist()
+
+    def run(temp_dir=temp_dir):
+        for scan_number in scan_numbers:
+            store.get_scan_from_scan_number(scan_number, copy=False)
+    return run, len(scan_numbers)
+
+
+@benchmark('chromatogram', 'raw')
+def _chromatogram(context: dict):
+    from fisher_py.raw_file import RawFile
+    raw_file = RawFile(context['raw_file_path'])
+    return lambda: raw_file.get_chromatogram(FRAGMENT_MZ, 10, ms_filter='ms2'), 1
+
+
+@benchmark('chromatograms_batch', 'raw')
+def _chromatograms_batch(context: dict):
+    from fisher_py.raw_file import RawFile
+    raw_file = RawFile(context['raw_file_path'])
+    mzs = np.linspace(150, 1000, 100 * context['replicate'])
+    return lambda: raw_file.get_chromatograms(mzs, 10, ms_filter='ms2'), len(mzs)
+
+
+@benchmark('chromatograms_index', 'raw')
+def _chromatograms_index(context: dict):
+    from fisher_py.raw_file import RawFile
+    raw_file = RawFile(context['raw_file_path'])
+    raw_file.get_xic_index('ms2')
+    mzs = np.linspace(150, 1000, 100 * context['replicate'])
+    return lambda: raw_file.get_chromatograms(mzs, 10, ms_filter='ms2', engine='index'), len(mzs)
+
+
+@benchmark('tic_ms2', 'raw')
+def _tic_ms2(context: dict):
+    from fisher_py.raw_file import RawFile
+    raw_file = RawFile(context['raw_file_path'])
+    return lambda: raw_file.get_tic_ms2(PRECURSOR_MZ), 1
+
+
+@benchmark('tic_ms2_from_peaks', 'raw')
+def _tic_ms2_from_peaks(context: dict):
+    from fisher_py.raw_file import RawFile
+    raw_file = RawFile(context['raw_file_path'], spectrum_cache_size=0, event_string_cache_size=0)
+    return lambda: raw_file.get_tic_ms2(PRECURSOR_MZ, from_peaks=True), 1
+
+
+@benchmark('averaged_ms2_scans', 'raw')
+def _averaged_ms2_scans(context: dict):
+    from fisher_py.raw_file import RawFile
+    raw_file = RawFile(context['raw_file_path'])
+    return lambda: raw_file.get_averaged_ms2_scans(raw_file.first_scan, raw_file.last_scan, PRECURSOR_MZ), 1
+
+
+@benchmark('mgf_export', 'raw')
+def _mgf_export(context: dict):
+    from fisher_py.export.mgf import write_mgf
+    path = context['raw_file_path']
+    replicate = context['replicate']
+
+    def run():
+        for _ in range(replicate):
+            write_mgf(path, io.StringIO())
+    return run, replicate
+
+
+@benchmark('trailer_table', 'raw')
+def _trailer_table(context: dict):
+    from fisher_py.raw_file_reader import RawFileAccess
+    from fisher_py.data import Device
+    access = RawFileAccess(context['raw_file_path'])
+    access.select_instrument(Device.MS, 1)
+    return lambda: access.trailer_table(), 1
+
+
+def _synthetic_spectra(context: dict) -> List[Tuple[np.ndarray, np.ndarray]]:
+    # spectra with 500 peaks each, scaled with the replicate factor
+    rng = np.random.default_rng(0)
+    return [(np.sort(rng.uniform(150, 2000, 500)), rng.exponential(1e5, 500)) for _ in range(1000 * context['replicate'])]
+
+
+@benchmark('synthetic_xic_extract', 'synthetic')
+def _synthetic_xic_extract(context: dict):
+    from fisher_py.xic_index import XicIndex
+    spectra = _synthetic_spectra(context)
+    masses = np.concatenate([m for m, _ in spectra])
+    intensities = np.concatenate([i for _, i in spectra])
+    scan_positions = np.repeat(np.arange(len(spectra), dtype=np.int32), [len(m) for m, _ in spectra])
+    order = np.argsort(masses, kind='stable')
+    scan_numbers = np.arange(1, len(spectra) + 1, dtype=np.int32)
+    xic_index = XicIndex(scan_numbers, scan_numbers / 100.0, masses[order], intensities[order], scan_positions[order])
+
+    mzs = np.random.default_rng(1).uniform(150, 2000, 5000)
+    return lambda: xic_index.extract(mzs, 10), len(mzs)
+
+
+@benchmark('synthetic_mgf_writer', 'synthetic')
+def _synthetic_mgf_writer(context: dict):
+    from fisher_py.export.mgf import MgfSpectrum, MgfWriter
+    spectra = [MgfSpectrum(n, n / 100.0, m, i, precursor_mz=500.0, charge=2) for n, (m, i) in enumerate(_synthetic_spectra(context), 1)]
+
+    def run():
+        writer = MgfWriter(io.StringIO())
+        writer.write_all(spectra)
+        writer.flush()
+    return run, len(spectra)
+
+
+@benchmark('synthetic_numpress', 'synthetic')
+def _synthetic_numpress(context: dict):
+    from fisher_py.export.numpress import encode_linear, encode_slof
+    spectra = _synthetic_spectra(context)
+    masses = np.concatenate([m for m, _ in spectra])
+    intensities = np.concatenate([i for _, i in spectra])
+
+    def run():
+        encode_linear(masses)
+        encode_slof(intensities)
+    return run, len(masses)
+
+
+def run_benchmarks(raw_file_path: str=DEFAULT_RAW_FILE, names: List[str]=None, repeat: int=5, replicate: int=1, log: Callable[[str], None]=None) -> dict:
+    """
+    Run benchmarks
+    :param raw_file_path: Raw file used by the raw file benchmarks
+    :param names: Names of the benchmarks to run (all by default)
+    :param repeat: Number of timed runs per benchmark
+    :param replicate: Factor by which the workload of scalable benchmarks is multiplied
+    :param log: Optional function receiving a line per finished benchmark
+    :returns: Results (as written to the JSON file)
+    """
+    context = {'raw_file_path': raw_file_path, 'replicate': replicate}
+    results = dict()
+
+    for name, (group, factory) in _BENCHMARKS.items():
+        if names is not None and name not in names:
+            continue
+
+        run, items = factory(context)
+        run()  # warm up (caches, JIT of the .NET code)
+        times = list()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+
+        median = statistics.median(times)
+        results[name] = {'group': group, 'median': median, 'min': min(times), 'repeat': repeat, 'items': items, 'median_per_item': median / items}
+        if log is not None:
+            log(f'{name:<24} {median * 1000:10.2f} ms   ({median / items * 1e6:.2f} us/item)')
+
+    return {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'raw_file': os.path.basename(raw_file_path),
+            'replicate': replicate,
+        },
+        'results': results,
+    }
+
+
+def compare_results(current: dict, baseline: dict, threshold: float=0.1) -> List[dict]:
+    """
+    Compare results with a baseline (benchmarks missing in either are skipped)
+    :param current: Results of run_benchmarks
+    :param baseline: Stored results of run_benchmarks
+    :param threshold: Allowed relative slowdown of the median (0.1 = 10 %)
+    :returns: Row per benchmark with baseline and current median, ratio and whether it regressed
+    """
+    rows = list()
+    for name, result in current['results'].items():
+        baseline_result = baseline['results'].get(name)
+        if baseline_result is None:
+            continue
+
+        # compare per item, so results of runs with a different replicate factor stay comparable
+        ratio = result['median_per_item'] / baseline_result['median_per_item']
+        rows.append({
+            'name': name,
+            'baseline': baseline_result['median'],
+            'current': result['median'],
+            'ratio': ratio,
+            'regressed': ratio > 1 + threshold,
+        })
+    return rows
+
+
+def main(args: List[str]=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--raw-file', default=DEFAULT_RAW_FILE, help='raw file used by the raw file benchmarks')
+    parser.add_argument('--benchmark', action='append', dest='names', help='run only this benchmark (can be repeated)')
+    parser.add_argument('--repeat', type=int, default=5, help='number of timed runs per benchmark')
+    parser.add_argument('--replicate', type=int, default=1, help='workload factor for scalable benchmarks (larger synthetic runs)')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON file with baseline results')
+    parser.add_argument('--threshold', type=float, default=0.1, help='allowed relative slowdown in compare mode')
+    args = parser.parse_args(args)
+
+    results = run_benchmarks(args.raw_file, args.names, args.repeat, args.replicate, log=print)
+
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare is None:
+        return 0
+
+    with open(args.compare, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    rows = compare_results(results, baseline, args.threshold)
+    print()
+    print(f'{"benchmark":<24} {"baseline":>12} {"current":>12} {"ratio":>8}')
+    for row in rows:
+        flag = '  REGRESSED' if row['regressed'] else ''
+        print(f'{row["name"]:<24} {row["baseline"] * 1000:10.2f}ms {row["current"] * 1000:10.2f}ms {row["ratio"]:8.2f}{flag}')
+    return 1 if any(row['regressed'] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1 +1,17 @@
-from fisher_py.raw_file import RawFile
+from typing import TYPE_CHECKING
+from fisher_py.lazy_attributes import install_lazy_attributes
+
+if TYPE_CHECKING:
+    from fisher_py.raw_file import RawFile, AveragingWindow
+    from fisher_py.async_raw_file import AsyncRawFile
+    from fisher_py.store import SpectralStore, write_store
+
+# attributes are imported on first access, so that "import fisher_py" (and modules
+# which do not depend on .NET) do not load the .NET runtime
+install_lazy_attributes(globals(), {
+    'RawFile': 'fisher_py.raw_file',
+    'AveragingWindow': 'fisher_py.raw_file',
+    'AsyncRawFile': 'fisher_py.async_raw_file',
+    'SpectralStore': 'fisher_py.store',
+    'write_store': 'fisher_py.store',
+})
@@ -0,0 +1,174 @@
+from __future__ import annotations
+from typing import AsyncIterator, Callable, List, Tuple, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from fisher_py.raw_file_reader import RawFileAccess, ThreadAccessorPool
+from fisher_py.raw_file_reader.data_model import PackedScans
+from fisher_py.raw_file import _read_chromatogram_, _read_spectrum_
+from fisher_py.data.business import TraceType, MassOptions, CentroidStream, Scan, ChromatogramTraceSettings
+from fisher_py.data.business.chromatogram_signal import ChromatogramData
+from fisher_py.data import ToleranceUnits, FtAverageOptions, Device
+import numpy as np
+import asyncio
+import weakref
+import os
+
+T = TypeVar('T')
+
+
+class AsyncRawFile(object):
+    """
+    Asyncio facade for reading a raw file. Every call is executed on a bounded pool of worker
+    threads, each reading from its own accessor (see ThreadAccessorPool), so the event loop
+    is never blocked by the raw file reader and concurrent requests are served in parallel.
+
+    Usage:
+        async with AsyncRawFile('my_file.raw') as raw_file:
+            masses, intensities, charges = await raw_file.get_spectrum(1)
+    """
+
+    def __init__(self, path: str, workers: int=None, max_pending: int=None, device: Device=Device.MS, device_index: int=1):
+        """
+        Opens a raw file for asynchronous access
+        :param path: Path to the raw file
+        :param workers: Number of worker threads (defaults to the number of CPUs)
+        :param max_pending: Maximum number of calls queued or running at once (per event loop), further calls wait
+            until a slot is free (defaults to four times the number of workers)
+        :param device: Device to read from
+        :param device_index: Stream number of the device (1 based)
+        """
+        self._workers = workers or os.cpu_count() or 1
+        self._max_pending = max_pending or 4 * self._workers
+        self._pool = ThreadAccessorPool(path, device, device_index)
+        self._executor = ThreadPoolExecutor(max_workers=self._workers)
+
+        # asyncio primitives are bound to the event loop they are first used in, so the calls
+        # of each running loop are limited by a semaphore of their own
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Run a function on a worker thread
+        :param fn: Function called as fn(accessor, *args) with the accessor of the worker thread
+        :param args: Further arguments of the function
+        :returns: Result of the function
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self._max_pending)
+
+        async with semaphore:
+            return await loop.run_in_executor(self._executor, lambda: fn(self._pool.get_accessor(), *args))
+
+    async def get_spectrum(self, scan_number: int, prefer_centroids: bool=True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the peaks of a scan (same peaks as RawFile.get_scan_from_scan_number)
+        :param scan_number: The number of the scan
+        :param prefer_centroids: If true, the centroid stream is used for FTMS scans (otherwise the segmented scan data)
+        :returns: Tuple organized as (masses, intensities, charges)
+        """
+        return await self.run(_read_spectrum_, scan_number, prefer_centroids)
+
+    async def read_scans(self, first_scan_number: int, last_scan_number: int, prefer_centroids: bool=True) -> PackedScans:
+        """
+        Read the spectra of a range of scans (see RawFileAccess.read_scans)
+        :param first_scan_number: The first scan to read
+        :param last_scan_number: The last scan to read
+        :param prefer_centroids: If true, the centroid stream is used for scans which have one
+        :returns: The packed spectra
+        """
+        return await self.run(lambda access: access.read_scans(first_scan_number, last_scan_number, prefer_centroids))
+
+    async def get_centroid_stream(self, scan_number: int, include_reference_and_exception_peaks: bool=False) -> CentroidStream:
+        """
+        Get the centroids saved with a profile scan (see RawFileAccess.get_centroid_stream)
+        :param scan_number: The number of the scan
+        :param include_reference_and_exception_peaks: determines if peaks flagged as ref should be returned
+        :returns: The centroid stream
+        """
+        return await self.run(lambda access: access.get_centroid_stream(scan_number, include_reference_and_exception_peaks))
+
+    async def get_chromatogram_data(self, settings: List[ChromatogramTraceSettings], start_scan: int=-1, end_scan: int=-1, tolerance_options: MassOptions=None) -> ChromatogramData:
+        """
+        Create chromatograms (see RawFileAccess.get_chromatogram_data)
+        :param settings: Definition of how each chromatogram is read
+        :param start_scan: First scan to read from (-1 for all data)
+        :param end_scan: Last scan to read from (-1 for all data)
+        :param tolerance_options: Tolerance of mass ranges with equal low and high mass
+        :returns: Chromatogram points
+        """
+        return await self.run(lambda access: access.get_chromatogram_data(settings, start_scan, end_scan, tolerance_options))
+
+    async def get_chromatogram(self, mz: float, tolerance: float, trace_type: TraceType=TraceType.MassRange, tolerance_units: ToleranceUnits=ToleranceUnits.ppm, ms_filter: str='ms') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gets chromatogram (see RawFile.get_chromatogram)
+        :param mz: Mass/Charge value for mass range chromatogram
+        :param tolerance: Tolerance for mass range chromatogram
+        :param trace_type: Type of chromatogram (BasePeek, TIC (total ion current), MassRange (XIC))
+        :param tolerance_units: Units of the mass tolerance (ppm by default)
+        :param ms_filter: Type of MS data (ms or ms2)
+        :returns: array containing retention times and array containing intensity values
+        """
+        return await self.run(_read_chromatogram_, mz, tolerance, trace_type, tolerance_units, ms_filter)
+
+    async def average_scans(self, scans: List[int], options: MassOptions=None, average_options: FtAverageOptions=None) -> Scan:
+        """
+        Average a list of scans (see RawFileAccess.average_scans)
+        :param scans: Numbers of the scans to average
+        :param options: Mass tolerance settings (default from the raw file)
+        :param average_options: The average options (for FT format data)
+        :returns: The averaged scan
+        """
+        return await self.run(lambda access: access.average_scans(list(scans), options, average_options))
+
+    async def iterate_scans(self, first_scan_number: int, last_scan_number: int, fn: Callable[[RawFileAccess, int], T]=_read_spectrum_, chunk_size: int=16) -> AsyncIterator[T]:
+        """
+        Asynchronously iterate over a scan range. Chunks of scans are processed on the worker
+        threads and the results are yielded in scan order. At most a few chunks per worker are
+        processed ahead of the consumer (backpressure).
+        :param first_scan_number: First scan to process
+        :param last_scan_number: Last scan to process
+        :param fn: Function called as fn(accessor, scan_number) on a worker thread (reads the peaks
+            as (masses, intensities, charges) by default)
+        :param chunk_size: Number of consecutive scans processed per task
+        :returns: Asynchronous iterator over the results of fn in scan order
+        """
+        assert chunk_size > 0
+
+        def process_chunk(access: RawFileAccess, chunk: range) -> List[T]:
+            return [fn(access, scan_number) for scan_number in chunk]
+
+        chunks = (range(start, min(start + chunk_size, last_scan_number + 1)) for start in range(first_scan_number, last_scan_number + 1, chunk_size))
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pending.append(asyncio.ensure_future(self.run(process_chunk, chunk)))
+                if len(pending) >= 2 * self._workers:
+                    for result in await pending.popleft():
+                        yield result
+            while len(pending) > 0:
+                for result in await pending.popleft():
+                    yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def __aenter__(self) -> AsyncRawFile:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Wait for running calls on a worker thread, then release all accessors and the file
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def close(self):
+        """
+        Wait for running calls, then release all accessors and the file
+        """
+        self._executor.shutdown(wait=True)
+        self._pool.dispose()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+from typing import Any, Callable, Iterator, List, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import traceback
+import os
+
+
+class BatchResult(object):
+    """
+    Outcome of processing a single file
+    """
+
+    @property
+    def succeeded(self) -> bool:
+        """
+        Whether the file was processed without error
+        """
+        return self.error is None
+
+    def __init__(self, path: str, result: Any=None, error: str=None):
+        self.path = path
+        self.result = result
+        self.error = error
+
+    def __repr__(self) -> str:
+        state = 'succeeded' if self.succeeded else f'failed: {self.error.splitlines()[-1]}'
+        return f'BatchResult({self.path!r}, {state})'
+
+
+def _initialize_worker():
+    # loads the runtime and the RawFileReader libraries once per worker process
+    import fisher_py.net_wrapping
+
+
+def _process_file(fn: Callable[[str], Any], path: str) -> BatchResult:
+    try:
+        return BatchResult(path, result=fn(path))
+    except Exception:
+        # .NET exceptions cannot be pickled, so only the formatted traceback is sent back
+        return BatchResult(path, error=traceback.format_exc())
+
+
+def _iterate_indexed(paths: List[str], fn: Callable[[str], Any], workers: int, progress: Callable[[int, int, BatchResult], None]) -> Iterator[Tuple[int, BatchResult]]:
+    workers = min(workers or os.cpu_count() or 1, max(len(paths), 1))
+
+    # workers are always spawned, as forking a process with a loaded .NET runtime is not safe
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_initialize_worker) as executor:
+        futures = {executor.submit(_process_file, fn, path): i for i, path in enumerate(paths)}
+
+        for completed, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                result = BatchResult(paths[index], error='BrokenProcessPool: the worker process terminated abruptly')
+            except Exception:
+                result = BatchResult(paths[index], error=traceback.format_exc())
+
+            if progress is not None:
+                progress(completed, len(paths), result)
+            yield index, result
+
+
+def iterate_files(paths: List[str], fn: Callable[[str], Any], workers: int=None, progress: Callable[[int, int, BatchResult], None]=None) -> Iterator[BatchResult]:
+    """
+    Process raw files on a pool of worker processes and yield the results as they complete.
+    Each worker loads the .NET runtime and the RawFileReader libraries once and reuses them
+    for all files it processes. Errors are isolated per file: an exception raised by fn (or
+    a crashing worker) results in a failed BatchResult and the remaining files are still processed.
+    :param paths: Paths of the raw files
+    :param fn: Function called as fn(path) in a worker process. It must be picklable (i.e. defined
+        at module level) and so must its return value (e.g. the path of a written output file).
+    :param workers: Number of worker processes (defaults to the number of CPUs)
+    :param progress: Optional callback called as progress(completed, total, result) in the calling process
+    :returns: Iterator over BatchResult objects in completion order
+    """
+    for _, result in _iterate_indexed(list(paths), fn, workers, progress):
+        yield result
+
+
+def process_files(paths: List[str], fn: Callable[[str], Any], workers: int=None, progress: Callable[[int, int, BatchResult], None]=None) -> List[BatchResult]:
+    """
+    Process raw files on a pool of worker processes (see iterate_files).
+    :param paths: Paths of the raw files
+    :param fn: Function called as fn(path) in a worker process
+    :param workers: Number of worker processes (defaults to the number of CPUs)
+    :param progress: Optional callback called as progress(completed, total, result) in the calling process
+    :returns: Results in the order of the given paths
+    """
+    paths = list(paths)
+    results = [None] * len(paths)
+    for index, result in _iterate_indexed(paths, fn, workers, progress):
+        results[index] = result
+    return results
@@ -1,20 +1,49 @@
-from fisher_py.data.ft_average_options import FtAverageOptions
-from fisher_py.data.raw_file_classification import RawFileClassification
-from fisher_py.data.tray_shape import TrayShape
-from fisher_py.data.error_log_entry import ErrorLogEntry
-from fisher_py.data.auto_sampler_information import AutoSamplerInformation
-from fisher_py.data.file_type import FileType
-from fisher_py.data.file_header import FileHeader
-from fisher_py.data.source_fragmentation_info_valid_type import SourceFragmentationInfoValidType
-from fisher_py.data.scan_dependent_details import ScanDependentDetails
-from fisher_py.data.filter_accurate_mass import FilterAccurateMass
-from fisher_py.data.scan_filter import ScanFilter
-from fisher_py.data.tolerance_units import ToleranceUnits
-from fisher_py.data.device import Device
-from fisher_py.data.peak_options import PeakOptions
-from fisher_py.data.common_core_data_object import CommonCoreDataObject
-from fisher_py.data.file_error import FileError
-from fisher_py.data.sequence_info import SequenceInfo
-from fisher_py.data.sequence_file_writer import SequenceFileWriter
-from fisher_py.data.scan_event import ScanEvent
-from fisher_py.data.scan_events import ScanEvents
+from typing import TYPE_CHECKING
+from fisher_py.lazy_attributes import install_lazy_attributes
+
+if TYPE_CHECKING:
+    from fisher_py.data.ft_average_options import FtAverageOptions
+    from fisher_py.data.raw_file_classification import RawFileClassification
+    from fisher_py.data.tray_shape import TrayShape
+    from fisher_py.data.error_log_entry import ErrorLogEntry
+    from fisher_py.data.auto_sampler_information import AutoSamplerInformation
+    from fisher_py.data.file_type import FileType
+    from fisher_py.data.file_header import FileHeader
+    from fisher_py.data.source_fragmentation_info_valid_type import SourceFragmentationInfoValidType
+    from fisher_py.data.scan_dependent_details import ScanDependentDetails
+    from fisher_py.data.filter_accurate_mass import FilterAccurateMass
+    from fisher_py.data.scan_filter import ScanFilter
+    from fisher_py.data.tolerance_units import ToleranceUnits
+    from fisher_py.data.device import Device
+    from fisher_py.data.peak_options import PeakOptions
+    from fisher_py.data.common_core_data_object import CommonCoreDataObject
+    from fisher_py.data.file_error import FileError
+    from fisher_py.data.sequence_info import SequenceInfo
+    from fisher_py.data.sequence_file_writer import SequenceFileWriter
+    from fisher_py.data.scan_event import ScanEvent
+    from fisher_py.data.scan_events import ScanEvents
+
+# attributes are imported on first access, so that modules without .NET dependencies
+# (e.g. enums) can be imported without loading the .NET runtime
+install_lazy_attributes(globals(), {
+    'FtAverageOptions': 'fisher_py.data.ft_average_options',
+    'RawFileClassification': 'fisher_py.data.raw_file_classification',
+    'TrayShape': 'fisher_py.data.tray_shape',
+    'ErrorLogEntry': 'fisher_py.data.error_log_entry',
+    'AutoSamplerInformation': 'fisher_py.data.auto_sampler_information',
+    'FileType': 'fisher_py.data.file_type',
+    'FileHeader': 'fisher_py.data.file_header',
+    'SourceFragmentationInfoValidType': 'fisher_py.data.source_fragmentation_info_valid_type',
+    'ScanDependentDetails': 'fisher_py.data.scan_dependent_details',
+    'FilterAccurateMass': 'fisher_py.data.filter_accurate_mass',
+    'ScanFilter': 'fisher_py.data.scan_filter',
+    'ToleranceUnits': 'fisher_py.data.tolerance_units',
+    'Device': 'fisher_py.data.device',
+    'PeakOptions': 'fisher_py.data.peak_options',
+    'CommonCoreDataObject': 'fisher_py.data.common_core_data_object',
+    'FileError': 'fisher_py.data.file_error',
+    'SequenceInfo': 'fisher_py.data.sequence_info',
+    'SequenceFileWriter': 'fisher_py.data.sequence_file_writer',
+    'ScanEvent': 'fisher_py.data.scan_event',
+    'ScanEvents': 'fisher_py.data.scan_events',
+})
@@ -1,30 +1,69 @@
-from fisher_py.data.business.sample_type import SampleType
-from fisher_py.data.business.bracket_type import BracketType
-from fisher_py.data.business.barcode_status_type import BarcodeStatusType
-from fisher_py.data.business.spectrum_packet_type import SpectrumPacketType
-from fisher_py.data.business.tolerance_mode import ToleranceMode
-from fisher_py.data.business.trace_type import TraceType
-from fisher_py.data.business.data_units import DataUnits
-from fisher_py.data.business.generic_data_types import GenericDataTypes
-from fisher_py.data.business.tune_data_values import TuneDataValues
-from fisher_py.data.business.status_log_values import StatusLogValues
-from fisher_py.data.business.header_item import HeaderItem
-from fisher_py.data.business.log_entry import LogEntry
-from fisher_py.data.business.instrument_data import InstrumentData
-from fisher_py.data.business.mass_options import MassOptions
-from fisher_py.data.business.range import Range
-from fisher_py.data.business.chromatogram_trace_settings import ChromatogramTraceSettings
-from fisher_py.data.business.instrument_selection import InstrumentSelection
-from fisher_py.data.business.noise_and_baseline import NoiseAndBaseline
-from fisher_py.data.business.mass_to_frequency_converter import MassToFrequencyConverter
-from fisher_py.data.business.simple_scan import SimpleScan
-from fisher_py.data.business.scan_statistics import ScanStatistics
-from fisher_py.data.business.label_peak import LabelPeak
-from fisher_py.data.business.run_header import RunHeader
-from fisher_py.data.business.sample_information import SampleInformation
-from fisher_py.data.business.cached_scan_provider import CachedScanProvider
-from fisher_py.data.business.segmented_scan import SegmentedScan
-from fisher_py.data.business.centroid_stream import CentroidStream
-from fisher_py.data.business.scan import Scan
-from fisher_py.data.business.reaction import Reaction
-from fisher_py.data.business.chromatogram_signal_cls import ChromatogramSignal
+from typing import TYPE_CHECKING
+from fisher_py.lazy_attributes import install_lazy_attributes
+
+if TYPE_CHECKING:
+    from fisher_py.data.business.sample_type import SampleType
+    from fisher_py.data.business.bracket_type import BracketType
+    from fisher_py.data.business.barcode_status_type import BarcodeStatusType
+    from fisher_py.data.business.spectrum_packet_type import SpectrumPacketType
+    from fisher_py.data.business.tolerance_mode import ToleranceMode
+    from fisher_py.data.business.trace_type import TraceType
+    from fisher_py.data.business.data_units import DataUnits
+    from fisher_py.data.business.generic_data_types import GenericDataTypes
+    from fisher_py.data.business.tune_data_values import TuneDataValues
+    from fisher_py.data.business.status_log_values import StatusLogValues
+    from fisher_py.data.business.header_item import HeaderItem
+    from fisher_py.data.business.log_entry import LogEntry
+    from fisher_py.data.business.instrument_data import InstrumentData
+    from fisher_py.data.business.mass_options import MassOptions
+    from fisher_py.data.business.range import Range
+    from fisher_py.data.business.chromatogram_trace_settings import ChromatogramTraceSettings
+    from fisher_py.data.business.instrument_selection import InstrumentSelection
+    from fisher_py.data.business.noise_and_baseline import NoiseAndBaseline
+    from fisher_py.data.business.mass_to_frequency_converter import MassToFrequencyConverter
+    from fisher_py.data.business.simple_scan import SimpleScan
+    from fisher_py.data.business.scan_statistics import ScanStatistics
+    from fisher_py.data.business.label_peak import LabelPeak
+    from fisher_py.data.business.run_header import RunHeader
+    from fisher_py.data.business.sample_information import SampleInformation
+    from fisher_py.data.business.cached_scan_provider import CachedScanProvider
+    from fisher_py.data.business.segmented_scan import SegmentedScan
+    from fisher_py.data.business.centroid_stream import CentroidStream
+    from fisher_py.data.business.scan import Scan
+    from fisher_py.data.business.reaction import Reaction
+    from fisher_py.data.business.chromatogram_signal_cls import ChromatogramSignal
+
+# attributes are imported on first access, so that modules without .NET dependencies
+# (e.g. enums) can be imported without loading the .NET runtime
+install_lazy_attributes(globals(), {
+    'SampleType': 'fisher_py.data.business.sample_type',
+    'BracketType': 'fisher_py.data.business.bracket_type',
+    'BarcodeStatusType': 'fisher_py.data.business.barcode_status_type',
+    'SpectrumPacketType': 'fisher_py.data.business.spectrum_packet_type',
+    'ToleranceMode': 'fisher_py.data.business.tolerance_mode',
+    'TraceType': 'fisher_py.data.business.trace_type',
+    'DataUnits': 'fisher_py.data.business.data_units',
+    'GenericDataTypes': 'fisher_py.data.business.generic_data_types',
+    'TuneDataValues': 'fisher_py.data.business.tune_data_values',
+    'StatusLogValues': 'fisher_py.data.business.status_log_values',
+    'HeaderItem': 'fisher_py.data.business.header_item',
+    'LogEntry': 'fisher_py.data.business.log_entry',
+    'InstrumentData': 'fisher_py.data.business.instrument_data',
+    'MassOptions': 'fisher_py.data.business.mass_options',
+    'Range': 'fisher_py.data.business.range',
+    'ChromatogramTraceSettings': 'fisher_py.data.business.chromatogram_trace_settings',
+    'InstrumentSelection': 'fisher_py.data.business.instrument_selection',
+    'NoiseAndBaseline': 'fisher_py.data.business.noise_and_baseline',
+    'MassToFrequencyConverter': 'fisher_py.data.business.mass_to_frequency_converter',
+    'SimpleScan': 'fisher_py.data.business.simple_scan',
+    'ScanStatistics': 'fisher_py.data.business.scan_statistics',
+    'LabelPeak': 'fisher_py.data.business.label_peak',
+    'RunHeader': 'fisher_py.data.business.run_header',
+    'SampleInformation': 'fisher_py.data.business.sample_information',
+    'CachedScanProvider': 'fisher_py.data.business.cached_scan_provider',
+    'SegmentedScan': 'fisher_py.data.business.segmented_scan',
+    'CentroidStream': 'fisher_py.data.business.centroid_stream',
+    'Scan': 'fisher_py.data.business.scan',
+    'Reaction': 'fisher_py.data.business.reaction',
+    'ChromatogramSignal': 'fisher_py.data.business.chromatogram_signal_cls',
+})
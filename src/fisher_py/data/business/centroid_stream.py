@@ -2,8 +2,9 @@ from __future__ import annotations
 from fisher_py.net_wrapping import NetWrapperBase, ThermoFisher
 from fisher_py.data import PeakOptions
 from fisher_py.data.business import Range, LabelPeak, MassOptions, SimpleScan, SegmentedScan, ScanStatistics
-from fisher_py.utils import to_net_list
+from fisher_py.utils import is_array_like, to_net_array, to_net_list, to_numpy_array
 from typing import List, TYPE_CHECKING
+import numpy as np
 
 if TYPE_CHECKING:
     from fisher_py.data.business import Scan
@@ -29,8 +30,8 @@ class CentroidStream(NetWrapperBase):
         """
         Gets or sets the list of noise level near peak
         """
-        assert type(value) is list
-        value = to_net_list(value, float)
+        assert is_array_like(value)
+        value = to_net_array(value, float)
         self._get_wrapped_object_().Noises = value
 
     @property
@@ -45,8 +46,8 @@ class CentroidStream(NetWrapperBase):
         """
         Gets or sets the list of masses of each centroid
         """
-        assert type(value) is list
-        value = to_net_list(value, float)
+        assert is_array_like(value)
+        value = to_net_array(value, float)
         self._get_wrapped_object_().Masses = value
 
     @property
@@ -76,8 +77,8 @@ class CentroidStream(NetWrapperBase):
         """
         Gets or sets the list of Intensities for each centroid
         """
-        assert type(value) is list
-        value = to_net_list(value, float)
+        assert is_array_like(value)
+        value = to_net_array(value, float)
         self._get_wrapped_object_().Intensities = value
 
     @property
@@ -138,8 +139,8 @@ class CentroidStream(NetWrapperBase):
         """
         Gets or sets the list of charge calculated for peak
         """
-        assert type(value) is list
-        value = to_net_list(value, float)
+        assert is_array_like(value)
+        value = to_net_array(value, float)
         self._get_wrapped_object_().Charges = value
 
     @property
@@ -182,8 +183,8 @@ class CentroidStream(NetWrapperBase):
         """
         Gets or sets the list of baseline at each peak
         """
-        assert type(value) is list
-        value = to_net_list(value, float)
+        assert is_array_like(value)
+        value = to_net_array(value, float)
         self._get_wrapped_object_().Baselines = value
 
     @property
@@ -198,8 +199,8 @@ class CentroidStream(NetWrapperBase):
         """
         Gets or sets resolution of each peak
         """
-        assert type(value) is list
-        value = to_net_list(value, float)
+        assert is_array_like(value)
+        value = to_net_array(value, float)
         self._get_wrapped_object_().Resolutions = value
 
     @property
@@ -217,6 +218,42 @@ class CentroidStream(NetWrapperBase):
         assert type(value) is int
         self._get_wrapped_object_().ScanNumber = value
 
+    def masses_as_numpy(self) -> np.ndarray:
+        """
+        Gets the masses of each centroid as numpy array (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().Masses)
+
+    def intensities_as_numpy(self) -> np.ndarray:
+        """
+        Gets the intensities of each centroid as numpy array (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().Intensities)
+
+    def charges_as_numpy(self) -> np.ndarray:
+        """
+        Gets the charges calculated for each peak as numpy array (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().Charges)
+
+    def noises_as_numpy(self) -> np.ndarray:
+        """
+        Gets the noise levels near each peak as numpy array (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().Noises)
+
+    def resolutions_as_numpy(self) -> np.ndarray:
+        """
+        Gets the resolution of each peak as numpy array (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().Resolutions)
+
+    def baselines_as_numpy(self) -> np.ndarray:
+        """
+        Gets the baseline at each peak as numpy array (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().Baselines)
+
     def base_intensity(self, ranges: List[Range], tolerance_options: MassOptions) -> float:
         """
         Return the largest intensity (base value) in the ranges supplies
@@ -1,5 +1,7 @@
 from fisher_py.net_wrapping import NetWrapperBase, ThermoFisher
+from fisher_py.utils import to_numpy_array
 from typing import List
+import numpy as np
 
 
 class ChromatogramData(NetWrapperBase):
@@ -37,3 +39,24 @@ class ChromatogramData(NetWrapperBase):
         Gets The number of chromatograms in this object
         """
         return self._get_wrapped_object_().Length
+
+    def positions_as_numpy(self, index: int) -> np.ndarray:
+        """
+        Gets the times in minutes of a chromatogram as numpy array (copied as one block)
+        :param index: Index of the chromatogram
+        """
+        return to_numpy_array(self._get_wrapped_object_().PositionsArray[index])
+
+    def scan_numbers_as_numpy(self, index: int) -> np.ndarray:
+        """
+        Gets the scan numbers of a chromatogram as numpy array (copied as one block)
+        :param index: Index of the chromatogram
+        """
+        return to_numpy_array(self._get_wrapped_object_().ScanNumbersArray[index], np.int32)
+
+    def intensities_as_numpy(self, index: int) -> np.ndarray:
+        """
+        Gets the intensities of a chromatogram as numpy array (copied as one block)
+        :param index: Index of the chromatogram
+        """
+        return to_numpy_array(self._get_wrapped_object_().IntensitiesArray[index])
@@ -2,7 +2,7 @@ from __future__ import annotations
 from fisher_py.net_wrapping import NetWrapperBase, ThermoFisher
 from fisher_py.data.business import Range
 from fisher_py.data.business.chromatogram_signal import ChromatogramData
-from fisher_py.utils import to_net_list
+from fisher_py.utils import is_array_like, to_net_array, to_net_list
 from typing import List
 
 
@@ -49,8 +49,8 @@ class ChromatogramSignal(NetWrapperBase):
         Value:
         The signal times.
         """
-        assert type(value) is list
-        value = to_net_list(value, float)
+        assert is_array_like(value)
+        value = to_net_array(value, float)
         self._get_wrapped_object_().SignalTimes = value
 
     @property
@@ -103,8 +103,8 @@ class ChromatogramSignal(NetWrapperBase):
         Value:
         The signal times.
         """
-        assert type(value) is list
-        value = to_net_list(value, float)
+        assert is_array_like(value)
+        value = to_net_array(value, float)
         self._get_wrapped_object_().SignalBasePeakMasses = value
 
     @property
@@ -135,8 +135,8 @@ class ChromatogramSignal(NetWrapperBase):
         Value:
         The signal scans.
         """
-        assert type(value) is List[int]
-        value = to_net_list(value, int)
+        assert is_array_like(value)
+        value = to_net_array(value, int)
         self._get_wrapped_object_().SignalScans = value
 
     @property
@@ -167,8 +167,8 @@ class ChromatogramSignal(NetWrapperBase):
         Value:
         The signal intensities.
         """
-        assert type(value) is list
-        value = to_net_list(value, float)
+        assert is_array_like(value)
+        value = to_net_array(value, float)
         self._get_wrapped_object_().SignalIntensities = value
 
     @property
@@ -228,10 +228,10 @@ class ChromatogramSignal(NetWrapperBase):
             The constructed signal, or null if either of the inputs are null, or the inputs
             are not the same length
         """
-        assert type(time) is list
-        assert type(intensity) is list
-        time = to_net_list(time, float)
-        intensity = to_net_list(intensity, float)
+        assert is_array_like(time)
+        assert is_array_like(intensity)
+        time = to_net_array(time, float)
+        intensity = to_net_array(intensity, float)
         return ChromatogramSignal._get_wrapper_(ChromatogramSignal._wrapped_type.FromTimeAndIntensity(time, intensity))
 
     @staticmethod
@@ -254,12 +254,12 @@ class ChromatogramSignal(NetWrapperBase):
             The constructed signal, or null if either of the inputs are null, or the inputs
             are not the same length
         """
-        assert type(time) is list
-        assert type(intensity) is list
-        assert type(scan) is list
-        time = to_net_list(time, float)
-        intensity = to_net_list(intensity, float)
-        scan = to_net_list(scan, int)
+        assert is_array_like(time)
+        assert is_array_like(intensity)
+        assert is_array_like(scan)
+        time = to_net_array(time, float)
+        intensity = to_net_array(intensity, float)
+        scan = to_net_array(scan, int)
         return ChromatogramSignal._get_wrapper_(ChromatogramSignal._wrapped_type.FromTimeIntensityScan(time, intensity, scan))
     
     @staticmethod
@@ -285,14 +285,14 @@ class ChromatogramSignal(NetWrapperBase):
             The constructed signal, or null if either of the inputs are null, or the inputs
             are not the same length
         """
-        assert type(time) is list
-        assert type(intensity) is list
-        assert type(scan) is list
-        assert type(base_peak) is list
-        time = to_net_list(time, float)
-        intensity = to_net_list(intensity, float)
-        scan = to_net_list(scan, int)
-        base_peak = to_net_list(base_peak, float)
+        assert is_array_like(time)
+        assert is_array_like(intensity)
+        assert is_array_like(scan)
+        assert is_array_like(base_peak)
+        time = to_net_array(time, float)
+        intensity = to_net_array(intensity, float)
+        scan = to_net_array(scan, int)
+        base_peak = to_net_array(base_peak, float)
         return ChromatogramSignal._get_wrapper_(ChromatogramSignal._wrapped_type.FromTimeIntensityScanBasePeak(time, intensity, scan, base_peak))
 
     @staticmethod
@@ -1,5 +1,6 @@
 
 from fisher_py.net_wrapping import NetWrapperBase, ThermoFisher
+from fisher_py.net_wrapping.wrapped_net_array import WrappedNetArray
 from typing import List
 
 
@@ -15,7 +16,7 @@ class LogEntry(NetWrapperBase):
         """
         Gets or sets the labels in this log.
         """
-        return list(self._get_wrapped_object_().Labels)
+        return WrappedNetArray[str](self._get_wrapped_object_().Labels)
 
     @labels.setter
     def labels(self, value: List[str]):
@@ -30,7 +31,7 @@ class LogEntry(NetWrapperBase):
         """
         Gets or sets the values in this log.
         """
-        return list(self._get_wrapped_object_().Values)
+        return WrappedNetArray[str](self._get_wrapped_object_().Values)
 
     @values.setter
     def values(self, value: List[str]):
@@ -7,7 +7,8 @@ from fisher_py.data.business import (
     MassToFrequencyConverter, NoiseAndBaseline, ScanStatistics, SegmentedScan, ToleranceMode, 
     CentroidStream, CachedScanProvider
 )
-from fisher_py.utils import to_net_list
+from fisher_py.utils import to_net_list, to_numpy_array
+import numpy as np
 
 if TYPE_CHECKING:
     from fisher_py.raw_file_reader import RawFileAccess
@@ -381,6 +382,41 @@ class Scan(NetWrapperBase):
         """
         return self._get_wrapped_object_().HasNoiseTable
 
+    def preferred_masses_as_numpy(self) -> np.ndarray:
+        """
+        Gets the masses for default data stream (usually centroid stream, if present) as
+        numpy array (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().PreferredMasses)
+
+    def preferred_intensities_as_numpy(self) -> np.ndarray:
+        """
+        Gets the intensities for default data stream (usually centroid stream, if present) as
+        numpy array (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().PreferredIntensities)
+
+    def preferred_noises_as_numpy(self) -> np.ndarray:
+        """
+        Gets the noises for default data stream (usually centroid stream, if present) as
+        numpy array (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().PreferredNoises)
+
+    def preferred_baselines_as_numpy(self) -> np.ndarray:
+        """
+        Gets the baselines for default data stream (usually centroid stream, if present) as
+        numpy array (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().PreferredBaselines)
+
+    def preferred_resolutions_as_numpy(self) -> np.ndarray:
+        """
+        Gets the resolutions for default data stream (usually centroid stream, if present) as
+        numpy array (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().PreferredResolutions)
+
     @staticmethod
     def at_time(raw_file: RawFileAccess, time: float) -> Scan:
         """
@@ -1,9 +1,10 @@
 from __future__ import annotations
 from typing import List
-from fisher_py.utils import is_number, to_net_list
+from fisher_py.utils import is_array_like, is_number, to_net_array, to_net_list, to_numpy_array
 from fisher_py.net_wrapping import NetWrapperBase, ThermoFisher
 from fisher_py.data.business import Range, MassOptions, SimpleScan
 from fisher_py.data import PeakOptions
+import numpy as np
 
 
 class SegmentedScan(NetWrapperBase):
@@ -29,7 +30,7 @@ class SegmentedScan(NetWrapperBase):
         """
         Gets or sets flags, such as "saturated" for each peak.
         """
-        assert type(value) is list
+        assert is_array_like(value)
         value = to_net_list(value, int)
         self._get_wrapped_object_().Flags = [v.value for v in value]
 
@@ -45,8 +46,8 @@ class SegmentedScan(NetWrapperBase):
         """
         Gets or sets the Intensity (or absorbance) values for each point in the scan
         """
-        assert type(value) is list
-        value = to_net_list(value, float)
+        assert is_array_like(value)
+        value = to_net_array(value, float)
         self._get_wrapped_object_().Intensities = value
 
     @property
@@ -61,8 +62,8 @@ class SegmentedScan(NetWrapperBase):
         """
         Gets or sets the positions (mass or wavelength) for each point in the scan
         """
-        assert type(value) is list
-        value = to_net_list(value, float)
+        assert is_array_like(value)
+        value = to_net_array(value, float)
         self._get_wrapped_object_().Positions = value
 
     @property
@@ -84,8 +85,8 @@ class SegmentedScan(NetWrapperBase):
         """
         Gets or sets the number of data points in each segment
         """
-        assert type(value) is list
-        value = to_net_list(value, int)
+        assert is_array_like(value)
+        value = to_net_array(value, int)
         self._get_wrapped_object_().SegmentSizes = value
 
     @property
@@ -161,6 +162,20 @@ class SegmentedScan(NetWrapperBase):
         value = to_net_list(value, int)
         self._get_wrapped_object_().ScanNumber = value
 
+    def positions_as_numpy(self) -> np.ndarray:
+        """
+        Gets the positions (mass or wavelength) for each point in the scan as numpy array
+        (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().Positions)
+
+    def intensities_as_numpy(self) -> np.ndarray:
+        """
+        Gets the intensity (or absorbance) values for each point in the scan as numpy array
+        (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().Intensities)
+
     def from_mass_and_intensities(self, masses: List[float], intensities: List[float]) -> SegmentedScan:
         """
         Create a scan from simple X,Y data. This method creates a scan with one segment.
@@ -1,5 +1,7 @@
 from fisher_py.net_wrapping import NetWrapperBase, ThermoFisher
+from fisher_py.utils import to_numpy_array
 from typing import List
+import numpy as np
 
 
 class SimpleScan(NetWrapperBase):
@@ -23,3 +25,15 @@ class SimpleScan(NetWrapperBase):
         Gets the list of Intensities for each centroid
         """
         return self._get_wrapped_object_().Intensities
+
+    def masses_as_numpy(self) -> np.ndarray:
+        """
+        Gets the masses of each centroid as numpy array (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().Masses)
+
+    def intensities_as_numpy(self) -> np.ndarray:
+        """
+        Gets the intensities of each centroid as numpy array (copied as one block)
+        """
+        return to_numpy_array(self._get_wrapped_object_().Intensities)
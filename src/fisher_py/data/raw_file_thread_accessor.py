@@ -24,3 +24,10 @@ class RawFileThreadAccessor(NetWrapperBase):
              An interface which can be used by a thread to access raw data
         """
         return RawFileAccess._get_wrapper_(self._wrapped_object.CreateThreadAccessor())
+
+    def dispose(self):
+        """
+        Summary:
+            Closes the raw file shared by the accessors of this manager.
+        """
+        self._get_wrapped_object_().Dispose()
@@ -22,6 +22,13 @@ class ScanFilter(NetWrapperBase):
     def __init__(self, scan_filter_net):
         super().__init__()
         self._wrapped_object = scan_filter_net
+        self._filter_string = None
+
+    def __setattr__(self, name: str, value):
+        # changing any filter property invalidates the memoized string
+        if not name.startswith('_'):
+            object.__setattr__(self, '_filter_string', None)
+        object.__setattr__(self, name, value)
 
     @property
     def sector_scan(self) -> SectorScanType:
@@ -931,4 +938,6 @@ class ScanFilter(NetWrapperBase):
         Returns:
         The System.String.
         """
-        return self._get_wrapped_object_().ToString()
+        if getattr(self, '_filter_string', None) is None:
+            self._filter_string = self._get_wrapped_object_().ToString()
+        return self._filter_string
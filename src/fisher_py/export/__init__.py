@@ -0,0 +1,21 @@
+from typing import TYPE_CHECKING
+from fisher_py.lazy_attributes import install_lazy_attributes
+
+if TYPE_CHECKING:
+    from fisher_py.export.mgf import MgfSpectrum, MgfWriter, write_mgf
+    from fisher_py.export.mzml import MzmlSpectrum, MzmlWriter, write_mzml
+    from fisher_py.export.parquet import read_spectra_batch, iterate_spectra_batches, write_parquet
+
+# the writers depend on the raw file reader, they are imported on first access so that
+# e.g. fisher_py.export.numpress can be used without loading the .NET runtime
+install_lazy_attributes(globals(), {
+    'MgfSpectrum': 'fisher_py.export.mgf',
+    'MgfWriter': 'fisher_py.export.mgf',
+    'write_mgf': 'fisher_py.export.mgf',
+    'MzmlSpectrum': 'fisher_py.export.mzml',
+    'MzmlWriter': 'fisher_py.export.mzml',
+    'write_mzml': 'fisher_py.export.mzml',
+    'read_spectra_batch': 'fisher_py.export.parquet',
+    'iterate_spectra_batches': 'fisher_py.export.parquet',
+    'write_parquet': 'fisher_py.export.parquet',
+})
@@ -0,0 +1,95 @@
+"""
+Helpers shared by the exporters (trailer values and precursor selection)
+"""
+
+from __future__ import annotations
+from typing import Callable, Dict
+from fisher_py.raw_file_reader import RawFileAccess
+from fisher_py.data.business import Reaction
+from fisher_py.data.scan_event import ScanEvent
+
+
+ZERO_DELTA = 0.0001
+PRECURSOR_MZ_DELTA = 0.0001
+DEFAULT_ISOLATION_WINDOW_LOWER_OFFSET = 1.5
+DEFAULT_ISOLATION_WINDOW_UPPER_OFFSET = 2.5
+
+
+def calculate_selected_ion_mz(precursor_mass: float, reaction_isolation_width: float, monoisotopic_mz: float, isolation_width: float) -> float:
+    """
+    Determine the selected ion m/z. The monoisotopic m/z (from the trailer data) is used if it
+    lies within the isolation window, otherwise the precursor mass of the reaction.
+    :param precursor_mass: Precursor mass of the reaction
+    :param reaction_isolation_width: Isolation width of the reaction
+    :param monoisotopic_mz: Monoisotopic m/z from the trailer data (or None)
+    :param isolation_width: Isolation width from the trailer data (or None)
+    :returns: Selected ion m/z
+    """
+    selected_ion_mz = precursor_mass
+
+    # take the isolation width from the reaction if no value was found in the trailer data
+    if isolation_width is None or isolation_width < ZERO_DELTA:
+        isolation_width = reaction_isolation_width
+    isolation_width *= 0.5
+
+    if monoisotopic_mz and monoisotopic_mz > ZERO_DELTA and abs(precursor_mass - monoisotopic_mz) > PRECURSOR_MZ_DELTA:
+        selected_ion_mz = monoisotopic_mz
+
+        # check if the monoisotopic mass lies in the precursor mass isolation window
+        # otherwise take the precursor mass
+        if isolation_width <= 2:
+            if (selected_ion_mz < (precursor_mass - DEFAULT_ISOLATION_WINDOW_LOWER_OFFSET * 2)) or (selected_ion_mz > (precursor_mass + DEFAULT_ISOLATION_WINDOW_UPPER_OFFSET)):
+                selected_ion_mz = precursor_mass
+        elif (selected_ion_mz < (precursor_mass - isolation_width)) or (selected_ion_mz > (precursor_mass + isolation_width)):
+            selected_ion_mz = precursor_mass
+
+    return selected_ion_mz
+
+
+def parse_float(value: str) -> float:
+    """
+    Parse a trailer value
+    :param value: The (unformatted) value
+    :returns: The number or None if the value is not numeric
+    """
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def get_trailer_indices(access: RawFileAccess) -> Dict[str, int]:
+    """
+    Get the position of each trailer extra field in the trailer values of a scan
+    :param access: Raw file access (with selected MS device)
+    :returns: Index of each trailer extra label
+    """
+    return {h.label: i for i, h in enumerate(access.get_trailer_extra_header_information())}
+
+
+def read_trailer_values(access: RawFileAccess, scan_number: int, trailer_indices: Dict[str, int]) -> Callable[[str], float]:
+    """
+    Read the trailer extra values of a scan
+    :param access: Raw file access (with selected MS device)
+    :param scan_number: The scan number
+    :param trailer_indices: Index of each trailer extra label (see get_trailer_indices)
+    :returns: Function returning the numeric value of a label (None if the field is missing or not numeric)
+    """
+    trailer_values = access.get_trailer_extra_values(scan_number, False)
+
+    def trailer_value(label: str) -> float:
+        index = trailer_indices.get(label)
+        return None if index is None else parse_float(trailer_values[index])
+    return trailer_value
+
+
+def get_reaction(scan_event: ScanEvent) -> Reaction:
+    """
+    Get the reaction which produced the precursor of an MSn scan
+    :param scan_event: Scan event of the scan
+    :returns: The reaction or None if the event has none
+    """
+    try:
+        return scan_event.get_reaction(scan_event.ms_order.value - 2)
+    except Exception:
+        return None
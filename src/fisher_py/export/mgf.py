@@ -0,0 +1,239 @@
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, Set, TextIO, Union
+from fisher_py.raw_file_reader import RawFileAccess, RawFileReaderAdapter, parallel_scans
+from fisher_py.data.filter_enums import MsOrderType, PolarityType, ScanDataType
+from fisher_py.data.business import Scan
+from fisher_py.data import Device
+from fisher_py.export._common import (
+    ZERO_DELTA, PRECURSOR_MZ_DELTA, DEFAULT_ISOLATION_WINDOW_LOWER_OFFSET, DEFAULT_ISOLATION_WINDOW_UPPER_OFFSET,
+    calculate_selected_ion_mz, get_trailer_indices, read_trailer_values, get_reaction
+)
+import numpy as np
+
+
+DEFAULT_BUFFER_SIZE = 1024**2
+
+
+class MgfSpectrum(object):
+    """
+    Spectrum as written to an MGF file
+    """
+
+    __slots__ = ('scan_number', 'retention_time', 'precursor_mz', 'charge', 'polarity', 'masses', 'intensities')
+
+    def __init__(self, scan_number: int, retention_time: float, masses: np.ndarray, intensities: np.ndarray, precursor_mz: float=None, charge: int=None, polarity: PolarityType=PolarityType.Positive):
+        self.scan_number = scan_number
+        self.retention_time = retention_time
+        self.masses = masses
+        self.intensities = intensities
+        self.precursor_mz = precursor_mz
+        self.charge = charge
+        self.polarity = polarity
+
+    @property
+    def title(self) -> str:
+        """
+        Spectrum title (same format as used by ThermoRawFileParser)
+        """
+        return f'controllerType={Device.MS.value} controllerNumber=1 scan={self.scan_number}'
+
+
+class MgfWriter(object):
+    """
+    Streaming MGF writer. Spectra are formatted into an in-memory buffer which is written
+    to the file whenever it exceeds the buffer size.
+    """
+
+    def __init__(self, file: Union[str, TextIO], buffer_size: int=DEFAULT_BUFFER_SIZE):
+        """
+        Create writer
+        :param file: Output path or file object opened for writing text
+        :param buffer_size: Number of characters collected before they are written to the file
+        """
+        self._owns_file = type(file) is str
+        self._file = open(file, 'w', encoding='utf-8') if self._owns_file else file
+        self._buffer_size = buffer_size
+        self._buffer = list()
+        self._buffered = 0
+        self._spectra_count = 0
+
+    @property
+    def spectra_count(self) -> int:
+        """
+        Number of spectra written so far
+        """
+        return self._spectra_count
+
+    def write(self, spectrum: MgfSpectrum):
+        """
+        Write a spectrum
+        :param spectrum: The spectrum
+        """
+        header = f'BEGIN IONS\nTITLE={spectrum.title}\nSCANS={spectrum.scan_number}\nRTINSECONDS={spectrum.retention_time * 60}\n'
+        if spectrum.precursor_mz is not None:
+            header += f'PEPMASS={spectrum.precursor_mz}\n'
+        if spectrum.charge:
+            header += f'CHARGE={spectrum.charge}{"+" if spectrum.polarity == PolarityType.Positive else "-"}\n'
+
+        self._append(header)
+        self._append(format_peaks(spectrum.masses, spectrum.intensities))
+        self._append('END IONS\n')
+        self._spectra_count += 1
+
+    def write_all(self, spectra: Iterable[MgfSpectrum]) -> int:
+        """
+        Write all spectra of an iterable (e.g. a generator)
+        :param spectra: The spectra
+        :returns: Number of spectra written
+        """
+        count = 0
+        for spectrum in spectra:
+            self.write(spectrum)
+            count += 1
+        return count
+
+    def flush(self):
+        """
+        Write buffered data to the file
+        """
+        self._file.write(''.join(self._buffer))
+        self._buffer.clear()
+        self._buffered = 0
+
+    def close(self):
+        """
+        Flush the buffer and close the file (if it was opened by the writer)
+        """
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> MgfWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _append(self, text: str):
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+
+def format_peaks(masses: np.ndarray, intensities: np.ndarray) -> str:
+    """
+    Format peaks as MGF peak lines ("mass intensity"). All values are formatted with a single
+    string formatting operation instead of one per peak.
+    :param masses: Mass/charge values
+    :param intensities: Intensity values
+    :returns: Peak lines
+    """
+    if len(masses) == 0:
+        return ''
+    values = np.column_stack((masses, intensities)).ravel().tolist()
+    return ('%.5f %.3f\n' * len(masses)) % tuple(values)
+
+
+def read_mgf_spectrum(access: RawFileAccess, scan_number: int, trailer_indices: Dict[str, int], ms_levels: Set[MsOrderType], centroids: bool=False) -> MgfSpectrum:
+    """
+    Read a scan as MGF spectrum
+    :param access: Raw file access (with selected MS device)
+    :param scan_number: The scan number
+    :param trailer_indices: Index of each trailer extra label (see RawFileAccess.get_trailer_extra_header_information)
+    :param ms_levels: MS orders to export
+    :param centroids: If true, the centroid stream is used for scans which have one and other profile scans are
+        centroided (see Scan.to_centroid). Otherwise the segmented scan data is used as is.
+    :returns: The spectrum or None if the scan is not of one of the requested MS orders
+    """
+    scan_event = access.get_scan_event_for_scan_number(scan_number)
+    ms_order = scan_event.ms_order
+    if ms_order not in ms_levels:
+        return None
+
+    stats = access.get_scan_stats_for_scan_number(scan_number)
+    centroid_stream = access.get_centroid_stream(scan_number, False) if centroids else None
+    if centroid_stream is not None and centroid_stream.length > 0:
+        masses, intensities = centroid_stream.masses_as_numpy(), centroid_stream.intensities_as_numpy()
+    else:
+        if centroids and scan_event.scan_data == ScanDataType.Profile:
+            segmented_scan = Scan.to_centroid(Scan.from_file(access, scan_number)).segmented_scan
+        else:
+            segmented_scan = access.get_segmented_scan_from_scan_number(scan_number, stats)
+        masses, intensities = segmented_scan.positions_as_numpy(), segmented_scan.intensities_as_numpy()
+
+    if len(masses) > 1 and np.any(np.diff(masses) < 0):
+        order = np.argsort(masses, kind='stable')
+        masses, intensities = masses[order], intensities[order]
+
+    spectrum = MgfSpectrum(scan_number, stats.start_time, masses, intensities, polarity=scan_event.polarity)
+    if ms_order.value < MsOrderType.Ms2.value:
+        return spectrum
+
+    trailer_value = read_trailer_values(access, scan_number, trailer_indices)
+    charge = trailer_value('Charge State:')
+    spectrum.charge = int(charge) if charge is not None and charge > 0 else None
+
+    # scans without reaction are written without precursor mass
+    reaction = get_reaction(scan_event)
+    if reaction is not None:
+        monoisotopic_mz = trailer_value('Monoisotopic M/Z:')
+        isolation_width = trailer_value(f'MS{ms_order.value} Isolation Width:')
+        spectrum.precursor_mz = calculate_selected_ion_mz(reaction.precursor_mass, reaction.isolation_width, monoisotopic_mz, isolation_width)
+    return spectrum
+
+
+def iterate_mgf_spectra(access: RawFileAccess, first_scan_number: int=None, last_scan_number: int=None, ms_levels: Set[MsOrderType]=None, centroids: bool=False) -> Iterator[MgfSpectrum]:
+    """
+    Read the spectra of a scan range for MGF export
+    :param access: Raw file access (with selected MS device)
+    :param first_scan_number: First scan (first scan of the file by default)
+    :param last_scan_number: Last scan (last scan of the file by default)
+    :param ms_levels: MS orders to export (MS2 by default)
+    :param centroids: If true, the centroid stream or centroided profile data is used (see read_mgf_spectrum)
+    :returns: Iterator over spectra in scan order
+    """
+    ms_levels = {MsOrderType.Ms2} if ms_levels is None else set(ms_levels)
+    first_scan_number = access.run_header.first_spectrum if first_scan_number is None else first_scan_number
+    last_scan_number = access.run_header.last_spectrum if last_scan_number is None else last_scan_number
+    trailer_indices = get_trailer_indices(access)
+
+    for scan_number in range(first_scan_number, last_scan_number + 1):
+        spectrum = read_mgf_spectrum(access, scan_number, trailer_indices, ms_levels, centroids)
+        if spectrum is not None:
+            yield spectrum
+
+
+def write_mgf(raw_file_path: str, output: Union[str, TextIO], ms_levels: Set[MsOrderType]=None, centroids: bool=False, include_reference_and_exception_peaks: bool=True,
+              workers: int=1, buffer_size: int=DEFAULT_BUFFER_SIZE) -> int:
+    """
+    Export the spectra of a raw file to MGF
+    :param raw_file_path: Path to the raw file
+    :param output: Output path or file object opened for writing text
+    :param ms_levels: MS orders to export (MS2 by default)
+    :param centroids: If true, the centroid stream or centroided profile data is used (see read_mgf_spectrum)
+    :param include_reference_and_exception_peaks: If true, reference and exception peaks are exported as well
+    :param workers: Number of threads reading spectra (each with its own raw file accessor)
+    :param buffer_size: Number of characters collected before they are written to the file
+    :returns: Number of spectra written
+    """
+    ms_levels = {MsOrderType.Ms2} if ms_levels is None else set(ms_levels)
+
+    with RawFileReaderAdapter.file_factory(raw_file_path) as access:
+        access.select_instrument(Device.MS, 1)
+        access.include_reference_and_exception_data = include_reference_and_exception_peaks
+        first_scan_number = access.run_header.first_spectrum
+        last_scan_number = access.run_header.last_spectrum
+
+        with MgfWriter(output, buffer_size) as writer:
+            if workers == 1:
+                return writer.write_all(iterate_mgf_spectra(access, first_scan_number, last_scan_number, ms_levels, centroids))
+
+            trailer_indices = get_trailer_indices(access)
+
+            def read(thread_access: RawFileAccess, scan_number: int) -> MgfSpectrum:
+                thread_access.include_reference_and_exception_data = include_reference_and_exception_peaks
+                return read_mgf_spectrum(thread_access, scan_number, trailer_indices, ms_levels, centroids)
+
+            spectra = parallel_scans(raw_file_path, first_scan_number, last_scan_number, read, workers)
+            return writer.write_all(s for s in spectra if s is not None)
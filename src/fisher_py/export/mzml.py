@@ -0,0 +1,569 @@
+from __future__ import annotations
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Set, Tuple, Union
+from xml.sax.saxutils import quoteattr
+from datetime import datetime
+from fisher_py.raw_file_reader import RawFileAccess, RawFileReaderAdapter
+from fisher_py.raw_file_reader.data_model import ScanEventTable
+from fisher_py.data.filter_enums import ActivationType, MsOrderType, PolarityType
+from fisher_py.data.scan_event import ScanEvent
+from fisher_py.data import Device
+from fisher_py.export._common import calculate_selected_ion_mz, get_trailer_indices, read_trailer_values, get_reaction
+from fisher_py.export import numpress
+import numpy as np
+import importlib.metadata
+import hashlib
+import base64
+import zlib
+import os
+
+DEFAULT_BUFFER_SIZE = 1024**2
+DEFAULT_CHUNK_SIZE = 64
+COMPRESSIONS = ('none', 'zlib')
+
+_ACTIVATION_TERMS = {
+    ActivationType.CollisionInducedDissociation: ('MS:1000133', 'collision-induced dissociation'),
+    ActivationType.MultiPhotonDissociation: ('MS:1000435', 'photodissociation'),
+    ActivationType.ElectronCaptureDissociation: ('MS:1000250', 'electron capture dissociation'),
+    ActivationType.PQD: ('MS:1000599', 'pulsed q dissociation'),
+    ActivationType.ElectronTransferDissociation: ('MS:1000598', 'electron transfer dissociation'),
+    ActivationType.HigherEnergyCollisionalDissociation: ('MS:1000422', 'beam-type collision-induced dissociation'),
+    ActivationType.UltraVioletPhotoDissociation: ('MS:1003246', 'ultraviolet photodissociation'),
+}
+
+# (accession, name) of the compression term depending on (numpress method, zlib)
+_COMPRESSION_TERMS = {
+    (None, False): ('MS:1000576', 'no compression'),
+    (None, True): ('MS:1000574', 'zlib compression'),
+    ('linear', False): ('MS:1002312', 'MS-Numpress linear prediction compression'),
+    ('linear', True): ('MS:1002746', 'MS-Numpress linear prediction compression followed by zlib compression'),
+    ('slof', False): ('MS:1002314', 'MS-Numpress short logged float compression'),
+    ('slof', True): ('MS:1002748', 'MS-Numpress short logged float compression followed by zlib compression'),
+}
+
+_MZ_UNIT = ' unitCvRef="MS" unitAccession="MS:1000040" unitName="m/z"'
+_COUNTS_UNIT = ' unitCvRef="MS" unitAccession="MS:1000131" unitName="number of detector counts"'
+_MINUTE_UNIT = ' unitCvRef="UO" unitAccession="UO:0000031" unitName="minute"'
+
+
+class MzmlSpectrum(object):
+    """
+    Spectrum as written to an mzML file
+    """
+
+    __slots__ = (
+        'scan_number', 'ms_order', 'retention_time', 'masses', 'intensities', 'centroided', 'polarity', 'filter_string',
+        'tic', 'base_peak_mass', 'base_peak_intensity', 'precursor_scan_number', 'isolation_target_mz', 'isolation_width',
+        'selected_ion_mz', 'charge', 'activation_type', 'collision_energy'
+    )
+
+    def __init__(self, scan_number: int, ms_order: int, retention_time: float, masses: np.ndarray, intensities: np.ndarray, centroided: bool=True, polarity: PolarityType=PolarityType.Positive, filter_string: str=None):
+        self.scan_number = scan_number
+        self.ms_order = ms_order
+        self.retention_time = retention_time
+        self.masses = masses
+        self.intensities = intensities
+        self.centroided = centroided
+        self.polarity = polarity
+        self.filter_string = filter_string
+        self.tic = None
+        self.base_peak_mass = None
+        self.base_peak_intensity = None
+        self.precursor_scan_number = None
+        self.isolation_target_mz = None
+        self.isolation_width = None
+        self.selected_ion_mz = None
+        self.charge = None
+        self.activation_type = None
+        self.collision_energy = None
+
+    @property
+    def native_id(self) -> str:
+        """
+        Native id of the spectrum (Thermo nativeID format)
+        """
+        return _native_id(self.scan_number)
+
+
+def _native_id(scan_number: int) -> str:
+    return f'controllerType={Device.MS.value} controllerNumber=1 scan={scan_number}'
+
+
+def _software_version() -> str:
+    try:
+        return importlib.metadata.version('fisher_py')
+    except importlib.metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def _cv_param(accession: str, name: str, value='', unit: str='') -> str:
+    return f'<cvParam cvRef="{accession.split(":")[0]}" accession="{accession}" name="{name}" value={quoteattr(str(value))}{unit}/>'
+
+
+def encode_binary_array(values: np.ndarray, dtype: type=np.float64, compression: str='zlib', numpress_method: str=None) -> Tuple[str, str, str]:
+    """
+    Encode an array for a binaryDataArray element
+    :param values: The values
+    :param dtype: Data type the values are stored as (np.float64 or np.float32, ignored if numpress is used)
+    :param compression: 'zlib' or 'none'
+    :param numpress_method: None, 'linear' or 'slof' (MS-Numpress encoding applied before compression)
+    :returns: Tuple organized as (base64 text, compression term accession, compression term name)
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f'Unknown compression "{compression}", use one of {COMPRESSIONS}.')
+
+    if numpress_method == 'linear':
+        data = numpress.encode_linear(values)
+    elif numpress_method == 'slof':
+        data = numpress.encode_slof(values)
+    elif numpress_method is None:
+        data = np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder('<')).tobytes()
+    else:
+        raise ValueError(f'Unknown numpress method "{numpress_method}".')
+
+    use_zlib = compression == 'zlib'
+    if use_zlib:
+        data = zlib.compress(data)
+    accession, name = _COMPRESSION_TERMS[(numpress_method, use_zlib)]
+    return base64.b64encode(data).decode('ascii'), accession, name
+
+
+def _file_content_lines(ms_orders: Iterable[int]) -> List[str]:
+    ms_orders = None if ms_orders is None else set(int(o) for o in ms_orders)
+    lines = list()
+    if ms_orders is not None and MsOrderType.Ms.value in ms_orders:
+        lines.append(_cv_param('MS:1000579', 'MS1 spectrum'))
+    if ms_orders is None or any(o >= MsOrderType.Ms2.value for o in ms_orders) or len(lines) == 0:
+        lines.append(_cv_param('MS:1000580', 'MSn spectrum'))
+    return lines
+
+
+class MzmlWriter(object):
+    """
+    Streaming indexed mzML writer. Spectra and chromatograms are written as they are passed
+    in, only their byte offsets are kept in memory. The offset index and the SHA-1 checksum
+    of the file are written when the writer is closed. Offsets count from the start of the
+    document, i.e. from the stream position at which the writer was created.
+    """
+
+    def __init__(self, file: Union[str, BinaryIO], spectrum_count: int, chromatogram_count: int=0, run_id: str='run', source_file_path: str=None,
+                 start_time_stamp: datetime=None, instrument_model: str=None, instrument_serial_number: str=None, compression: str='zlib',
+                 use_numpress: bool=False, buffer_size: int=DEFAULT_BUFFER_SIZE, ms_orders: Iterable[int]=None):
+        """
+        Create writer and write the file header
+        :param file: Output path or file object opened for writing bytes
+        :param spectrum_count: Number of spectra that will be written
+        :param chromatogram_count: Number of chromatograms that will be written (after the spectra)
+        :param run_id: Id of the run
+        :param source_file_path: Path of the raw file the data originates from
+        :param start_time_stamp: Start of the acquisition
+        :param instrument_model: Name of the instrument model
+        :param instrument_serial_number: Serial number of the instrument
+        :param compression: 'zlib' or 'none'
+        :param use_numpress: If true, m/z and time arrays are encoded with MS-Numpress linear prediction and intensities
+            with MS-Numpress short logged float compression (lossy)
+        :param buffer_size: Number of bytes collected before they are written to the file
+        :param ms_orders: MS orders of the spectra that will be written (file content description, MSn spectra by default)
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f'Unknown compression "{compression}", use one of {COMPRESSIONS}.')
+
+        self._owns_file = type(file) is str
+        self._file = open(file, 'wb') if self._owns_file else file
+        self._buffer_size = buffer_size
+        self._buffer = list()
+        self._buffered = 0
+
+        # number of bytes written since the writer was created (not the position in the stream,
+        # which may already contain data), the index offsets are relative to the document
+        self._offset = 0
+        self._sha1 = hashlib.sha1()
+        self._compression = compression
+        self._use_numpress = use_numpress
+        self._spectrum_count = spectrum_count
+        self._chromatogram_count = chromatogram_count
+        self._spectrum_offsets = list()
+        self._chromatogram_offsets = list()
+        self._closed = False
+        self._write_header(run_id, source_file_path, start_time_stamp, instrument_model, instrument_serial_number, ms_orders)
+
+    @property
+    def spectra_count(self) -> int:
+        """
+        Number of spectra written so far
+        """
+        return len(self._spectrum_offsets)
+
+    @property
+    def chromatogram_count(self) -> int:
+        """
+        Number of chromatograms written so far
+        """
+        return len(self._chromatogram_offsets)
+
+    def write_spectrum(self, spectrum: MzmlSpectrum):
+        """
+        Write a spectrum
+        :param spectrum: The spectrum
+        """
+        if len(self._chromatogram_offsets) > 0:
+            raise RuntimeError('Spectra must be written before chromatograms.')
+        if len(self._spectrum_offsets) >= self._spectrum_count:
+            raise RuntimeError(f'More spectra written than announced ({self._spectrum_count}).')
+
+        native_id = spectrum.native_id
+        self._spectrum_offsets.append((native_id, self._offset))
+        is_ms1 = spectrum.ms_order == 1
+        lines = [
+            f'<spectrum index="{len(self._spectrum_offsets) - 1}" id="{native_id}" defaultArrayLength="{len(spectrum.masses)}">',
+            _cv_param('MS:1000511', 'ms level', spectrum.ms_order),
+            _cv_param('MS:1000579', 'MS1 spectrum') if is_ms1 else _cv_param('MS:1000580', 'MSn spectrum'),
+            _cv_param('MS:1000130', 'positive scan') if spectrum.polarity == PolarityType.Positive else _cv_param('MS:1000129', 'negative scan'),
+            _cv_param('MS:1000127', 'centroid spectrum') if spectrum.centroided else _cv_param('MS:1000128', 'profile spectrum'),
+        ]
+        if spectrum.tic is not None:
+            lines.append(_cv_param('MS:1000285', 'total ion current', spectrum.tic))
+        if spectrum.base_peak_mass is not None:
+            lines.append(_cv_param('MS:1000504', 'base peak m/z', spectrum.base_peak_mass, _MZ_UNIT))
+            lines.append(_cv_param('MS:1000505', 'base peak intensity', spectrum.base_peak_intensity, _COUNTS_UNIT))
+
+        lines.append('<scanList count="1">')
+        lines.append(_cv_param('MS:1000795', 'no combination'))
+        lines.append('<scan>')
+        lines.append(_cv_param('MS:1000016', 'scan start time', spectrum.retention_time, _MINUTE_UNIT))
+        if spectrum.filter_string is not None:
+            lines.append(_cv_param('MS:1000512', 'filter string', spectrum.filter_string))
+        lines.append('</scan>')
+        lines.append('</scanList>')
+
+        if not is_ms1 and spectrum.selected_ion_mz is not None:
+            lines.extend(self._precursor_lines(spectrum))
+
+        lines.append('<binaryDataArrayList count="2">')
+        lines.extend(self._binary_data_array_lines(spectrum.masses, 'linear', np.float64, 'MS:1000514', 'm/z array', _MZ_UNIT))
+        lines.extend(self._binary_data_array_lines(spectrum.intensities, 'slof', np.float32, 'MS:1000515', 'intensity array', _COUNTS_UNIT))
+        lines.append('</binaryDataArrayList>')
+        lines.append('</spectrum>\n')
+        self._write('\n'.join(lines))
+
+    def write_chromatogram(self, chromatogram_id: str, times: np.ndarray, intensities: np.ndarray, accession: str='MS:1000235', name: str='total ion current chromatogram'):
+        """
+        Write a chromatogram (all spectra need to be written first)
+        :param chromatogram_id: Id of the chromatogram (e.g. "TIC")
+        :param times: Retention times in minutes
+        :param intensities: Intensities
+        :param accession: Accession of the chromatogram type
+        :param name: Name of the chromatogram type
+        """
+        if len(self._chromatogram_offsets) >= self._chromatogram_count:
+            raise RuntimeError(f'More chromatograms written than announced ({self._chromatogram_count}).')
+        if len(self._chromatogram_offsets) == 0:
+            self._end_spectrum_list()
+
+        self._chromatogram_offsets.append((chromatogram_id, self._offset))
+        lines = [
+            f'<chromatogram index="{len(self._chromatogram_offsets) - 1}" id={quoteattr(chromatogram_id)} defaultArrayLength="{len(times)}">',
+            _cv_param(accession, name),
+            '<binaryDataArrayList count="2">',
+        ]
+        lines.extend(self._binary_data_array_lines(times, 'linear', np.float64, 'MS:1000595', 'time array', _MINUTE_UNIT))
+        lines.extend(self._binary_data_array_lines(intensities, 'slof', np.float32, 'MS:1000515', 'intensity array', _COUNTS_UNIT))
+        lines.append('</binaryDataArrayList>')
+        lines.append('</chromatogram>\n')
+        self._write('\n'.join(lines))
+
+    def close(self):
+        """
+        Write the offset index and the checksum, flush the buffer and close the file (if it
+        was opened by the writer)
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        if len(self._spectrum_offsets) != self._spectrum_count or len(self._chromatogram_offsets) != self._chromatogram_count:
+            raise RuntimeError(
+                f'Expected {self._spectrum_count} spectra and {self._chromatogram_count} chromatograms '
+                f'but {len(self._spectrum_offsets)} and {len(self._chromatogram_offsets)} were written.'
+            )
+
+        if self._chromatogram_count == 0:
+            self._end_spectrum_list()
+        else:
+            self._write('</chromatogramList>\n')
+        self._write('</run>\n</mzML>\n')
+
+        index_list_offset = self._offset
+        lines = [f'<indexList count="{1 if self._chromatogram_count == 0 else 2}">', '<index name="spectrum">']
+        lines.extend(f'<offset idRef={quoteattr(i)}>{offset}</offset>' for i, offset in self._spectrum_offsets)
+        lines.append('</index>')
+        if self._chromatogram_count > 0:
+            lines.append('<index name="chromatogram">')
+            lines.extend(f'<offset idRef={quoteattr(i)}>{offset}</offset>' for i, offset in self._chromatogram_offsets)
+            lines.append('</index>')
+        lines.append('</indexList>')
+        lines.append(f'<indexListOffset>{index_list_offset}</indexListOffset>')
+        lines.append('<fileChecksum>')
+        self._write('\n'.join(lines))
+
+        # the checksum covers everything up to and including the opening fileChecksum tag
+        self._write(f'{self._sha1.hexdigest()}</fileChecksum>\n</indexedmzML>\n')
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+
+    def flush(self):
+        """
+        Write buffered data to the file
+        """
+        self._file.write(b''.join(self._buffer))
+        self._buffer.clear()
+        self._buffered = 0
+
+    def __enter__(self) -> MzmlWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        elif self._owns_file:
+            self.flush()
+            self._file.close()
+
+    def _write(self, text: str):
+        data = text.encode('utf-8')
+        self._sha1.update(data)
+        self._offset += len(data)
+        self._buffer.append(data)
+        self._buffered += len(data)
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+    def _write_header(self, run_id: str, source_file_path: str, start_time_stamp: datetime, instrument_model: str, instrument_serial_number: str, ms_orders: Iterable[int]):
+        lines = [
+            '<?xml version="1.0" encoding="utf-8"?>',
+            '<indexedmzML xmlns="http://psi.hupo.org/ms/mzml" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            'xsi:schemaLocation="http://psi.hupo.org/ms/mzml http://psidev.info/files/ms/mzML/xsd/mzML1.1.2_idx.xsd">',
+            f'<mzML xmlns="http://psi.hupo.org/ms/mzml" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+            f'xsi:schemaLocation="http://psi.hupo.org/ms/mzml http://psidev.info/files/ms/mzML/xsd/mzML1.1.0.xsd" id={quoteattr(run_id)} version="1.1.0">',
+            '<cvList count="2">',
+            '<cv id="MS" fullName="Proteomics Standards Initiative Mass Spectrometry Ontology" URI="https://raw.githubusercontent.com/HUPO-PSI/psi-ms-CV/master/psi-ms.obo"/>',
+            '<cv id="UO" fullName="Unit Ontology" URI="https://raw.githubusercontent.com/bio-ontology-research-group/unit-ontology/master/unit.obo"/>',
+            '</cvList>',
+            '<fileDescription>',
+            '<fileContent>',
+            *_file_content_lines(ms_orders),
+            '</fileContent>',
+        ]
+        if source_file_path is not None:
+            directory, name = os.path.split(os.path.abspath(source_file_path))
+            lines.extend([
+                '<sourceFileList count="1">',
+                f'<sourceFile id="RAW1" name={quoteattr(name)} location={quoteattr("file:///" + directory.lstrip("/"))}>',
+                _cv_param('MS:1000768', 'Thermo nativeID format'),
+                _cv_param('MS:1000563', 'Thermo RAW format'),
+                '</sourceFile>',
+                '</sourceFileList>',
+            ])
+        lines.extend([
+            '</fileDescription>',
+            '<softwareList count="1">',
+            f'<software id="fisher_py" version={quoteattr(_software_version())}>',
+            _cv_param('MS:1000799', 'custom unreleased software tool', 'fisher_py'),
+            '</software>',
+            '</softwareList>',
+            '<instrumentConfigurationList count="1">',
+            '<instrumentConfiguration id="IC1">',
+            _cv_param('MS:1000483', 'Thermo Fisher Scientific instrument model', instrument_model or ''),
+        ])
+        if instrument_serial_number:
+            lines.append(_cv_param('MS:1000529', 'instrument serial number', instrument_serial_number))
+        lines.extend([
+            '</instrumentConfiguration>',
+            '</instrumentConfigurationList>',
+            '<dataProcessingList count="1">',
+            '<dataProcessing id="fisher_py_conversion">',
+            '<processingMethod order="0" softwareRef="fisher_py">',
+            _cv_param('MS:1000544', 'Conversion to mzML'),
+            '</processingMethod>',
+            '</dataProcessing>',
+            '</dataProcessingList>',
+        ])
+        run_attributes = f'id={quoteattr(run_id)} defaultInstrumentConfigurationRef="IC1"'
+        if start_time_stamp is not None:
+            run_attributes += f' startTimeStamp="{start_time_stamp.strftime("%Y-%m-%dT%H:%M:%S")}"'
+        if source_file_path is not None:
+            run_attributes += ' defaultSourceFileRef="RAW1"'
+        lines.append(f'<run {run_attributes}>')
+        lines.append(f'<spectrumList count="{self._spectrum_count}" defaultDataProcessingRef="fisher_py_conversion">\n')
+        self._write('\n'.join(lines))
+
+    def _end_spectrum_list(self):
+        self._write('</spectrumList>\n')
+        if self._chromatogram_count > 0:
+            self._write(f'<chromatogramList count="{self._chromatogram_count}" defaultDataProcessingRef="fisher_py_conversion">\n')
+
+    def _precursor_lines(self, spectrum: MzmlSpectrum) -> List[str]:
+        lines = ['<precursorList count="1">']
+        if spectrum.precursor_scan_number is not None:
+            lines.append(f'<precursor spectrumRef="{_native_id(spectrum.precursor_scan_number)}">')
+        else:
+            lines.append('<precursor>')
+
+        if spectrum.isolation_target_mz is not None:
+            lines.append('<isolationWindow>')
+            lines.append(_cv_param('MS:1000827', 'isolation window target m/z', spectrum.isolation_target_mz, _MZ_UNIT))
+            if spectrum.isolation_width:
+                lines.append(_cv_param('MS:1000828', 'isolation window lower offset', spectrum.isolation_width / 2, _MZ_UNIT))
+                lines.append(_cv_param('MS:1000829', 'isolation window upper offset', spectrum.isolation_width / 2, _MZ_UNIT))
+            lines.append('</isolationWindow>')
+
+        lines.append('<selectedIonList count="1">')
+        lines.append('<selectedIon>')
+        lines.append(_cv_param('MS:1000744', 'selected ion m/z', spectrum.selected_ion_mz, _MZ_UNIT))
+        if spectrum.charge:
+            lines.append(_cv_param('MS:1000041', 'charge state', spectrum.charge))
+        lines.append('</selectedIon>')
+        lines.append('</selectedIonList>')
+
+        lines.append('<activation>')
+        term = _ACTIVATION_TERMS.get(spectrum.activation_type)
+        if term is not None:
+            lines.append(_cv_param(*term))
+        if spectrum.collision_energy is not None:
+            lines.append(_cv_param('MS:1000045', 'collision energy', spectrum.collision_energy, ' unitCvRef="UO" unitAccession="UO:0000266" unitName="electronvolt"'))
+        lines.append('</activation>')
+        lines.append('</precursor>')
+        lines.append('</precursorList>')
+        return lines
+
+    def _binary_data_array_lines(self, values: np.ndarray, numpress_method: str, dtype: type, accession: str, name: str, unit: str) -> List[str]:
+        numpress_method = numpress_method if self._use_numpress else None
+        text, compression_accession, compression_name = encode_binary_array(values, dtype, self._compression, numpress_method)
+        is_double = numpress_method is not None or dtype == np.float64
+        return [
+            f'<binaryDataArray encodedLength="{len(text)}">',
+            _cv_param('MS:1000523', '64-bit float') if is_double else _cv_param('MS:1000521', '32-bit float'),
+            _cv_param(compression_accession, compression_name),
+            _cv_param(accession, name, '', unit),
+            f'<binary>{text}</binary>',
+            '</binaryDataArray>',
+        ]
+
+
+def iterate_mzml_spectra(access: RawFileAccess, first_scan_number: int=None, last_scan_number: int=None, ms_levels: Set[MsOrderType]=None, centroids: bool=True, chunk_size: int=DEFAULT_CHUNK_SIZE) -> Iterator[MzmlSpectrum]:
+    """
+    Read the spectra of a scan range for mzML export. The peaks are read chunk-wise with
+    RawFileAccess.read_scans, so only chunk_size scans are held in memory at once.
+    :param access: Raw file access (with selected MS device)
+    :param first_scan_number: First scan (first scan of the file by default)
+    :param last_scan_number: Last scan (last scan of the file by default)
+    :param ms_levels: MS orders to export (all by default)
+    :param centroids: If true, the centroid stream is used for scans which have one
+    :param chunk_size: Number of scans read at once
+    :returns: Iterator over spectra in scan order
+    """
+    first_scan_number = access.run_header.first_spectrum if first_scan_number is None else first_scan_number
+    last_scan_number = access.run_header.last_spectrum if last_scan_number is None else last_scan_number
+    event_table = access.get_scan_event_table(first_scan_number, last_scan_number)
+    yield from _iterate_mzml_spectra(access, event_table, ms_levels, centroids, chunk_size)
+
+
+def _iterate_mzml_spectra(access: RawFileAccess, event_table: ScanEventTable, ms_levels: Set[MsOrderType], centroids: bool, chunk_size: int,
+                          retention_times: np.ndarray=None, tics: np.ndarray=None) -> Iterator[MzmlSpectrum]:
+    # the scan events of the whole range are read once, retention times and TICs of all scans
+    # (not only the exported ones) are optionally collected for the TIC chromatogram
+    first_scan_number, last_scan_number = event_table.first_scan_number, event_table.last_scan_number
+    ms_levels = None if ms_levels is None else {MsOrderType(l).value for l in ms_levels}
+    trailer_indices = get_trailer_indices(access)
+    filter_strings, filter_ids = event_table.filter_strings, event_table.filter_ids
+
+    # most recent scan of each MS order, used as reference to the precursor spectrum
+    last_scan_of_order = dict()
+
+    for start in range(first_scan_number, last_scan_number + 1, chunk_size):
+        end = min(start + chunk_size - 1, last_scan_number)
+        packed = access.read_scans(start, end, prefer_centroids=centroids)
+        position = start - first_scan_number
+        if retention_times is not None:
+            retention_times[position:position + len(packed)] = packed.retention_times
+            tics[position:position + len(packed)] = packed.tics
+
+        for i, scan_number in enumerate(packed.scan_numbers.tolist()):
+            event = event_table.events[event_table.event_ids[position + i]]
+            ms_order = int(packed.ms_orders[i])
+            last_scan_of_order[ms_order] = scan_number
+            if ms_levels is not None and ms_order not in ms_levels:
+                continue
+
+            masses, intensities, _ = packed.get_scan(i)
+            if len(masses) > 1 and np.any(np.diff(masses) < 0):
+                order = np.argsort(masses, kind='stable')
+                masses, intensities = masses[order], intensities[order]
+
+            spectrum = MzmlSpectrum(
+                scan_number, ms_order, float(packed.retention_times[i]), masses, intensities, bool(packed.centroided[i]),
+                event.polarity, filter_strings[filter_ids[position + i]]
+            )
+            spectrum.tic = float(packed.tics[i])
+            spectrum.base_peak_mass = float(packed.base_peak_masses[i])
+            spectrum.base_peak_intensity = float(packed.base_peak_intensities[i])
+
+            if ms_order >= MsOrderType.Ms2.value:
+                _read_precursor(access, spectrum, event.scan_event, trailer_indices)
+                spectrum.precursor_scan_number = last_scan_of_order.get(ms_order - 1)
+            yield spectrum
+
+
+def _read_precursor(access: RawFileAccess, spectrum: MzmlSpectrum, scan_event: ScanEvent, trailer_indices: Dict[str, int]):
+    # scans without reaction are written without precursor (as in the MGF export)
+    reaction = get_reaction(scan_event)
+    if reaction is None:
+        return
+
+    trailer_value = read_trailer_values(access, spectrum.scan_number, trailer_indices)
+    isolation_width = trailer_value(f'MS{spectrum.ms_order} Isolation Width:')
+    charge = trailer_value('Charge State:')
+
+    spectrum.isolation_target_mz = reaction.precursor_mass
+    spectrum.isolation_width = isolation_width if isolation_width else reaction.isolation_width
+    spectrum.selected_ion_mz = calculate_selected_ion_mz(reaction.precursor_mass, reaction.isolation_width, trailer_value('Monoisotopic M/Z:'), isolation_width)
+    spectrum.charge = int(charge) if charge is not None and charge > 0 else None
+    spectrum.activation_type = reaction.activation_type
+    spectrum.collision_energy = reaction.collision_energy
+
+
+def write_mzml(raw_file_path: str, output: Union[str, BinaryIO], ms_levels: Set[MsOrderType]=None, centroids: bool=True, compression: str='zlib',
+               use_numpress: bool=False, chunk_size: int=DEFAULT_CHUNK_SIZE, buffer_size: int=DEFAULT_BUFFER_SIZE) -> int:
+    """
+    Export the spectra of a raw file and its TIC chromatogram to indexed mzML
+    :param raw_file_path: Path to the raw file
+    :param output: Output path or file object opened for writing bytes
+    :param ms_levels: MS orders to export (all by default)
+    :param centroids: If true, the centroid stream is used for scans which have one
+    :param compression: 'zlib' or 'none'
+    :param use_numpress: If true, the binary arrays are MS-Numpress encoded (lossy)
+    :param chunk_size: Number of scans read at once
+    :param buffer_size: Number of bytes collected before they are written to the file
+    :returns: Number of spectra written
+    """
+    with RawFileReaderAdapter.file_factory(raw_file_path) as access:
+        access.select_instrument(Device.MS, 1)
+        first_scan_number = access.run_header.first_spectrum
+        last_scan_number = access.run_header.last_spectrum
+
+        event_table = access.get_scan_event_table(first_scan_number, last_scan_number)
+        ms_orders = event_table.ms_orders
+        if ms_levels is not None:
+            ms_orders = ms_orders[np.isin(ms_orders, [MsOrderType(l).value for l in ms_levels])]
+
+        instrument_data = access.get_instrument_data()
+        run_id = os.path.splitext(os.path.basename(raw_file_path))[0]
+        times = np.empty(len(event_table), dtype=np.float64)
+        tics = np.empty(len(event_table), dtype=np.float64)
+
+        with MzmlWriter(output, len(ms_orders), 1, run_id, raw_file_path, access.creation_date, instrument_data.model,
+                        instrument_data.serial_number, compression, use_numpress, buffer_size, np.unique(ms_orders).tolist()) as writer:
+            for spectrum in _iterate_mzml_spectra(access, event_table, ms_levels, centroids, chunk_size, times, tics):
+                writer.write_spectrum(spectrum)
+            writer.write_chromatogram('TIC', times, tics)
+            return writer.spectra_count
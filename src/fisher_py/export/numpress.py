@@ -0,0 +1,110 @@
+import numpy as np
+
+
+def optimal_linear_fixed_point(data: np.ndarray) -> float:
+    """
+    Compute the largest fixed point for which encode_linear does not overflow
+    :param data: Values to encode
+    :returns: The fixed point
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if len(data) == 0:
+        return 0.0
+    if len(data) == 1:
+        return float(np.floor(0x7FFFFFFF / data[0]))
+
+    max_double = max(data[0], data[1])
+    if len(data) > 2:
+        extrapolation_errors = np.abs(data[2:] - (2 * data[1:-1] - data[:-2]))
+        max_double = max(max_double, np.ceil(extrapolation_errors.max() + 1))
+    return float(np.floor(0x7FFFFFFF / max_double))
+
+
+def optimal_slof_fixed_point(data: np.ndarray) -> float:
+    """
+    Compute the largest fixed point for which encode_slof does not overflow
+    :param data: Values to encode
+    :returns: The fixed point
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if len(data) == 0:
+        return 0.0
+    max_double = max(1.0, np.log(data + 1).max())
+    return float(np.floor(0xFFFF / max_double))
+
+
+def _encode_fixed_point(fixed_point: float) -> bytes:
+    return np.array([fixed_point], dtype='>f8').tobytes()
+
+
+def _half_bytes(values: np.ndarray) -> np.ndarray:
+    # Encodes each value as a count nibble followed by its significant nibbles (least
+    # significant first). Leading 0x0 nibbles are dropped for positive values, leading
+    # 0xf nibbles for negative ones (count + 8).
+    values = values.astype(np.int64) & 0xFFFFFFFF
+    nibbles = (values[:, None] >> (4 * np.arange(8))) & 0xF
+    negative = nibbles[:, 7] == 0xF
+
+    significant = np.where(negative[:, None], nibbles != 0xF, nibbles != 0)
+    highest = np.where(significant.any(axis=1), 7 - np.argmax(significant[:, ::-1], axis=1), -1)
+    leading = 7 - highest
+    leading[negative] = np.minimum(leading[negative], 7)
+
+    table = np.empty((len(values), 9), dtype=np.uint8)
+    table[:, 0] = leading + 8 * negative
+    table[:, 1:] = nibbles
+    mask = np.arange(9) <= (8 - leading)[:, None]
+    return table[mask]
+
+
+def _pack_half_bytes(half_bytes: np.ndarray) -> bytes:
+    if len(half_bytes) % 2 == 1:
+        half_bytes = np.append(half_bytes, np.uint8(0))
+    return ((half_bytes[0::2] << 4) | half_bytes[1::2]).astype(np.uint8).tobytes()
+
+
+def encode_linear(data: np.ndarray, fixed_point: float=None) -> bytes:
+    """
+    Encode values with MS-Numpress linear prediction (MS:1002312). Suited for monotonic
+    values such as m/z or retention times. Each value is stored as fixed point integer and
+    only the difference to a linear extrapolation of the two previous values is written
+    using a variable number of half bytes.
+    :param data: Values to encode
+    :param fixed_point: Scaling factor (see optimal_linear_fixed_point which is used by default)
+    :returns: The encoded bytes
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if fixed_point is None:
+        fixed_point = optimal_linear_fixed_point(data)
+
+    result = _encode_fixed_point(fixed_point)
+    if len(data) == 0:
+        return result
+
+    ints = (data * fixed_point + 0.5).astype(np.int64)
+    result += (ints[:2] & 0xFFFFFFFF).astype('<u4').tobytes()
+    if len(data) <= 2:
+        return result
+
+    diffs = ints[2:] - (2 * ints[1:-1] - ints[:-2])
+    if np.any(diffs > 0x7FFFFFFF) or np.any(diffs < -0x7FFFFFFF):
+        raise ValueError('Cannot encode a number that exceeds the bounds of a 32 bit integer.')
+    return result + _pack_half_bytes(_half_bytes(diffs))
+
+
+def encode_slof(data: np.ndarray, fixed_point: float=None) -> bytes:
+    """
+    Encode values with MS-Numpress short logged float compression (MS:1002314). Suited for
+    positive values such as intensities. Each value is stored as log(x + 1) in two bytes.
+    :param data: Values to encode
+    :param fixed_point: Scaling factor (see optimal_slof_fixed_point which is used by default)
+    :returns: The encoded bytes
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if fixed_point is None:
+        fixed_point = optimal_slof_fixed_point(data)
+
+    scaled = np.log(data + 1) * fixed_point
+    if np.any(scaled > 0xFFFF):
+        raise ValueError('Cannot encode a number that overflows an unsigned short.')
+    return _encode_fixed_point(fixed_point) + (scaled + 0.5).astype('<u2').tobytes()
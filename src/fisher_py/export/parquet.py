@@ -0,0 +1,249 @@
+"""
+Columnar export of spectra and scan metadata to Parquet (requires pyarrow). Every chunk of
+scans is written as one row group with one row per scan: the peaks are stored in list columns
+(mz, intensity) next to scalar columns from the scan events, the scan statistics and the
+trailer extra values. Readers can therefore skip row groups by retention time, precursor or
+MS order without touching the peaks, e.g.
+
+    import pyarrow.parquet as pq
+    table = pq.read_table('my_file.parquet', filters=[('ms_order', '=', 2), ('precursor_mz', '>', 500)])
+"""
+
+from __future__ import annotations
+from typing import BinaryIO, Iterator, List, Set, Tuple, Union
+from fisher_py.raw_file_reader import RawFileAccess, RawFileReaderAdapter, parallel_map
+from fisher_py.raw_file_reader.data_model.log_table import _numpy_types_of_data_types, _boolean_data_types
+from fisher_py.data.business import GenericDataTypes
+from fisher_py.data.filter_enums import MsOrderType
+from fisher_py.data import Device
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_COMPRESSION = 'zstd'
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError('The Parquet export requires pyarrow, install it with "pip install pyarrow".')
+
+
+def trailer_column_name(label: str) -> str:
+    """
+    Column name of a trailer extra field (label without colon and control characters,
+    e.g. 'Charge State:' -> 'Charge State')
+    :param label: Label of the trailer field (see RawFileAccess.trailer_table)
+    :returns: The column name (empty for separator fields without a name)
+    """
+    return ''.join(c for c in label if c.isprintable()).replace(':', '').strip()
+
+
+def _get_trailer_column_names(labels: List[str], used_names: List[str]) -> List[str]:
+    # labels which only differ in colons or control characters map to the same name, repetitions
+    # (also of the spectrum columns) are numbered as repeated log labels (see RawFileAccess.trailer_table)
+    names, name_counts = list(), {name: 1 for name in used_names}
+    for label in labels:
+        name = trailer_column_name(label)
+        if len(name) > 0 and name in name_counts:
+            base_name = name
+            while name in name_counts:
+                name_counts[base_name] += 1
+                name = f'{base_name} #{name_counts[base_name]}'
+        if len(name) > 0:
+            name_counts[name] = 1
+        names.append(name)
+    return names
+
+
+def _to_arrow_type(data_type: GenericDataTypes) -> pa.DataType:
+    dtype = _numpy_types_of_data_types.get(data_type)
+    if dtype is not None:
+        return pa.from_numpy_dtype(dtype)
+    return pa.bool_() if data_type in _boolean_data_types else pa.string()
+
+
+def _to_arrow_array(values: np.ndarray, missing: np.ndarray) -> pa.Array:
+    # values which could not be parsed are stored as null
+    return pa.array(values) if missing is None else pa.array(values, mask=missing)
+
+
+def _to_list_array(offsets: pa.Array, values: np.ndarray) -> pa.Array:
+    # the values buffer is shared with the numpy array (no copy)
+    return pa.ListArray.from_arrays(offsets, pa.array(values))
+
+
+def read_spectra_batch(access: RawFileAccess, first_scan_number: int, last_scan_number: int, centroids: bool=True, trailer_columns: List[str]=None, include_charges: bool=False) -> pa.RecordBatch:
+    """
+    Read a scan range into a record batch with one row per scan
+    :param access: Raw file access (with selected MS device)
+    :param first_scan_number: First scan
+    :param last_scan_number: Last scan
+    :param centroids: If true, the centroid stream is used for scans which have one
+    :param trailer_columns: Labels of the trailer extra fields to add as columns (all by default, empty list for none),
+        repeated column names (see trailer_column_name) are numbered, e.g. 'Charge State #2'
+    :param include_charges: If true, the peak charges are added as list column 'charge'
+    :returns: The record batch
+    """
+    _require_pyarrow()
+    packed = access.read_scans(first_scan_number, last_scan_number, prefer_centroids=centroids)
+    event_table = access.get_scan_event_table(first_scan_number, last_scan_number)
+
+    precursor_mzs = event_table.precursor_masses
+    isolation_widths = event_table.isolation_widths
+    activation_types = event_table.activation_types
+    filter_strings = np.array(event_table.filter_strings, dtype=object)
+
+    columns = {
+        'scan_number': pa.array(packed.scan_numbers),
+        'retention_time': pa.array(packed.retention_times),
+        'ms_order': pa.array(packed.ms_orders),
+        'mass_analyzer': pa.array(event_table.mass_analyzers),
+        'polarity': pa.array(event_table.polarities),
+        'filter_string': pa.array(filter_strings[event_table.filter_ids], type=pa.string()),
+        'precursor_mz': pa.array(precursor_mzs, mask=np.isnan(precursor_mzs)),
+        'isolation_width': pa.array(isolation_widths, mask=np.isnan(isolation_widths)),
+        'activation': pa.array(activation_types, mask=activation_types < 0),
+        'tic': pa.array(packed.tics),
+        'base_peak_mass': pa.array(packed.base_peak_masses),
+        'base_peak_intensity': pa.array(packed.base_peak_intensities),
+        'centroided': pa.array(packed.centroided),
+    }
+
+    offsets = pa.array(packed.offsets.astype(np.int32))
+    columns['mz'] = _to_list_array(offsets, packed.masses)
+    columns['intensity'] = _to_list_array(offsets, packed.intensities)
+    if include_charges:
+        columns['charge'] = _to_list_array(offsets, packed.charges)
+
+    if trailer_columns is None or len(trailer_columns) > 0:
+        trailer_table = access.trailer_table(trailer_columns, first_scan_number, last_scan_number)
+        for label, name in zip(trailer_table.labels, _get_trailer_column_names(trailer_table.labels, list(columns.keys()))):
+            if len(name) > 0:
+                columns[name] = _to_arrow_array(trailer_table[label], trailer_table.missing.get(label))
+
+    return pa.RecordBatch.from_arrays(list(columns.values()), names=list(columns.keys()))
+
+
+def _spectra_schema(access: RawFileAccess, trailer_columns: List[str]=None, include_charges: bool=False) -> pa.Schema:
+    """
+    Schema of the record batches of read_spectra_batch (e.g. for files without scans)
+    :param access: Raw file access (with selected MS device)
+    :param trailer_columns: Labels of the trailer extra fields to add as columns (all by default, empty list for none)
+    :param include_charges: If true, the peak charges are added as list column 'charge'
+    :returns: The schema
+    """
+    _require_pyarrow()
+    fields = [
+        ('scan_number', pa.int32()),
+        ('retention_time', pa.float64()),
+        ('ms_order', pa.int8()),
+        ('mass_analyzer', pa.int8()),
+        ('polarity', pa.int8()),
+        ('filter_string', pa.string()),
+        ('precursor_mz', pa.float64()),
+        ('isolation_width', pa.float64()),
+        ('activation', pa.int8()),
+        ('tic', pa.float64()),
+        ('base_peak_mass', pa.float64()),
+        ('base_peak_intensity', pa.float64()),
+        ('centroided', pa.bool_()),
+        ('mz', pa.list_(pa.float64())),
+        ('intensity', pa.list_(pa.float64())),
+    ]
+    if include_charges:
+        fields.append(('charge', pa.list_(pa.float64())))
+
+    if trailer_columns is None or len(trailer_columns) > 0:
+        headers = RawFileAccess._get_log_headers_(access.get_trailer_extra_header_information(), trailer_columns)
+        names = _get_trailer_column_names([label for _, label, _ in headers], [name for name, _ in fields])
+        fields.extend((name, _to_arrow_type(data_type)) for name, (_, _, data_type) in zip(names, headers) if len(name) > 0)
+
+    return pa.schema(fields)
+
+
+def _filter_ms_levels(batch: pa.RecordBatch, ms_levels: Set[int]) -> pa.RecordBatch:
+    if ms_levels is None:
+        return batch
+    mask = np.isin(batch.column('ms_order').to_numpy(), list(ms_levels))
+    return batch if mask.all() else batch.filter(pa.array(mask))
+
+
+def iterate_spectra_batches(access: RawFileAccess, first_scan_number: int=None, last_scan_number: int=None, ms_levels: Set[MsOrderType]=None, centroids: bool=True,
+                            chunk_size: int=DEFAULT_CHUNK_SIZE, trailer_columns: List[str]=None, include_charges: bool=False) -> Iterator[pa.RecordBatch]:
+    """
+    Read the spectra of a scan range as record batches (see read_spectra_batch)
+    :param access: Raw file access (with selected MS device)
+    :param first_scan_number: First scan (first scan of the file by default)
+    :param last_scan_number: Last scan (last scan of the file by default)
+    :param ms_levels: MS orders to export (all by default)
+    :param centroids: If true, the centroid stream is used for scans which have one
+    :param chunk_size: Number of scans read per batch
+    :param trailer_columns: Labels of the trailer extra fields to add as columns (all by default, empty list for none)
+    :param include_charges: If true, the peak charges are added as list column 'charge'
+    :returns: Iterator over record batches in scan order (batches can be empty if ms_levels is set)
+    """
+    first_scan_number = access.run_header.first_spectrum if first_scan_number is None else first_scan_number
+    last_scan_number = access.run_header.last_spectrum if last_scan_number is None else last_scan_number
+    ms_levels = None if ms_levels is None else {MsOrderType(l).value for l in ms_levels}
+
+    for start, end in _get_chunks(first_scan_number, last_scan_number, chunk_size):
+        batch = read_spectra_batch(access, start, end, centroids, trailer_columns, include_charges)
+        yield _filter_ms_levels(batch, ms_levels)
+
+
+def _get_chunks(first_scan_number: int, last_scan_number: int, chunk_size: int) -> List[Tuple[int, int]]:
+    assert chunk_size > 0
+    return [(start, min(start + chunk_size - 1, last_scan_number)) for start in range(first_scan_number, last_scan_number + 1, chunk_size)]
+
+
+def write_parquet(raw_file_path: str, output: Union[str, BinaryIO], ms_levels: Set[MsOrderType]=None, centroids: bool=True, chunk_size: int=DEFAULT_CHUNK_SIZE,
+                  trailer_columns: List[str]=None, include_charges: bool=False, compression: str=DEFAULT_COMPRESSION, workers: int=1) -> int:
+    """
+    Export the spectra of a raw file to Parquet, one row group per chunk of scans
+    :param raw_file_path: Path to the raw file
+    :param output: Output path or file object opened for writing bytes
+    :param ms_levels: MS orders to export (all by default)
+    :param centroids: If true, the centroid stream is used for scans which have one
+    :param chunk_size: Number of scans read per row group
+    :param trailer_columns: Labels of the trailer extra fields to add as columns (all by default, empty list for none)
+    :param include_charges: If true, the peak charges are added as list column 'charge'
+    :param compression: Parquet compression codec (e.g. 'zstd', 'snappy' or 'none')
+    :param workers: Number of threads reading chunks (each with its own raw file accessor)
+    :returns: Number of spectra written
+    """
+    _require_pyarrow()
+
+    with RawFileReaderAdapter.file_factory(raw_file_path) as access:
+        access.select_instrument(Device.MS, 1)
+        first_scan_number = access.run_header.first_spectrum
+        last_scan_number = access.run_header.last_spectrum
+
+        if workers == 1:
+            batches = iterate_spectra_batches(access, first_scan_number, last_scan_number, ms_levels, centroids, chunk_size, trailer_columns, include_charges)
+        else:
+            levels = None if ms_levels is None else {MsOrderType(l).value for l in ms_levels}
+            read = lambda thread_access, chunk: _filter_ms_levels(read_spectra_batch(thread_access, chunk[0], chunk[1], centroids, trailer_columns, include_charges), levels)
+            batches = parallel_map(raw_file_path, _get_chunks(first_scan_number, last_scan_number, chunk_size), read, workers)
+
+        writer = None
+        spectra_count = 0
+        try:
+            for batch in batches:
+                if writer is None:
+                    writer = pq.ParquetWriter(output, batch.schema, compression=compression)
+                if batch.num_rows > 0:
+                    writer.write_batch(batch, row_group_size=batch.num_rows)
+                    spectra_count += batch.num_rows
+            if writer is None:
+                # no scans, the file only holds the schema
+                writer = pq.ParquetWriter(output, _spectra_schema(access, trailer_columns, include_charges), compression=compression)
+        finally:
+            if writer is not None:
+                writer.close()
+        return spectra_count
@@ -0,0 +1,29 @@
+from typing import Dict
+import importlib
+
+
+def install_lazy_attributes(module_globals: dict, lazy_attributes: Dict[str, str]):
+    """
+    Let a package import its re-exported attributes on first access (PEP 562 module
+    __getattr__), so that importing the package does not import (and e.g. load the .NET
+    runtime for) modules which are not used. The attributes are also listed in __all__,
+    so "from package import *" keeps working (and imports all of them).
+    :param module_globals: globals() of the package
+    :param lazy_attributes: Dictionary mapping attribute names to the module defining them
+    """
+    package_name = module_globals['__name__']
+
+    def __getattr__(name: str):
+        module_name = lazy_attributes.get(name)
+        if module_name is None:
+            raise AttributeError(f'module {package_name!r} has no attribute {name!r}')
+        value = getattr(importlib.import_module(module_name), name)
+        module_globals[name] = value
+        return value
+
+    def __dir__():
+        return sorted(list(module_globals.keys()) + list(lazy_attributes.keys()))
+
+    module_globals['__all__'] = list(lazy_attributes.keys())
+    module_globals['__getattr__'] = __getattr__
+    module_globals['__dir__'] = __dir__
@@ -0,0 +1,107 @@
+from typing import Any, Callable, Hashable
+from collections import OrderedDict
+import threading
+
+
+class LruCache(object):
+    """
+    Thread-safe least-recently-used cache bounded by a byte budget. The size of an entry
+    is determined by the size function passed to the constructor.
+    """
+
+    @property
+    def max_size_bytes(self) -> int:
+        """
+        Byte budget of the cache (0 disables caching)
+        """
+        return self._max_size_bytes
+
+    @property
+    def size_bytes(self) -> int:
+        """
+        Bytes currently held by the cache
+        """
+        return self._size_bytes
+
+    @property
+    def hits(self) -> int:
+        """
+        Number of lookups which were answered from the cache
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        Number of lookups which were not found in the cache
+        """
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """
+        Number of entries removed to stay within the byte budget
+        """
+        return self._evictions
+
+    def __init__(self, max_size_bytes: int, size_function: Callable[[Any], int]):
+        assert type(max_size_bytes) is int and max_size_bytes >= 0
+        self._max_size_bytes = max_size_bytes
+        self._size_function = size_function
+        self._entries = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any=None) -> Any:
+        """
+        Get an entry and mark it as most recently used
+        :param key: Key of the entry
+        :param default: Value returned if the key is not cached
+        :returns: The cached value or the default
+        """
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return default
+
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Add an entry. Least recently used entries are evicted until the cache fits into the
+        byte budget. Entries larger than the whole budget are not cached.
+        :param key: Key of the entry
+        :param value: Value to cache
+        """
+        size = self._size_function(value)
+        with self._lock:
+            if key in self._entries:
+                self._size_bytes -= self._entries.pop(key)[1]
+            if size > self._max_size_bytes:
+                return
+
+            self._entries[key] = (value, size)
+            self._size_bytes += size
+            while self._size_bytes > self._max_size_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_size
+                self._evictions += 1
+
+    def clear(self):
+        """
+        Remove all entries (statistics are kept)
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
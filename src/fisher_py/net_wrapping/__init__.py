@@ -1,49 +1,10 @@
-import pythonnet
+from fisher_py.net_wrapping.runtime import load_runtime, is_runtime_loaded
 
-# Load dotnet before clr import. See https://pythonnet.github.io/pythonnet/python.html#loading-a-runtime
-try:
-  pythonnet.load()  # Try default (i.e. 'mono' or PYTHONNET_RUNTIME)
-except:
-  pythonnet.load('coreclr')  # Fallback on coreclr
+# the runtime is brought up when the first module wrapping .NET objects is imported
+# (importing fisher_py itself or modules without .NET dependencies does not load it)
+load_runtime()
 
-import clr
-import os
 from fisher_py.net_wrapping.net_wrapper_base import NetWrapperBase
-from System import Environment
-
-# codecs for implicit enum conversion
-import Python.Runtime
-
-Python.Runtime.PyObjectConversions.RegisterEncoder(Python.Runtime.Codecs.EnumPyIntCodec.Instance)
-Python.Runtime.PyObjectConversions.RegisterDecoder(Python.Runtime.Codecs.EnumPyIntCodec.Instance)
-
-
-# access .net standard dlls
-dotnet_version = Environment.Version.get_Major()
-dll_base_path = os.path.join(os.path.split(__file__)[0], '..', 'dll')
-
-if dotnet_version >= 8:
-  dll_path = os.path.join(dll_base_path, 'net8')
-elif dotnet_version >= 5:
-  dll_path = os.path.join(dll_base_path, 'net5')
-else:
-  dll_path = os.path.join(dll_base_path, 'net4')
-
-clr.AddReference('System')
-clr.AddReference('System.Core')
-clr.AddReference('System.Data')
-clr.AddReference('System.Configuration')
-clr.AddReference('System.Xml')
-clr.AddReference('mscorlib')
-
-clr.AddReference(os.path.join(dll_path, 'ThermoFisher.CommonCore.Data.dll'))
-clr.AddReference(os.path.join(dll_path, 'ThermoFisher.CommonCore.RawFileReader.dll'))
-clr.AddReference(os.path.join(dll_path, 'ThermoFisher.CommonCore.MassPrecisionEstimator.dll'))
-clr.AddReference(os.path.join(dll_path, 'ThermoFisher.CommonCore.BackgroundSubtraction.dll'))
-try:
-    clr.AddReference(os.path.join(dll_path, 'OpenMcdf.dll'))
-except Exception as e:
-    pass  # avoid duplicate load
 
 # import .net standard libaries
 import ThermoFisher.CommonCore.Data as thermo_fisher_data
@@ -0,0 +1,54 @@
+from typing import Any, Dict, List, Tuple
+import clr
+
+clr.AddReference('System')
+from System import Object
+from System.Runtime.CompilerServices import RuntimeHelpers
+
+
+class NetReferenceMap(object):
+    """
+    Maps .NET objects to values by reference identity. pythonnet creates a new Python
+    object each time a .NET reference is returned, so neither `is` nor the Python hash
+    can be used to recognize an object that was seen before.
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, List[Tuple[Any, Any]]] = dict()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, net_obj: Any, default: Any=None) -> Any:
+        """
+        Get the value stored for a .NET object
+        :param net_obj: The .NET object
+        :param default: Value returned if the object is unknown
+        :returns: The stored value or the default
+        """
+        for known, value in self._entries.get(RuntimeHelpers.GetHashCode(net_obj), ()):
+            if Object.ReferenceEquals(known, net_obj):
+                return value
+        return default
+
+    def put(self, net_obj: Any, value: Any):
+        """
+        Store a value for a .NET object (the object is kept alive by the map)
+        :param net_obj: The .NET object
+        :param value: The value
+        """
+        entries = self._entries.setdefault(RuntimeHelpers.GetHashCode(net_obj), [])
+        for i, (known, _) in enumerate(entries):
+            if Object.ReferenceEquals(known, net_obj):
+                entries[i] = (net_obj, value)
+                return
+        entries.append((net_obj, value))
+        self._count += 1
+
+    def clear(self):
+        """
+        Remove all entries
+        """
+        self._entries.clear()
+        self._count = 0
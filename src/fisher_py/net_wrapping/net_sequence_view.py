@@ -0,0 +1,93 @@
+from __future__ import annotations
+from typing import Any, Callable, Generic, Iterator, List, TypeVar, Union
+from collections.abc import Sequence
+from fisher_py.utils import to_numpy_array, _net_to_numpy_types
+import numpy as np
+
+T = TypeVar('T')
+
+_REPR_ITEM_COUNT = 10
+
+
+class NetSequenceView(Generic[T], Sequence):
+    """
+    Lazy, read-only view of a .NET array or list (the storage behind WrappedNetArray and
+    WrappedNetList). Nothing is copied on construction: elements are fetched (and passed
+    through the optional converter, e.g. a wrapper factory) only when they are accessed.
+    Slicing returns another view without touching any element.
+    """
+
+    def __init__(self, net_collection: Any, converter: Callable[[Any], T]=None, indices: range=None):
+        """
+        Create view
+        :param net_collection: .NET array or list
+        :param converter: Function applied to each element when it is accessed (e.g. HeaderItem._get_wrapper_)
+        :param indices: Indices of the underlying collection covered by this view (all by default)
+        """
+        self._net_collection = net_collection
+        self._converter = converter
+        self._indices = indices
+
+    @property
+    def _range(self) -> range:
+        if self._indices is not None:
+            return self._indices
+
+        # views of the whole collection follow changes made to .NET lists
+        net_collection = self._net_collection
+        return range(net_collection.Length if hasattr(net_collection, 'Length') else net_collection.Count)
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, NetSequenceView[T]]:
+        if type(index) is slice:
+            return NetSequenceView(self._net_collection, self._converter, self._range[index])
+
+        item = self._net_collection[self._range[index]]
+        return item if self._converter is None else self._converter(item)
+
+    def __iter__(self) -> Iterator[T]:
+        items = self._net_collection if self._indices is None else (self._net_collection[i] for i in self._indices)
+        if self._converter is None:
+            return iter(items)
+        return map(self._converter, items)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str) or len(self) != len(other):
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        # only the first elements are converted, views can be large
+        items = [repr(item) for item in self[:_REPR_ITEM_COUNT]]
+        if len(self) > _REPR_ITEM_COUNT:
+            items.append('...')
+        return f'NetSequenceView([{", ".join(items)}], length={len(self)})'
+
+    def to_list(self) -> List[T]:
+        """
+        Convert all elements of the view
+        :returns: Python list of the (converted) elements
+        """
+        return list(self)
+
+    def to_numpy(self, dtype: type=None) -> np.ndarray:
+        """
+        Copy the elements of a view over numeric values (e.g. double[] or List<int>) to a
+        numpy array. The .NET data is copied as one block, not element by element.
+        :param dtype: Data type of the result (derived from the .NET element type by default)
+        :returns: numpy array of the viewed elements
+        """
+        net_array = self._net_collection
+        if not hasattr(net_array, 'Length'):
+            net_array = net_array.ToArray()
+
+        if dtype is None:
+            dtype = _net_to_numpy_types.get(net_array.GetType().GetElementType().FullName, np.float64)
+        values = to_numpy_array(net_array, dtype)
+
+        if self._indices is None:
+            return values
+        indices = self._indices
+        return values[indices.start:(indices.stop if indices.stop >= 0 else None):indices.step]
@@ -1,12 +1,18 @@
 from __future__ import annotations
 from typing import Any
 from fisher_py.exceptions import CoreException
+from fisher_py import profiling
 
 
 class NetWrapperBase(object):
 
     _wrapped_type = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if profiling.is_enabled():
+            profiling.instrument_class(cls)
+
     def __init__(self):
         self._wrapped_object = None
 
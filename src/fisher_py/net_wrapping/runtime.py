@@ -0,0 +1,74 @@
+import threading
+import os
+
+_lock = threading.Lock()
+_loaded = False
+
+
+def is_runtime_loaded() -> bool:
+    """
+    Check whether the .NET runtime and the ThermoFisher assemblies have been loaded
+    :returns: True after load_runtime has completed
+    """
+    return _loaded
+
+
+def load_runtime():
+    """
+    Load the .NET runtime, register the codecs and add references to the ThermoFisher
+    assemblies. This happens once, when the first module wrapping .NET objects is
+    imported; further calls return immediately.
+    """
+    global _loaded
+    if _loaded:
+        return
+
+    with _lock:
+        if _loaded:
+            return
+
+        import pythonnet
+
+        # Load dotnet before clr import. See https://pythonnet.github.io/pythonnet/python.html#loading-a-runtime
+        try:
+            pythonnet.load()  # Try default (i.e. 'mono' or PYTHONNET_RUNTIME)
+        except:
+            pythonnet.load('coreclr')  # Fallback on coreclr
+
+        import clr
+        from System import Environment
+
+        # codecs for implicit enum conversion
+        import Python.Runtime
+
+        Python.Runtime.PyObjectConversions.RegisterEncoder(Python.Runtime.Codecs.EnumPyIntCodec.Instance)
+        Python.Runtime.PyObjectConversions.RegisterDecoder(Python.Runtime.Codecs.EnumPyIntCodec.Instance)
+
+        # access .net standard dlls
+        dotnet_version = Environment.Version.get_Major()
+        dll_base_path = os.path.join(os.path.split(__file__)[0], '..', 'dll')
+
+        if dotnet_version >= 8:
+            dll_path = os.path.join(dll_base_path, 'net8')
+        elif dotnet_version >= 5:
+            dll_path = os.path.join(dll_base_path, 'net5')
+        else:
+            dll_path = os.path.join(dll_base_path, 'net4')
+
+        clr.AddReference('System')
+        clr.AddReference('System.Core')
+        clr.AddReference('System.Data')
+        clr.AddReference('System.Configuration')
+        clr.AddReference('System.Xml')
+        clr.AddReference('mscorlib')
+
+        clr.AddReference(os.path.join(dll_path, 'ThermoFisher.CommonCore.Data.dll'))
+        clr.AddReference(os.path.join(dll_path, 'ThermoFisher.CommonCore.RawFileReader.dll'))
+        clr.AddReference(os.path.join(dll_path, 'ThermoFisher.CommonCore.MassPrecisionEstimator.dll'))
+        clr.AddReference(os.path.join(dll_path, 'ThermoFisher.CommonCore.BackgroundSubtraction.dll'))
+        try:
+            clr.AddReference(os.path.join(dll_path, 'OpenMcdf.dll'))
+        except Exception as e:
+            pass  # avoid duplicate load
+
+        _loaded = True
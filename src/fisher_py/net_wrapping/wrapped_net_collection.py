@@ -0,0 +1,153 @@
+from __future__ import annotations
+from typing import Any, Callable, Iterable, Iterator, List, Tuple, TypeVar, Union
+from fisher_py.net_wrapping.net_sequence_view import NetSequenceView
+from fisher_py.net_wrapping.net_wrapper_base import NetWrapperBase
+import numpy as np
+import copy
+import sys
+
+T = TypeVar('T')
+
+
+class WrappedNetCollection(list):
+    """
+    Base of WrappedNetArray and WrappedNetList: a list which reads its elements from the
+    wrapped .NET collection when they are accessed instead of copying them on construction.
+    The storage of the list base class is not used, all list operations (including
+    iteration, e.g. by json.dumps) go to the .NET collection. Copies (copy, deepcopy and
+    pickle) are plain python lists of the elements.
+    """
+
+    def __init__(self, net_iterable: Any, converter: Callable[[Any], T]=None):
+        """
+        Wrap .NET collection
+        :param net_iterable: .NET array or list
+        :param converter: Function applied to each element when it is read (e.g. HeaderItem._get_wrapper_)
+        """
+        super().__init__()
+        self._net_collection = net_iterable
+        self._view = NetSequenceView(net_iterable, converter)
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._view)
+
+    def __reversed__(self) -> Iterator[T]:
+        return reversed(self._view)
+
+    def __contains__(self, value: Any) -> bool:
+        return value in self._view
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        if type(index) is slice:
+            # only the elements covered by the slice are read
+            return self._view[index].to_list()
+        return self._view[index]
+
+    def __setitem__(self, index: int, value: T):
+        if type(index) is slice:
+            raise TypeError('Slice assignment is not supported by wrapped .NET collections.')
+        self._net_collection[self._position_(index)] = self._to_net_(value)
+
+    def __eq__(self, other: Any) -> bool:
+        return self.to_list() == list(other) if isinstance(other, list) else NotImplemented
+
+    def __ne__(self, other: Any) -> bool:
+        return self.to_list() != list(other) if isinstance(other, list) else NotImplemented
+
+    def __lt__(self, other: Any) -> bool:
+        return self.to_list() < list(other) if isinstance(other, list) else NotImplemented
+
+    def __le__(self, other: Any) -> bool:
+        return self.to_list() <= list(other) if isinstance(other, list) else NotImplemented
+
+    def __gt__(self, other: Any) -> bool:
+        return self.to_list() > list(other) if isinstance(other, list) else NotImplemented
+
+    def __ge__(self, other: Any) -> bool:
+        return self.to_list() >= list(other) if isinstance(other, list) else NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, other: Iterable[T]) -> List[T]:
+        return self.to_list() + list(other)
+
+    def __radd__(self, other: Iterable[T]) -> List[T]:
+        return list(other) + self.to_list()
+
+    def __mul__(self, count: int) -> List[T]:
+        return self.to_list() * count
+
+    __rmul__ = __mul__
+
+    def __iadd__(self, other: Iterable[T]) -> WrappedNetCollection:
+        self.extend(other)
+        return self
+
+    def __imul__(self, count: int) -> WrappedNetCollection:
+        values = self.to_list()
+        if count <= 0:
+            self.clear()
+        for _ in range(count - 1):
+            self.extend(values)
+        return self
+
+    def __repr__(self) -> str:
+        return repr(self.to_list())
+
+    def __copy__(self) -> List[T]:
+        return self.to_list()
+
+    def __deepcopy__(self, memo: dict) -> List[T]:
+        return copy.deepcopy(self.to_list(), memo)
+
+    def __reduce_ex__(self, protocol: int) -> Tuple[type, Tuple[List[T]]]:
+        # the default reduction of list subclasses extends the .NET collection while iterating it
+        return list, (self.to_list(),)
+
+    def count(self, value: T) -> int:
+        return self.to_list().count(value)
+
+    def index(self, value: T, start: int=0, stop: int=sys.maxsize) -> int:
+        return self.to_list().index(value, start, stop)
+
+    def copy(self) -> List[T]:
+        return self.to_list()
+
+    def sort(self, key: Callable[[T], Any]=None, reverse: bool=False):
+        self._replace_values_(sorted(self, key=key, reverse=reverse))
+
+    def reverse(self):
+        self._replace_values_(self.to_list()[::-1])
+
+    def to_list(self) -> List[T]:
+        """
+        Read all elements of the collection
+        :returns: Python list of the elements
+        """
+        return self._view.to_list()
+
+    def to_numpy(self, dtype: type=None) -> np.ndarray:
+        """
+        Copy the values of a numeric collection (e.g. double[]) as one block to a numpy array
+        :param dtype: Data type of the result (derived from the .NET element type by default)
+        """
+        return self._view.to_numpy(dtype)
+
+    def _position_(self, index: int) -> int:
+        # python index (possibly negative) to position in the .NET collection
+        try:
+            return range(len(self))[index]
+        except IndexError:
+            raise IndexError(f'{type(self).__name__} index out of range')
+
+    def _replace_values_(self, values: List[T]):
+        for i, value in enumerate(values):
+            self._net_collection[i] = self._to_net_(value)
+
+    @staticmethod
+    def _to_net_(value: Any) -> Any:
+        # elements which were converted to wrappers are stored as the wrapped .NET objects
+        return value._get_wrapped_object_() if isinstance(value, NetWrapperBase) else value
@@ -1,50 +1,42 @@
-from typing import TypeVar, Generic, Union
-import clr
-
-clr.AddReference('System')
-import System
-import System.Collections.Generic as generic
+from typing import TypeVar, Generic, Iterable, Union
+from fisher_py.net_wrapping.wrapped_net_collection import WrappedNetCollection
 
 T = TypeVar('T')
 
-class WrappedNetList(Generic[T], list):
+class WrappedNetList(Generic[T], WrappedNetCollection):
 
-    def __getitem__(self, index: Union[int, slice]) -> T:
+    def __delitem__(self, index: Union[int, slice]):
         if type(index) is slice:
-            start, step, stop = index.start, index.step, index.stop
-            if step is None:
-                step = 1
-            start, step, stop = map(self.__ensure_positive_index__, [start, step, stop])
-            sublist = []
-            for i in range(start, stop, step):
-                sublist.append(self.__wrapped_iterable[i])            
-            return sublist
-        index = self.__ensure_positive_index__(index)
-        return self.__wrapped_iterable[index]
-    
-    def __setitem__(self, index: int, value: T):
-        index = self.__ensure_positive_index__(index)
-        super().__setitem__(index, value)
-        self.__wrapped_iterable[index] = value
-
-    def append(self, obj):
-        super().append(obj)
-        self.__wrapped_iterable.Add(obj)
-    
-    def insert(self, index, obj):
-        index = self.__ensure_positive_index__(index)
-        super().insert(index, obj)
-        self.__wrapped_iterable.Insert(index, obj)
-    
-    def remove(self, value):
-        super().remove(value)
-        self.__wrapped_iterable.Remove(value)
-
-    def __init__(self, net_iterable):
-        super().__init__([i for i in net_iterable])
-        self.__wrapped_iterable = net_iterable
-    
-    def __ensure_positive_index__(self, index: int) -> int:
-        if index < 0:
-            index = len(self.__wrapped_iterable) + index
-        return index
+            # remove from the back, so that the remaining positions stay valid
+            for position in sorted(range(len(self))[index], reverse=True):
+                self._net_collection.RemoveAt(position)
+        else:
+            self._net_collection.RemoveAt(self._position_(index))
+
+    def append(self, obj: T):
+        self._net_collection.Add(self._to_net_(obj))
+
+    def extend(self, values: Iterable[T]):
+        for value in list(values):
+            self._net_collection.Add(self._to_net_(value))
+
+    def insert(self, index: int, obj: T):
+        # positions out of range are clamped like for python lists
+        length = len(self)
+        index = max(0, length + index) if index < 0 else min(index, length)
+        self._net_collection.Insert(index, self._to_net_(obj))
+
+    def remove(self, value: T):
+        if not self._net_collection.Remove(self._to_net_(value)):
+            raise ValueError(f'{value!r} is not in list')
+
+    def pop(self, index: int=-1) -> T:
+        if len(self) == 0:
+            raise IndexError('pop from empty list')
+        position = self._position_(index)
+        value = self[position]
+        self._net_collection.RemoveAt(position)
+        return value
+
+    def clear(self):
+        self._net_collection.Clear()
@@ -0,0 +1,230 @@
+"""
+Opt-in instrumentation of the .NET interop layer. While profiling is enabled, every public
+method and property of the classes wrapping .NET objects (subclasses of NetWrapperBase) is
+timed, and calls and a latency histogram are recorded per member, e.g.
+'CentroidStream.masses' or 'RawFileAccess.get_scan_event_for_scan_number'. Times are
+inclusive: a member calling other wrapped members also counts their time.
+
+Profiling is enabled by setting the environment variable FISHER_PY_PROFILE=1, by calling
+enable() or within the profile() context manager:
+
+    from fisher_py import profiling
+
+    with profiling.profile():
+        raw_file.get_averaged_ms2_scans(1, 100, 325.0)
+    print(profiling.report())
+
+When profiling is disabled the original members are restored, so there is no overhead.
+"""
+
+from __future__ import annotations
+from typing import Callable, Dict, Iterator, List, Tuple
+from contextlib import contextmanager
+import functools
+import threading
+import math
+import time
+import sys
+import os
+
+# upper bounds of the histogram buckets in microseconds (powers of two), the last bucket is open
+HISTOGRAM_BOUNDS_US = tuple(2 ** i for i in range(24))
+
+_lock = threading.RLock()
+_enabled = False
+_stats: Dict[str, CallStats] = dict()
+_originals: Dict[Tuple[type, str], object] = dict()
+
+
+class CallStats(object):
+    """
+    Calls and latencies recorded for one wrapped member
+    """
+
+    __slots__ = ('name', 'calls', 'total', 'max', 'histogram')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_US) + 1)
+
+    @property
+    def mean(self) -> float:
+        """
+        Mean latency in seconds
+        """
+        return self.total / self.calls if self.calls > 0 else 0.0
+
+    def add(self, duration: float):
+        """
+        Record a call
+        :param duration: Latency of the call in seconds
+        """
+        us = duration * 1e6
+        bucket = min(max(0, math.ceil(math.log2(us))) if us > 1 else 0, len(HISTOGRAM_BOUNDS_US))
+        self.calls += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.histogram[bucket] += 1
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a latency percentile from the histogram (upper bound of the bucket)
+        :param q: Percentile between 0 and 100
+        :returns: Latency in seconds
+        """
+        rank = self.calls * q / 100
+        count = 0
+        for bound, bucket_count in zip(HISTOGRAM_BOUNDS_US, self.histogram):
+            count += bucket_count
+            if count >= rank and count > 0:
+                return min(bound * 1e-6, self.max)
+        return self.max
+
+
+def is_enabled() -> bool:
+    """
+    Check whether the interop layer is being profiled
+    :returns: True if profiling is enabled
+    """
+    return _enabled
+
+
+def enable():
+    """
+    Start profiling all (currently loaded and later imported) .NET wrapper classes
+    """
+    global _enabled
+    with _lock:
+        if _enabled:
+            return
+        _enabled = True
+
+        # classes imported later are instrumented by NetWrapperBase.__init_subclass__
+        base_class = getattr(sys.modules.get('fisher_py.net_wrapping.net_wrapper_base'), 'NetWrapperBase', None)
+        if base_class is not None:
+            for cls in _get_subclasses_(base_class):
+                instrument_class(cls)
+
+
+def disable():
+    """
+    Stop profiling and restore the original members (recorded statistics are kept)
+    """
+    global _enabled
+    with _lock:
+        _enabled = False
+        for (cls, name), member in _originals.items():
+            setattr(cls, name, member)
+        _originals.clear()
+
+
+def reset():
+    """
+    Discard all recorded statistics
+    """
+    with _lock:
+        _stats.clear()
+
+
+@contextmanager
+def profile(reset_stats: bool=True) -> Iterator[Dict[str, CallStats]]:
+    """
+    Profile the interop layer within a with block
+    :param reset_stats: If true, statistics of earlier runs are discarded first
+    :returns: The statistics (filled while the block runs)
+    """
+    if reset_stats:
+        reset()
+    was_enabled = is_enabled()
+    enable()
+    try:
+        yield _stats
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def get_stats() -> Dict[str, CallStats]:
+    """
+    Gets the recorded statistics
+    :returns: Dictionary mapping the member names to their statistics
+    """
+    with _lock:
+        return dict(_stats)
+
+
+def report(sort_by: str='total', limit: int=None) -> str:
+    """
+    Summarise the recorded statistics as a table
+    :param sort_by: Column to sort by (descending): 'total', 'calls', 'mean' or 'max'
+    :param limit: Maximum number of rows (all by default)
+    :returns: The table
+    """
+    assert sort_by in ('total', 'calls', 'mean', 'max')
+    stats = sorted(get_stats().values(), key=lambda s: getattr(s, sort_by), reverse=True)
+    if limit is not None:
+        stats = stats[:limit]
+
+    width = max([len(s.name) for s in stats] + [len('member')])
+    lines = [f'{"member":<{width}} {"calls":>9} {"total ms":>10} {"mean us":>10} {"p50 us":>9} {"p95 us":>9} {"max us":>10}']
+    for s in stats:
+        lines.append(f'{s.name:<{width}} {s.calls:>9} {s.total * 1e3:>10.2f} {s.mean * 1e6:>10.1f} {s.percentile(50) * 1e6:>9.1f} {s.percentile(95) * 1e6:>9.1f} {s.max * 1e6:>10.1f}')
+    return '\n'.join(lines)
+
+
+def instrument_class(cls: type):
+    """
+    Time the public methods and properties defined by a class (members inherited from
+    base classes are instrumented with their defining class)
+    :param cls: The class
+    """
+    with _lock:
+        for name, member in list(vars(cls).items()):
+            if name.startswith('_') or (cls, name) in _originals:
+                continue
+
+            qualified_name = f'{cls.__name__}.{name}'
+            if isinstance(member, property):
+                instrumented = property(
+                    _timed_(member.fget, qualified_name) if member.fget is not None else None,
+                    _timed_(member.fset, qualified_name) if member.fset is not None else None,
+                    member.fdel,
+                    member.__doc__)
+            elif callable(member) and not isinstance(member, type):
+                instrumented = _timed_(member, qualified_name)
+            else:
+                continue  # constants, nested classes, static and class methods
+
+            _originals[(cls, name)] = member
+            setattr(cls, name, instrumented)
+
+
+def _get_subclasses_(cls: type) -> List[type]:
+    subclasses = list()
+    for subclass in cls.__subclasses__():
+        subclasses.append(subclass)
+        subclasses.extend(_get_subclasses_(subclass))
+    return subclasses
+
+
+def _timed_(fn: Callable, name: str) -> Callable:
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            with _lock:
+                stats = _stats.get(name)
+                if stats is None:
+                    stats = _stats[name] = CallStats(name)
+                stats.add(duration)
+    return timed
+
+
+if os.environ.get('FISHER_PY_PROFILE', '').lower() in ('1', 'true', 'yes', 'on'):
+    enable()
@@ -1,12 +1,91 @@
-from typing import Tuple, List
-from fisher_py.raw_file_reader import RawFileReaderAdapter
-from fisher_py.data.filter_enums import MsOrderType, MassAnalyzerType
-from fisher_py.data.business import TraceType, ChromatogramTraceSettings, Range, MassOptions
+from typing import Tuple, List, Callable, Iterator, TypeVar, Union
+from fisher_py.raw_file_reader import RawFileReaderAdapter, RawFileAccess, parallel_map, parallel_scans
+from fisher_py.data.filter_enums import MassAnalyzerType
+from fisher_py.data.business import TraceType, ChromatogramTraceSettings, Range, MassOptions, Scan
 from fisher_py.data import ToleranceUnits, FtAverageOptions, Device
+from fisher_py import scan_index_cache
+from fisher_py.lru_cache import LruCache
+from fisher_py.xic_index import XicIndex
+from fisher_py.scan_index import SCAN_INDEX_DTYPE, ScanIndexReader, get_ms_order_of_filter
 import numpy as np
+import os
+import sys
 
+T = TypeVar('T')
 
-class RawFile(object):
+DEFAULT_SPECTRUM_CACHE_SIZE = 64 * 1024**2
+DEFAULT_EVENT_STRING_CACHE_SIZE = 4 * 1024**2
+
+
+class AveragingWindow(object):
+    """
+    Group of MS2 scans for averaging, given by a retention time window and precursor mass
+    (see RawFile.get_averaged_scan_groups)
+    """
+
+    __slots__ = ('rt_from', 'rt_to', 'precursor_mass')
+
+    def __init__(self, rt_from: float, rt_to: float, precursor_mass: float):
+        """
+        Create window
+        :param rt_from: Retention time start in minutes
+        :param rt_to: Retention time end in minutes
+        :param precursor_mass: Precursor mass for filtering
+        """
+        self.rt_from = rt_from
+        self.rt_to = rt_to
+        self.precursor_mass = precursor_mass
+
+    def __repr__(self) -> str:
+        return f'AveragingWindow({self.rt_from}, {self.rt_to}, {self.precursor_mass})'
+
+
+def _averaged_scan_to_numpy_(averaged_scan: Scan) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if averaged_scan is None:
+        return np.empty(0), np.empty(0), np.empty(0)
+
+    masses = averaged_scan.preferred_masses_as_numpy()
+    intensities = averaged_scan.preferred_intensities_as_numpy()
+    charges = averaged_scan.centroid_scan.charges_as_numpy() if averaged_scan.has_centroid_stream else np.zeros(masses.shape)
+    return masses, intensities, charges
+
+
+def _read_spectrum_(access: RawFileAccess, scan_number: int, prefer_centroids: bool=True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # peaks of a scan as returned by RawFile (shared by RawFile and AsyncRawFile), the centroid
+    # stream for FTMS scans and the segmented scan data (without charges) otherwise
+    mass_analyzer = access.get_scan_event_for_scan_number(scan_number).mass_analyzer
+
+    if prefer_centroids and mass_analyzer == MassAnalyzerType.MassAnalyzerFTMS:
+        spectrum = access.get_centroid_stream(scan_number, False)
+        positions = spectrum.masses_as_numpy()
+        intensities = spectrum.intensities_as_numpy()
+        charges = spectrum.charges_as_numpy()
+    else:
+        stats = access.get_scan_stats_for_scan_number(scan_number)
+        spectrum = access.get_segmented_scan_from_scan_number(scan_number, stats)
+        positions = spectrum.positions_as_numpy()
+        intensities = spectrum.intensities_as_numpy()
+        charges = np.zeros(positions.shape)
+    return positions, intensities, charges
+
+
+def _create_trace_settings_(trace_type: TraceType, ms_filter: str, mz: float=None) -> ChromatogramTraceSettings:
+    trace_settings = ChromatogramTraceSettings(trace_type)
+    trace_settings.filter = ms_filter
+    if trace_type == TraceType.MassRange:
+        trace_settings.mass_ranges = [Range(float(mz), float(mz))]
+    return trace_settings
+
+
+def _read_chromatogram_(access: RawFileAccess, mz: float, tolerance: float, trace_type: TraceType, tolerance_units: ToleranceUnits, ms_filter: str) -> Tuple[np.ndarray, np.ndarray]:
+    # single trace chromatogram by the raw file reader (shared by RawFile and AsyncRawFile)
+    trace_settings = _create_trace_settings_(trace_type, ms_filter, mz)
+    tolerance_arg = MassOptions(tolerance, tolerance_units) if trace_type == TraceType.MassRange else None
+    chromatogram_raw = access.get_chromatogram_data([trace_settings], -1, -1, tolerance_arg)
+    return chromatogram_raw.positions_as_numpy(0), chromatogram_raw.intensities_as_numpy(0)
+
+
+class RawFile(ScanIndexReader):
     """
     Allows to access *.RAW files used by ThermoFisher to store MS measurements.
     NOTE: This class only provides limited access to all the functionalities and can serve as 
@@ -49,111 +128,89 @@ class RawFile(object):
         return self._raw_file_access.run_header.end_time
 
     @property
-    def ms2_filter_masses(self) -> np.ndarray:
+    def spectrum_cache(self) -> LruCache:
+        """
+        Cache of recently read spectra (see LruCache for hit/miss statistics)
+        """
+        return self._spectrum_cache
+
+    @property
+    def event_string_cache(self) -> LruCache:
         """
-        Available masses for MS2 filtering (precursor masses)
+        Cache of recently read scan event descriptions (see LruCache for hit/miss statistics)
         """
-        return self._ms2_filter_unique_filter_masses
+        return self._result_string_cache
 
-    def __init__(self, path: str):
+    def __init__(self, path: str, use_index_cache: bool=False, index_cache_dir: str=None, spectrum_cache_size: int=DEFAULT_SPECTRUM_CACHE_SIZE,
+                 event_string_cache_size: int=DEFAULT_EVENT_STRING_CACHE_SIZE):
+        """
+        Opens a raw file
+        :param path: Path to the raw file
+        :param use_index_cache: If true, the scan index is stored in a sidecar file (e.g. my_file.raw.fpyidx)
+            and reused when the same, unchanged file is opened again
+        :param index_cache_dir: Optional central directory for the sidecar files (implies use_index_cache)
+        :param spectrum_cache_size: Byte budget of the cache for spectra read by scan number (0 disables the cache)
+        :param event_string_cache_size: Byte budget of the cache for scan event descriptions (0 disables the cache)
+        """
         self._path = path
         self._raw_file_access = RawFileReaderAdapter.file_factory(path)
         self._raw_file_access.select_instrument(Device.MS, 1)
+        self._spectrum_cache = LruCache(spectrum_cache_size, lambda spectrum: sum(a.nbytes for a in spectrum))
+        self._result_string_cache = LruCache(event_string_cache_size, sys.getsizeof)
+        self._xic_indices = dict()
 
-        # fetch retention times and scan numbers
-        scan_numbers, rt = self._get_scan_numbers_and_retention_times_()
-        self._scan_numbers = scan_numbers
-        self._retention_times = rt
-        self._spectrum_cache = dict()
-        self._result_string_cache = dict()
-
-        # fetch retention times and scan numbers for MS1 only
-        scan_numbers, rt = self._get_ms_scan_numbers_and_retention_times_(MsOrderType.Ms)
-        self._ms1_scan_numbers = scan_numbers
-        self._ms1_retention_times = rt
-
-        # fetch retention times and scan numbers for MS2 only
-        scan_numbers, rt = self._get_ms_scan_numbers_and_retention_times_(MsOrderType.Ms2)
-        self._ms2_scan_numbers = scan_numbers
-        self._ms2_retention_times = rt
-
-        # fetch filters for MS2
-        scan_numbers, filter_masses = self._get_ms2_scan_numbers_and_masses_()
-        self._ms2_filter_scan_numbers = scan_numbers
-        self._ms2_filter_masses = filter_masses
-        self._ms2_filter_unique_filter_masses = np.array(sorted(list(set(self._ms2_filter_masses))))
-
-    def _get_scan_numbers_and_retention_times_(self) -> Tuple[List[int], List[float]]:
-        first_scan = self.first_scan
-        scan_numbers = list()
-        retention_times = list()
-
-        for i in range(self.number_of_scans):
-            scan_number = i + first_scan
-            rt = self._raw_file_access.retention_time_from_scan_number(scan_number)
-            scan_numbers.append(scan_number)
-            retention_times.append(rt)
-
-        return np.array(scan_numbers), np.array(retention_times)
-
-    def _get_ms2_scan_numbers_and_masses_(self) -> Tuple[List[float], List[float]]:
-        first_scan = self.first_scan
-        scan_numbers = list()
-        filter_mass_values = list()
-        scan_events = self._raw_file_access.get_scan_events(self.first_scan, self.last_scan)
-
-        for i, scan_event in enumerate(scan_events):
-            if scan_event.ms_order != MsOrderType.Ms2:
-                continue
-            scan_number = i + first_scan
-            precursor_mass = self._get_scan_filter_precursor_mass_(scan_number)
-            if precursor_mass is None:
-                continue
-
-            scan_numbers.append(scan_number)
-            filter_mass_values.append(precursor_mass)
-
-        return np.array(scan_numbers), np.array(filter_mass_values)
-
-
-    def _get_ms_scan_numbers_and_retention_times_(self, ms_order: MsOrderType) -> Tuple[List[int], List[float]]:
-        first_scan = self.first_scan
-        scan_numbers = list()
-        retention_times = list()
-        scan_events = self._raw_file_access.get_scan_events(self.first_scan, self.last_scan)
-        
-        for i, scan_event in enumerate(scan_events):
-            if scan_event.ms_order != ms_order:
-                continue
-            scan_number = i + first_scan
-            scan_numbers.append(scan_number)
-            retention_times.append(self._raw_file_access.retention_time_from_scan_number(scan_number))
-
-        return np.array(scan_numbers), np.array(retention_times)
-
-    def _get_scan_filter_precursor_mass_(self, scan_number: int) -> float:
-        scan_event = self._raw_file_access.get_scan_event_for_scan_number(scan_number)
-        if scan_event.ms_order != MsOrderType.Ms2:
-            return None
-        return scan_event.get_reaction(0).precursor_mass
+        # fetch scan numbers, retention times and event information of all scans in one pass (or from the cache)
+        if use_index_cache or index_cache_dir is not None:
+            scan_index = self._load_or_build_scan_index_(index_cache_dir)
+        else:
+            scan_index = self._build_scan_index_()
+        self._set_scan_index_(scan_index)
+
+    def _get_cache_key_(self) -> dict:
+        file_header = self._raw_file_access.file_header
+        revision, modified = None, None
+        if file_header is not None:
+            revision = file_header.revision
+            modified = f'{file_header.modified_date.isoformat()}|{file_header.number_of_times_modified}'
+        return scan_index_cache.get_cache_key(self._path, revision, modified)
+
+    def _load_or_build_scan_index_(self, index_cache_dir: str) -> np.ndarray:
+        sidecar_path = scan_index_cache.get_sidecar_path(self._path, index_cache_dir)
+        key = self._get_cache_key_()
+        scan_index = scan_index_cache.load_scan_index(sidecar_path, key, SCAN_INDEX_DTYPE)
+
+        if scan_index is None:
+            scan_index = self._build_scan_index_()
+            scan_index_cache.save_scan_index(sidecar_path, key, scan_index)
+        return scan_index
+
+    def _build_scan_index_(self) -> np.ndarray:
+        first_scan, last_scan = self.first_scan, self.last_scan
+        event_table = self._raw_file_access.get_scan_event_table(first_scan, last_scan)
+        scan_index = np.zeros(len(event_table), dtype=SCAN_INDEX_DTYPE)
+
+        # event fields are read once per distinct event and spread to the scans by event id
+        # (precursor fields are the ones of the last reaction, see ScanEventTable)
+        scan_index['scan_number'] = event_table.scan_numbers
+        scan_index['ms_order'] = event_table.ms_orders
+        scan_index['mass_analyzer'] = event_table.mass_analyzers
+        scan_index['polarity'] = event_table.polarities
+        scan_index['precursor_mz'] = event_table.precursor_masses
+        scan_index['isolation_width'] = event_table.isolation_widths
+        scan_index['activation'] = event_table.activation_types
+
+        scan_stats = [self._raw_file_access.get_scan_stats_for_scan_number(n) for n in range(first_scan, last_scan + 1)]
+        scan_index['retention_time'] = [stats.start_time for stats in scan_stats]
+        scan_index['tic'] = [stats.tic for stats in scan_stats]
+        scan_index['base_peak_mass'] = [stats.base_peak_mass for stats in scan_stats]
+        scan_index['base_peak_intensity'] = [stats.base_peak_intensity for stats in scan_stats]
+
+        return scan_index
 
     def _get_scan_(self, scan_number: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-        mass_analyzer = self._raw_file_access.get_scan_event_for_scan_number(scan_number).mass_analyzer
+        return _read_spectrum_(self._raw_file_access, scan_number)
 
-        if mass_analyzer == MassAnalyzerType.MassAnalyzerFTMS:
-            spectrum = self._raw_file_access.get_centroid_stream(scan_number, False)
-            positions = np.array(spectrum.masses)
-            intensities = np.array(spectrum.intensities)
-            charges = np.array(spectrum.charges)
-        else:
-            stats = self._raw_file_access.get_scan_stats_for_scan_number(scan_number)
-            spectrum = self._raw_file_access.get_segmented_scan_from_scan_number(scan_number, stats)
-            positions = np.array(spectrum.positions)
-            intensities = np.array(spectrum.intensities)
-            charges = np.zeros(positions.shape)
-        return positions, intensities, charges
-
-    def get_chromatogram(self, mz: float, tolerance: float, trace_type: TraceType=TraceType.MassRange, tolerance_units: ToleranceUnits=ToleranceUnits.ppm, ms_filter: str='ms') -> Tuple[np.ndarray, np.ndarray]:
+    def get_chromatogram(self, mz: float, tolerance: float, trace_type: TraceType=TraceType.MassRange, tolerance_units: ToleranceUnits=ToleranceUnits.ppm, ms_filter: str='ms', engine: str='net') -> Tuple[np.ndarray, np.ndarray]:
         """
         Gets chromatogram
         :param mz: Mass/Charge value for mass range chromatogram
@@ -161,70 +218,88 @@ class RawFile(object):
         :param tolerance_units: Units of the mass tolerance (ppm by default)
         :param ms_filter: Type of MS data (ms or ms2)
         :param trace_type: Type of chromatogram (BasePeek, TIC (total ion current), MassRange (XIC))
+        :param engine: 'net' to let the raw file reader create the chromatogram or 'index' to extract mass range
+            chromatograms from the XIC index of the MS order (see get_xic_index)
 
         :return: array containing retention times and array containing intensity values
         """
+        if engine == 'index':
+            if trace_type != TraceType.MassRange:
+                raise ValueError('The index engine only supports mass range chromatograms.')
+            retention_times, intensities = self.get_xic_index(ms_filter).extract([mz], tolerance, tolerance_units)
+            return retention_times, intensities[0]
+        elif engine != 'net':
+            raise ValueError(f'Unknown chromatogram engine "{engine}".')
 
-        trace_settings = ChromatogramTraceSettings(trace_type)
-        trace_settings.filter = ms_filter
-        tolerance_arg = None
-
-        if trace_type == TraceType.MassRange:
-            trace_settings.mass_ranges = [Range(mz, mz)]
-            tolerance_arg = MassOptions(tolerance, tolerance_units)
-
-        chromatogram_raw = self._raw_file_access.get_chromatogram_data([trace_settings], -1, -1, tolerance_arg)
-        return np.array(chromatogram_raw.positions_array[0]), np.array(chromatogram_raw.intensities_array[0])
-
-    def get_tic_ms2(self, precursor_mz: float, tolerance: float=10e-3) -> Tuple[np.ndarray, np.ndarray]:
-        """
-        Get total ion current in MS2 for a given precursor mass.
-        NOTE: This method does not yet support all mass tolerance units
-        :param precursor_mz: Precursor mass
-        :param tolerance: Mass tolerance (in ppm)
-        :returns: Tuple of (retention_times, total_ion_current_intensities)
-        """
-        tic_rt, tic_intensities = list(), list()
-        for n in range(self.first_scan, self.last_scan+1):
-            scan_event = self._raw_file_access.get_scan_event_for_scan_number(n)
-            precursor_mass = self._get_scan_filter_precursor_mass_(n)
-
-            # skip scan if not MS2 or the precursor mass does not match the filter criteria
-            if scan_event.ms_order != MsOrderType.Ms2 or precursor_mass is None or abs(precursor_mass - precursor_mz) > tolerance:
-                continue
-
-            _, y, _ = self._get_scan_(n)
-            tic_rt.append(self._raw_file_access.retention_time_from_scan_number(n))
-            tic_intensities.append(np.sum(y))
-
-        return np.array(tic_rt), np.array(tic_intensities)
-
-    def get_scan_ms1(self, rt: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
-        """
-        Gets MS1 (MS) spectrum for a given retention time value in minutes
-        :param rt: retention time value in minutes
-
-        :returns: Three arrays containing Mass/Charge values, intensity values and charge values as well as the actual retention time
-        """
-        scan_number, found_rt = self.get_ms1_scan_number_from_retention_time(rt)
-        rts, intensities, charges, _ = self.get_scan_from_scan_number(scan_number)
-        return rts, intensities, charges, found_rt
-
-    def get_scan_ms2(self, rt: float, precursor_mz: float=None) -> Tuple[np.ndarray, np.ndarray, float]:
-        """
-        Gets MS2 spectrum for a given retention time value in minutes
-        :param rt: retention time value in minutes
-        :param recursor_mz: Optional precursor mass value to filter spectra
+        return _read_chromatogram_(self._raw_file_access, mz, tolerance, trace_type, tolerance_units, ms_filter)
 
-        :returns: Three arrays containing Mass/Charge values, intensity values and charge values as well as the actual retention time
+    def get_chromatograms(self, mzs: List[float], tolerance: float, tolerance_units: ToleranceUnits=ToleranceUnits.ppm, ms_filter: str='ms', chunk_size: int=1000, engine: str='net') -> Tuple[np.ndarray, np.ndarray]:
         """
-        scan_number, found_rt = self.get_ms2_scan_number_from_retention_time(rt, precursor_mz)
-        rts, intensities, charges, _ = self.get_scan_from_scan_number(scan_number)
-        return rts, intensities, charges, found_rt
-
-    def get_scan(self, rt: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, str]:
-        return self.get_scan_from_scan_number(self.get_scan_number_from_retention_time(rt))
-
+        Gets the mass range chromatograms (XICs) of many targets. The targets are extracted in
+        chunks, each chunk with a single pass over the raw file (instead of one pass per target
+        as with get_chromatogram).
+        :param mzs: Mass/Charge values of the targets
+        :param tolerance: Tolerance of the mass ranges
+        :param tolerance_units: Units of the mass tolerance (ppm by default)
+        :param ms_filter: Type of MS data (ms or ms2)
+        :param chunk_size: Number of targets extracted per pass
+        :param engine: 'net' to let the raw file reader create the chromatograms or 'index' to extract them
+            from the XIC index of the MS order (see get_xic_index)
+
+        :return: array containing the retention times shared by all chromatograms and matrix of shape (len(mzs), len(retention_times)) containing the intensity values
+        """
+        if engine == 'index':
+            return self.get_xic_index(ms_filter).extract(mzs, tolerance, tolerance_units)
+        elif engine != 'net':
+            raise ValueError(f'Unknown chromatogram engine "{engine}".')
+
+        assert chunk_size > 0
+        mzs = np.asarray(mzs, dtype=np.float64)
+        mass_options = MassOptions(tolerance, tolerance_units)
+        retention_times, intensities = np.empty(0), np.empty((len(mzs), 0))
+
+        for start in range(0, len(mzs), chunk_size):
+            trace_settings = [_create_trace_settings_(TraceType.MassRange, ms_filter, mz) for mz in mzs[start:start + chunk_size]]
+
+            chromatogram_raw = self._raw_file_access.get_chromatogram_data(trace_settings, -1, -1, mass_options)
+            if start == 0:
+                # all traces share the filter, so they cover the same scans
+                retention_times = chromatogram_raw.positions_as_numpy(0)
+                intensities = np.empty((len(mzs), len(retention_times)), dtype=np.float64)
+
+            for i in range(len(trace_settings)):
+                intensities[start + i] = chromatogram_raw.intensities_as_numpy(i)
+
+        return retention_times, intensities
+
+    def get_xic_index(self, ms_filter: str='ms', path: str=None) -> XicIndex:
+        """
+        Gets the XIC index over the centroids of all scans of an MS order. The index is built on
+        first use and kept in memory. Its chromatograms match the ones of the raw file reader
+        (see XicIndex for the tolerance at range boundaries), but the filter only selects the MS order.
+        :param ms_filter: MS order of the scans as filter (ms, ms2, ..., ms10)
+        :param path: Optional directory in which the index is stored. If it already contains an index
+            built from this (unchanged) raw file for the same MS order, that index is memory-mapped
+            instead of reading the raw file. Otherwise the index is built and stored there.
+        :returns: The index
+        """
+        ms_order = get_ms_order_of_filter(ms_filter)
+
+        xic_index = self._xic_indices.get(ms_order)
+        if xic_index is None:
+            key = None
+            if path is not None:
+                key = dict(self._get_cache_key_(), ms_order=ms_order.value)
+                if os.path.isdir(path):
+                    xic_index = XicIndex.load(path, key=key)
+
+            if xic_index is None:
+                scan_numbers = self._scan_numbers[self._scan_index['ms_order'] == ms_order.value]
+                xic_index = XicIndex.build(self._raw_file_access, scan_numbers)
+                if path is not None:
+                    xic_index.save(path, key)
+            self._xic_indices[ms_order] = xic_index
+        return xic_index
 
     def get_average_ms2_scans_by_rt(self, rt_from: float, rt_to: float, precursor_mass: float, tolerance: float=10, tolerance_units: ToleranceUnits=ToleranceUnits.ppm) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
@@ -251,118 +326,102 @@ class RawFile(object):
         :returns: Three arrays containing mass/charge, intensities and charges
         """
         
-        rounded_precursor = round(precursor_mass, 4)
-        template_string = self._raw_file_access.get_scan_event_string_for_scan_number(start_scan)
-        filter_string = f'FTMS + p ESI d Full ms2 {rounded_precursor}@{template_string.split("@")[1]}'
+        filter_string = self._get_ms2_average_filter_(start_scan, precursor_mass)
         mass_options = MassOptions(tolerance, tolerance_units, 4)
         average_options = FtAverageOptions()
 
         averaged_scans = self._raw_file_access.average_scans_in_scan_range(start_scan, end_scan, filter_string, mass_options, average_options)
-        masses = np.array(averaged_scans.preferred_masses)
-        intensities = np.array(averaged_scans.preferred_intensities)
-        charges = averaged_scans.centroid_scan.charges if averaged_scans.has_centroid_stream else np.zeros(masses.shape)
+        return _averaged_scan_to_numpy_(averaged_scans)
 
-        return masses, intensities, charges
+    def get_averaged_scan_groups(self, groups: List[Union[List[int], AveragingWindow]], tolerance: float=10, tolerance_units: ToleranceUnits=ToleranceUnits.ppm, workers: int=None, merge_in_parallel: bool=False, merge_task_batching: int=None) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Averages many groups of scans concurrently, each worker thread reading from its own accessor.
+        A group is either a list of scan numbers (averaged as with RawFileAccess.average_scans) or an
+        AveragingWindow (averaged as with get_average_ms2_scans_by_rt).
+        :param groups: Groups of scans to average
+        :param tolerance: Mass tolerance for binning
+        :param tolerance_units: Mass tolerance units
+        :param workers: Number of worker threads (defaults to the number of CPUs)
+        :param merge_in_parallel: If true, each average may additionally use parallel code for merging
+            scans (FtAverageOptions.merge_in_parallel). Usually not needed as the groups are already
+            processed in parallel.
+        :param merge_task_batching: Minimum number of re-sample tasks per thread when merge_in_parallel is
+            set (FtAverageOptions.merge_task_batching, default from the raw file reader if not given)
+        :returns: List with three arrays containing mass/charge, intensities and charges for each group
+        """
+        mass_options = MassOptions(tolerance, tolerance_units, 4)
+        average_options = FtAverageOptions()
+        average_options.merge_in_parallel = merge_in_parallel
+        if merge_task_batching is not None:
+            average_options.merge_task_batching = merge_task_batching
+
+        # windows are resolved up front, as the scan index and event cache belong to this thread
+        tasks = list()
+        for group in groups:
+            if isinstance(group, AveragingWindow):
+                start_scan, _ = self.get_ms2_scan_number_from_retention_time(group.rt_from)
+                end_scan, _ = self.get_ms2_scan_number_from_retention_time(group.rt_to)
+                tasks.append((start_scan, end_scan, self._get_ms2_average_filter_(start_scan, group.precursor_mass)))
+            else:
+                tasks.append([int(n) for n in group])
+
+        def average(access: RawFileAccess, task) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            if type(task) is tuple:
+                return _averaged_scan_to_numpy_(access.average_scans_in_scan_range(*task, mass_options, average_options))
+            return _averaged_scan_to_numpy_(access.average_scans(task, mass_options, average_options))
+
+        return list(parallel_map(self._path, tasks, average, workers))
+
+    def _get_ms2_average_filter_(self, start_scan: int, precursor_mass: float) -> str:
+        rounded_precursor = round(precursor_mass, 4)
+        template_string = self._get_scan_event_str_(start_scan)
+        return f'FTMS + p ESI d Full ms2 {rounded_precursor}@{template_string.split("@")[1]}'
 
-    def get_scan_from_scan_number(self, scan_number: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, str]:
+    def get_scan_from_scan_number(self, scan_number: int, copy: bool=True) -> Tuple[np.ndarray, np.ndarray, np.ndarray, str]:
         """
         Get scan data from a scan number. The data returned is structured in a tuple as follows:
             (masses, intensities, ion_charges, scan_event_descriptions)
 
         :param scan_number: The number of the scan
+        :param copy: If false, the arrays are shared with the spectrum cache (no copy) and are therefore read-only
         :returns: Tuple organized as (masses, intensities, ion_charges, scan_event_descriptions)
         """
         if scan_number < self.first_scan or scan_number > self.last_scan:
             raise ValueError(f'The scan number {scan_number} is out of bounds. Valid range {self.first_scan} - {self.last_scan}.')
 
-        if scan_number in self._spectrum_cache:
-            return self._spectrum_cache[scan_number][0], self._spectrum_cache[scan_number][1], self._spectrum_cache[scan_number][2], self._result_string_cache[scan_number]
-
-        positions, intensities, charges = self._get_scan_(scan_number)
-        scan_event_str = self._raw_file_access.get_scan_event_string_for_scan_number(scan_number)
-        return positions, intensities, charges, scan_event_str
-
-    def get_retention_time_from_scan_number(self, scan_number: int) -> float:
-        """
-        Get the retention time (in minutes) from a scan number
-        :param scan_number: The number of the scan
-        :returns: Retention time in minutes
-        """
-        if scan_number < self.first_scan or scan_number > self.last_scan:
-            raise ValueError(f'The scan number {scan_number} is out of bounds. Valid range {self.first_scan} - {self.last_scan}.')
-        
-        idx = np.argmin(np.abs(self._scan_numbers - scan_number))
-        return self._retention_times[idx]
-
-    def get_scan_number_from_retention_time(self, rt: float) -> int:
-        """
-        Get the closest scan number from a given retention time (in minutes). If the retention time is smaller than zero
-        this will always return the first scan number and if it is larger than the latest entry it will return the biggest
-        scan number.
-        :param rt: Retention time (in minutes)
-        :returns: Scan number
-        """
-        if rt < 0 or rt > self.total_time_min:
-            raise ValueError(f'The retiontion time {rt} is out of bounds. Valid range 0 - {self.total_time_min}.')
-
-        idx = np.argmin(np.abs(self._retention_times - rt))
-        return int(self._scan_numbers[idx])
-
-    def get_ms1_scan_number_from_retention_time(self, rt: float) -> Tuple[int, float]:
-        """
-        Get the closest scan number in MS1 spectra from a given retention time (in minutes). If the retention time is smaller than zero
-        this will always return the first scan number and if it is larger than the latest entry it will return the biggest
-        scan number.
-        :param rt: Retention time (in minutes)
-        :returns: Scan number
-        """
-        if rt < 0 or rt > self.total_time_min:
-            raise ValueError(f'The retiontion time {rt} is out of bounds. Valid range 0 - {self.total_time_min}.')
-
-        idx = np.argmin(np.abs(self._ms1_retention_times - rt))
-        found_rt = self._ms1_retention_times[idx]
-        found_scan_nr = self._ms1_scan_numbers[idx]
-        return int(found_scan_nr), found_rt
-
-    def get_ms2_scan_number_from_retention_time(self, rt: float, precursor_mz: float=None, tolerance_ppm = 10e-3) -> Tuple[int, float]:
-        """
-        Get the closest scan number in MS2 spectra from a given retention time (in minutes). If the retention time is smaller than zero
-        this will always return the first scan number and if it is larger than the latest entry it will return the biggest
-        scan number.
-        NOTE: This method does not yet support all mass tolerance units
-        :param rt: Retention time (in minutes)
-        :param precursor_mz: Precursor mass
-        :param tolerance: Mass tolerance to precursor (in ppm)
-        :returns: Scan number
-        """
-        if rt < 0 or rt > self.total_time_min:
-            raise ValueError(f'The retiontion time {rt} is out of bounds. Valid range 0 - {self.total_time_min}.')
-
-        if precursor_mz is None:
-            idx = np.argmin(np.abs(self._ms2_retention_times - rt))
-            found_rt = self._ms2_retention_times[idx]
-            found_scan_nr = int(self._ms2_scan_numbers[idx])
-            return found_scan_nr, found_rt
-        else:
-            ms2_idxs = np.abs(self._ms2_filter_masses - precursor_mz) <= tolerance_ppm
-            ms2_scans = self._ms2_filter_scan_numbers[ms2_idxs]
-            ms2_rts = self._retention_times[ms2_scans.astype(int) + self.first_scan]
-            idx = np.argmin(np.abs(ms2_rts - rt))
-            found_rt = ms2_rts[idx]
-            found_scan_nr = int(ms2_scans[idx])
-            return found_scan_nr, found_rt
-
-    def get_scan_event_str_from_scan_number(self, scan_number: int) -> str:
-        """
-        Get the scan event description text from a scan number.
-        :param scan_number: Scan number to retrieve the description from
-        :returns: Scan event description
-        """
-        if scan_number < self.first_scan or scan_number > self.last_scan:
-            raise ValueError(f'The scan number {scan_number} is out of bounds. Valid range {self.first_scan} - {self.last_scan}.')
-        
-        if scan_number in self._result_string_cache:
-            return self._result_string_cache[scan_number]
-
-        _, _, _, event_str = self.get_scan_from_scan_number(scan_number)
-        return event_str
+        spectrum = self._spectrum_cache.get(scan_number)
+        if spectrum is None:
+            spectrum = self._get_scan_(scan_number)
+
+            if self._spectrum_cache.max_size_bytes == 0:
+                positions, intensities, charges = spectrum
+                return positions, intensities, charges, self._get_scan_event_str_(scan_number)
+
+            # arrays are shared with the cache and therefore must not be modified
+            for array in spectrum:
+                array.setflags(write=False)
+            self._spectrum_cache.put(scan_number, spectrum)
+
+        positions, intensities, charges = (array.copy() for array in spectrum) if copy else spectrum
+        return positions, intensities, charges, self._get_scan_event_str_(scan_number)
+
+    def parallel_scans(self, fn: Callable[[RawFileAccess, int], T], first_scan: int=None, last_scan: int=None, workers: int=None) -> Iterator[T]:
+        """
+        Applies a function to every scan in a range using multiple threads (each with its own
+        raw file accessor) and yields the results in scan order.
+        :param fn: Function called as fn(accessor, scan_number) on a worker thread
+        :param first_scan: First scan number (first scan of the file by default)
+        :param last_scan: Last scan number (last scan of the file by default)
+        :param workers: Number of worker threads (defaults to the number of CPUs)
+        :returns: Iterator over the results of fn in scan order
+        """
+        first_scan = self.first_scan if first_scan is None else first_scan
+        last_scan = self.last_scan if last_scan is None else last_scan
+        return parallel_scans(self._path, first_scan, last_scan, fn, workers)
+
+    def _get_scan_event_str_(self, scan_number: int) -> str:
+        scan_event_str = self._result_string_cache.get(scan_number)
+        if scan_event_str is None:
+            scan_event_str = self._raw_file_access.get_scan_event_string_for_scan_number(scan_number)
+            self._result_string_cache.put(scan_number, scan_event_str)
+        return scan_event_str
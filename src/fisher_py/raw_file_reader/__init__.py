@@ -1,3 +1,19 @@
-from fisher_py.raw_file_reader.scan_dependents import ScanDependents
-from fisher_py.raw_file_reader.raw_file_access import RawFileAccess
-from fisher_py.raw_file_reader.raw_file_reader_adapter import RawFileReaderAdapter
+from typing import TYPE_CHECKING
+from fisher_py.lazy_attributes import install_lazy_attributes
+
+if TYPE_CHECKING:
+    from fisher_py.raw_file_reader.scan_dependents import ScanDependents
+    from fisher_py.raw_file_reader.raw_file_access import RawFileAccess
+    from fisher_py.raw_file_reader.raw_file_reader_adapter import RawFileReaderAdapter
+    from fisher_py.raw_file_reader.parallel import ThreadAccessorPool, parallel_map, parallel_scans
+
+# attributes are imported on first access, so that modules without .NET dependencies
+# (e.g. the log tables of the data model) can be imported without loading the .NET runtime
+install_lazy_attributes(globals(), {
+    'ScanDependents': 'fisher_py.raw_file_reader.scan_dependents',
+    'RawFileAccess': 'fisher_py.raw_file_reader.raw_file_access',
+    'RawFileReaderAdapter': 'fisher_py.raw_file_reader.raw_file_reader_adapter',
+    'ThreadAccessorPool': 'fisher_py.raw_file_reader.parallel',
+    'parallel_map': 'fisher_py.raw_file_reader.parallel',
+    'parallel_scans': 'fisher_py.raw_file_reader.parallel',
+})
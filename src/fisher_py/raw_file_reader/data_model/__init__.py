@@ -1 +1,20 @@
-from fisher_py.raw_file_reader.data_model.wrapped_run_header import WrappedRunHeader
+from typing import TYPE_CHECKING
+from fisher_py.lazy_attributes import install_lazy_attributes
+
+if TYPE_CHECKING:
+    from fisher_py.raw_file_reader.data_model.wrapped_run_header import WrappedRunHeader
+    from fisher_py.raw_file_reader.data_model.packed_scans import PackedScans
+    from fisher_py.raw_file_reader.data_model.scan_event_table import ScanEventSnapshot, ScanEventTable
+    from fisher_py.raw_file_reader.data_model.trailer_table import TrailerTable
+    from fisher_py.raw_file_reader.data_model.status_log_table import StatusLogTable
+
+# attributes are imported on first access, so that modules without .NET dependencies
+# (e.g. PackedScans or the log tables) can be imported without loading the .NET runtime
+install_lazy_attributes(globals(), {
+    'WrappedRunHeader': 'fisher_py.raw_file_reader.data_model.wrapped_run_header',
+    'PackedScans': 'fisher_py.raw_file_reader.data_model.packed_scans',
+    'ScanEventSnapshot': 'fisher_py.raw_file_reader.data_model.scan_event_table',
+    'ScanEventTable': 'fisher_py.raw_file_reader.data_model.scan_event_table',
+    'TrailerTable': 'fisher_py.raw_file_reader.data_model.trailer_table',
+    'StatusLogTable': 'fisher_py.raw_file_reader.data_model.status_log_table',
+})
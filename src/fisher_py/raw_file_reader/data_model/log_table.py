@@ -0,0 +1,118 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple
+from fisher_py.data.business import GenericDataTypes
+import numpy as np
+
+
+_numpy_types_of_data_types = {
+    GenericDataTypes.UCHAR: np.uint8,
+    GenericDataTypes.SHORT: np.int16,
+    GenericDataTypes.USHORT: np.uint16,
+    GenericDataTypes.LONG: np.int32,
+    GenericDataTypes.ULONG: np.uint32,
+    GenericDataTypes.FLOAT: np.float32,
+    GenericDataTypes.DOUBLE: np.float64,
+}
+
+_boolean_data_types = {GenericDataTypes.TRUEFALSE, GenericDataTypes.YESNO, GenericDataTypes.ONOFF}
+
+
+def to_log_column(values: List[str], data_type: GenericDataTypes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert the (unformatted) values of a log field to a typed numpy array. Numeric fields
+    are converted to the numpy type of the field, whatever the values are. Values which
+    cannot be parsed are set to 0 (NaN for floating point fields) and reported in a mask.
+    True/false, yes/no and on/off fields are converted to bool and all other fields to
+    strings without surrounding whitespace.
+    :param values: Values of the field as returned by the raw file
+    :param data_type: Data type of the field (see HeaderItem.data_type)
+    :returns: Tuple organized as (typed values, mask of the values which could not be parsed or None if all were parsed)
+    """
+    strings = np.array(values, dtype=str)
+    if data_type in _boolean_data_types:
+        return np.isin(np.char.lower(np.char.strip(strings)), ('true', 'yes', 'on')), None
+
+    dtype = _numpy_types_of_data_types.get(data_type)
+    if dtype is None:
+        return np.char.strip(strings), None
+
+    try:
+        return strings.astype(np.float64).astype(dtype), None
+    except ValueError:
+        parsed = [_parse_float(v) for v in values]
+        missing = np.array([v is None for v in parsed], dtype=bool)
+        fill_value = np.nan if np.dtype(dtype).kind == 'f' else 0
+        return np.array([fill_value if v is None else v for v in parsed], dtype=np.float64).astype(dtype), missing
+
+
+def to_log_columns(rows: List[List[str]], headers: List[Tuple[int, str, GenericDataTypes]]) -> Tuple[Dict[str, np.ndarray], Dict[str, GenericDataTypes], Dict[str, np.ndarray]]:
+    """
+    Convert log records column-wise (see to_log_column)
+    :param rows: Values of each record
+    :param headers: Position, label and data type of each field to convert
+    :returns: Tuple organized as (column of each label, data type of each label, mask of the values
+        which could not be parsed of each label with such values)
+    """
+    columns, data_types, missing = dict(), dict(), dict()
+    for i, label, data_type in headers:
+        columns[label], mask = to_log_column([row[i] for row in rows], data_type)
+        data_types[label] = data_type
+        if mask is not None:
+            missing[label] = mask
+    return columns, data_types, missing
+
+
+def _parse_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class LogTable(object):
+    """
+    Values of a generic log (such as trailer extra or status log) with one typed numpy
+    column per field (e.g. table['Charge State:'] holds the charge of every record).
+    Numeric columns always have the type of their field; values which could not be parsed
+    are reported by get_missing.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], data_types: Dict[str, GenericDataTypes], missing: Dict[str, np.ndarray]=None):
+        self.columns = columns
+        self.data_types = data_types
+        self.missing = dict() if missing is None else missing
+
+    @property
+    def labels(self) -> List[str]:
+        """
+        Gets the labels of the columns (in the order of the log header)
+        """
+        return list(self.columns.keys())
+
+    def __contains__(self, label: str) -> bool:
+        return label in self.columns
+
+    def __getitem__(self, label: str) -> np.ndarray:
+        return self.columns[label]
+
+    def get(self, label: str, default: np.ndarray=None) -> np.ndarray:
+        """
+        Gets a column
+        :param label: Label of the log field
+        :param default: Value returned if the field is not part of the table
+        :returns: The values of all records or the default
+        """
+        return self.columns.get(label, default)
+
+    def get_missing(self, label: str) -> np.ndarray:
+        """
+        Gets the mask of the values of a field which could not be parsed (0 or NaN in the column)
+        :param label: Label of the log field
+        :returns: True for each record whose value could not be parsed
+        """
+        mask = self.missing.get(label)
+        return np.zeros(len(self.columns[label]), dtype=bool) if mask is None else mask
+
+    def _get_row_(self, index: int) -> Dict[str, object]:
+        # values which could not be parsed are None
+        return {label: None if label in self.missing and self.missing[label][index] else column[index].item() for label, column in self.columns.items()}
@@ -0,0 +1,55 @@
+from __future__ import annotations
+from typing import Tuple
+import numpy as np
+
+
+class PackedScans(object):
+    """
+    Spectra of a scan range packed into flat arrays. The peaks of the i-th scan are
+    stored in masses[offsets[i]:offsets[i + 1]] (same for intensities and charges).
+    """
+
+    def __init__(self, scan_numbers: np.ndarray, retention_times: np.ndarray, ms_orders: np.ndarray, tics: np.ndarray, base_peak_masses: np.ndarray, base_peak_intensities: np.ndarray, centroided: np.ndarray, offsets: np.ndarray, masses: np.ndarray, intensities: np.ndarray, charges: np.ndarray):
+        self.scan_numbers = scan_numbers
+        self.retention_times = retention_times
+        self.ms_orders = ms_orders
+        self.tics = tics
+        self.base_peak_masses = base_peak_masses
+        self.base_peak_intensities = base_peak_intensities
+        self.centroided = centroided
+        self.offsets = offsets
+        self.masses = masses
+        self.intensities = intensities
+        self.charges = charges
+
+    @property
+    def peak_counts(self) -> np.ndarray:
+        """
+        Gets the number of peaks of each scan
+        """
+        return np.diff(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.scan_numbers)
+
+    def get_scan(self, index: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Gets the peaks of a scan (views into the packed arrays)
+
+        :param index: Index of the scan within this structure (not the scan number)
+        :returns: Tuple organized as (masses, intensities, charges)
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.masses[start:end], self.intensities[start:end], self.charges[start:end]
+
+    def get_scan_from_scan_number(self, scan_number: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Gets the peaks of a scan by its scan number (views into the packed arrays)
+
+        :param scan_number: The number of the scan
+        :returns: Tuple organized as (masses, intensities, charges)
+        """
+        index = int(np.searchsorted(self.scan_numbers, scan_number))
+        if index >= len(self.scan_numbers) or self.scan_numbers[index] != scan_number:
+            raise ValueError(f'The scan number {scan_number} is not part of the packed scans.')
+        return self.get_scan(index)
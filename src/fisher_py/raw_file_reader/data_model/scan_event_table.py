@@ -0,0 +1,198 @@
+from __future__ import annotations
+from typing import Any, List
+from fisher_py.data.scan_event import ScanEvent
+from fisher_py.data.filter_enums import MassAnalyzerType, MsOrderType, PolarityType
+from fisher_py.net_wrapping.net_reference_map import NetReferenceMap
+import numpy as np
+
+
+class ScanEventSnapshot(object):
+    """
+    Plain Python copy of the fields of a scan event which are most often needed. Reading
+    these attributes does not cross the .NET boundary (use scan_event for everything else).
+    """
+
+    __slots__ = (
+        'event_id', 'scan_event', 'filter_string', 'ms_order', 'polarity', 'mass_analyzer', 'scan_mode', 'scan_data',
+        'ionization_mode', 'dependent', 'precursor_masses', 'isolation_widths', 'activation_types', 'collision_energies',
+        'mass_ranges'
+    )
+
+    def __init__(self, event_id: int, scan_event: ScanEvent):
+        """
+        Read all fields of a scan event
+        :param event_id: Id of the event within its event table
+        :param scan_event: The wrapped .NET scan event
+        """
+        self.event_id = event_id
+        self.scan_event = scan_event
+        self.filter_string = str(scan_event)
+        self.ms_order = scan_event.ms_order
+        self.polarity = scan_event.polarity
+        self.mass_analyzer = scan_event.mass_analyzer
+        self.scan_mode = scan_event.scan_mode
+        self.scan_data = scan_event.scan_data
+        self.ionization_mode = scan_event.ionization_mode
+        self.dependent = scan_event.dependent
+
+        reactions = [scan_event.get_reaction(i) for i in range(scan_event.mass_count)]
+        self.precursor_masses = tuple(r.precursor_mass for r in reactions)
+        self.isolation_widths = tuple(r.isolation_width for r in reactions)
+        self.activation_types = tuple(r.activation_type for r in reactions)
+        self.collision_energies = tuple(r.collision_energy for r in reactions)
+
+        mass_ranges = [scan_event.get_mass_range(i) for i in range(scan_event.mass_range_count)]
+        self.mass_ranges = tuple((r.low, r.high) for r in mass_ranges)
+
+    def __repr__(self) -> str:
+        return f'ScanEventSnapshot({self.event_id}, {self.filter_string!r})'
+
+
+class ScanEventTable(object):
+    """
+    Scan events of a scan range. Every distinct event is stored once (see events) and each
+    scan refers to its event by id (see event_ids), so per-scan properties are available
+    as numpy arrays.
+    """
+
+    def __init__(self, first_scan_number: int, events: List[ScanEventSnapshot], event_ids: np.ndarray):
+        self.first_scan_number = first_scan_number
+        self.events = events
+        self.event_ids = event_ids
+        self._filter_strings = None
+        self._filter_ids = None
+
+    @property
+    def last_scan_number(self) -> int:
+        """
+        Gets the last scan number covered by the table
+        """
+        return self.first_scan_number + len(self.event_ids) - 1
+
+    @property
+    def scan_numbers(self) -> np.ndarray:
+        """
+        Gets the scan number of each scan in the table
+        """
+        return np.arange(self.first_scan_number, self.last_scan_number + 1)
+
+    @property
+    def ms_orders(self) -> np.ndarray:
+        """
+        Gets the MS order (MsOrderType value) of each scan
+        """
+        return self._per_scan_(lambda e: e.ms_order.value, np.int8)
+
+    @property
+    def mass_analyzers(self) -> np.ndarray:
+        """
+        Gets the mass analyzer (MassAnalyzerType value) of each scan
+        """
+        return self._per_scan_(lambda e: e.mass_analyzer.value, np.int8)
+
+    @property
+    def polarities(self) -> np.ndarray:
+        """
+        Gets the polarity (PolarityType value) of each scan
+        """
+        return self._per_scan_(lambda e: e.polarity.value, np.int8)
+
+    @property
+    def precursor_masses(self) -> np.ndarray:
+        """
+        Gets the precursor mass of the last reaction of each scan (NaN for MS1 scans)
+        """
+        return self._per_scan_(lambda e: e.precursor_masses[-1] if len(e.precursor_masses) > 0 else np.nan, np.float64)
+
+    @property
+    def isolation_widths(self) -> np.ndarray:
+        """
+        Gets the isolation width of the last reaction of each scan (NaN for MS1 scans)
+        """
+        return self._per_scan_(lambda e: e.isolation_widths[-1] if len(e.isolation_widths) > 0 else np.nan, np.float64)
+
+    @property
+    def activation_types(self) -> np.ndarray:
+        """
+        Gets the activation (ActivationType value) of the last reaction of each scan (-1 for MS1 scans)
+        """
+        return self._per_scan_(lambda e: e.activation_types[-1].value if len(e.activation_types) > 0 else -1, np.int8)
+
+    @property
+    def filter_strings(self) -> List[str]:
+        """
+        Gets the distinct filter strings of the table (sorted)
+        """
+        self._index_filters_()
+        return self._filter_strings
+
+    @property
+    def filter_ids(self) -> np.ndarray:
+        """
+        Gets the index into filter_strings of each scan. Events which only differ in
+        fields that are not part of the filter string share a filter id.
+        """
+        self._index_filters_()
+        return self._filter_ids
+
+    def __len__(self) -> int:
+        return len(self.event_ids)
+
+    def get_event(self, scan_number: int) -> ScanEventSnapshot:
+        """
+        Gets the event of a scan
+        :param scan_number: The scan number
+        :returns: Snapshot of the scan event
+        """
+        index = scan_number - self.first_scan_number
+        if index < 0 or index >= len(self.event_ids):
+            raise ValueError(f'The scan number {scan_number} is not part of the event table.')
+        return self.events[self.event_ids[index]]
+
+    def find_scans(self, ms_order: MsOrderType=None, mass_analyzer: MassAnalyzerType=None, polarity: PolarityType=None) -> np.ndarray:
+        """
+        Gets the numbers of the scans matching all given criteria
+        :param ms_order: MS order of the scans
+        :param mass_analyzer: Mass analyzer of the scans
+        :param polarity: Polarity of the scans
+        :returns: Scan numbers in ascending order
+        """
+        matches = np.ones(len(self.events), dtype=bool)
+        for i, event in enumerate(self.events):
+            matches[i] = (ms_order is None or event.ms_order == ms_order) \
+                and (mass_analyzer is None or event.mass_analyzer == mass_analyzer) \
+                and (polarity is None or event.polarity == polarity)
+        return np.flatnonzero(matches[self.event_ids]) + self.first_scan_number
+
+    def _index_filters_(self):
+        if self._filter_ids is None:
+            filter_strings, event_filter_ids = np.unique([e.filter_string for e in self.events], return_inverse=True)
+            self._filter_strings = filter_strings.tolist()
+            self._filter_ids = event_filter_ids.astype(np.int32)[self.event_ids]
+
+    def _per_scan_(self, getter, dtype: type) -> np.ndarray:
+        values = np.array([getter(e) for e in self.events], dtype=dtype)
+        return values[self.event_ids]
+
+    @staticmethod
+    def from_net_events(first_scan_number: int, net_events: Any) -> ScanEventTable:
+        """
+        Create table from the events returned by IRawDataPlus.GetScanEvents. Events are
+        deduplicated by reference, so the fields of every distinct event are read only once.
+        :param first_scan_number: Scan number of the first event
+        :param net_events: .NET array of scan events
+        :returns: The event table
+        """
+        events = list()
+        event_ids = np.empty(net_events.Length, dtype=np.int32)
+        known_events = NetReferenceMap()
+
+        for i, net_event in enumerate(net_events):
+            event_id = known_events.get(net_event)
+            if event_id is None:
+                event_id = len(events)
+                events.append(ScanEventSnapshot(event_id, ScanEvent._get_wrapper_(net_event)))
+                known_events.put(net_event, event_id)
+            event_ids[i] = event_id
+
+        return ScanEventTable(first_scan_number, events, event_ids)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+from typing import Dict, Union
+from fisher_py.data.business import GenericDataTypes
+from fisher_py.raw_file_reader.data_model.log_table import LogTable
+import numpy as np
+
+
+class StatusLogTable(LogTable):
+    """
+    Status log of an instrument with one typed numpy column per status field. The records
+    are sorted by retention time, so readbacks for many retention times (e.g. of every
+    scan) are looked up with a single searchsorted call.
+    """
+
+    def __init__(self, retention_times: np.ndarray, columns: Dict[str, np.ndarray], data_types: Dict[str, GenericDataTypes], missing: Dict[str, np.ndarray]=None):
+        super().__init__(columns, data_types, missing)
+        self.retention_times = retention_times
+
+    def __len__(self) -> int:
+        return len(self.retention_times)
+
+    def get_indices_for_retention_times(self, retention_times: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Gets the index of the record nearest to each retention time (same record as
+        returned by RawFileAccess.get_status_log_for_retention_time)
+        :param retention_times: Retention time(s) in minutes
+        :returns: Record indices (same shape as retention_times)
+        """
+        if len(self.retention_times) == 0:
+            raise ValueError('The status log is empty.')
+
+        retention_times = np.asarray(retention_times, dtype=np.float64)
+        if len(self.retention_times) == 1:
+            return np.zeros(retention_times.shape, dtype=np.int64)
+
+        upper = np.clip(np.searchsorted(self.retention_times, retention_times), 1, len(self.retention_times) - 1)
+        lower = upper - 1
+        closer_to_upper = self.retention_times[upper] - retention_times < retention_times - self.retention_times[lower]
+        return np.where(closer_to_upper, upper, lower)
+
+    def lookup(self, label: str, retention_times: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Gets the values of a status field nearest to each retention time
+        :param label: Label of the status field
+        :param retention_times: Retention time(s) in minutes
+        :returns: The values (same shape as retention_times)
+        """
+        return self.columns[label][self.get_indices_for_retention_times(retention_times)]
+
+    def get_row_for_retention_time(self, retention_time: float) -> Dict[str, object]:
+        """
+        Gets the status record nearest to a retention time
+        :param retention_time: Retention time in minutes
+        :returns: Dictionary mapping each label to the value of the record
+        """
+        return self._get_row_(int(self.get_indices_for_retention_times(retention_time)))
@@ -0,0 +1,30 @@
+from __future__ import annotations
+from typing import Dict
+from fisher_py.data.business import GenericDataTypes
+from fisher_py.raw_file_reader.data_model.log_table import LogTable
+import numpy as np
+
+
+class TrailerTable(LogTable):
+    """
+    Trailer extra values of a scan range with one typed numpy column per trailer field
+    (e.g. table['Charge State:'] holds the charge of every scan).
+    """
+
+    def __init__(self, scan_numbers: np.ndarray, columns: Dict[str, np.ndarray], data_types: Dict[str, GenericDataTypes], missing: Dict[str, np.ndarray]=None):
+        super().__init__(columns, data_types, missing)
+        self.scan_numbers = scan_numbers
+
+    def __len__(self) -> int:
+        return len(self.scan_numbers)
+
+    def get_row(self, scan_number: int) -> Dict[str, object]:
+        """
+        Gets the trailer values of a single scan
+        :param scan_number: The scan number
+        :returns: Dictionary mapping each label to the value of the scan
+        """
+        index = scan_number - int(self.scan_numbers[0]) if len(self.scan_numbers) > 0 else -1
+        if index < 0 or index >= len(self.scan_numbers):
+            raise ValueError(f'The scan number {scan_number} is not part of the trailer table.')
+        return self._get_row_(index)
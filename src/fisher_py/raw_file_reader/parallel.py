@@ -0,0 +1,130 @@
+from __future__ import annotations
+from typing import Callable, Iterable, Iterator, List, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from fisher_py.data.business.raw_file_reader_factory import RawFileReaderFactory
+from fisher_py.raw_file_reader.raw_file_access import RawFileAccess
+from fisher_py.data import Device
+import threading
+import os
+
+S = TypeVar('S')
+T = TypeVar('T')
+
+
+class ThreadAccessorPool(object):
+    """
+    Hands out one RawFileAccess per thread for the same raw file. All accessors share
+    a single thread manager (see RawFileReaderFactory.create_thread_manager), so the
+    file is only opened once.
+    """
+
+    def __init__(self, path: str, device: Device=Device.MS, device_index: int=1):
+        """
+        Opens a raw file for access from multiple threads
+        :param path: Path to the raw file
+        :param device: Device to select on every accessor
+        :param device_index: Stream number of the device (1 based)
+        """
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f'No raw file with path "{path}" found.')
+
+        self._thread_manager = RawFileReaderFactory.create_thread_manager(path)
+        self._device = device
+        self._device_index = device_index
+        self._local = threading.local()
+        self._accessors = list()
+        self._lock = threading.Lock()
+
+    def get_accessor(self) -> RawFileAccess:
+        """
+        Get the accessor of the calling thread (created on first use)
+        :returns: Raw file access which must only be used by the calling thread
+        """
+        accessor = getattr(self._local, 'accessor', None)
+        if accessor is None:
+            accessor = self._thread_manager.create_thread_accessor()
+            accessor.select_instrument(self._device, self._device_index)
+            self._local.accessor = accessor
+            with self._lock:
+                self._accessors.append(accessor)
+        return accessor
+
+    def __enter__(self) -> ThreadAccessorPool:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.dispose()
+
+    def dispose(self):
+        """
+        Dispose all accessors and the underlying thread manager
+        """
+        with self._lock:
+            for accessor in self._accessors:
+                accessor.dispose()
+            self._accessors.clear()
+        self._thread_manager.dispose()
+
+
+def parallel_map(path: str, items: Iterable[S], fn: Callable[[RawFileAccess, S], T], workers: int=None, device: Device=Device.MS, device_index: int=1) -> Iterator[T]:
+    """
+    Applies a function to every item using multiple threads. Each worker thread reads from
+    its own accessor and the results are yielded in the order of the items. At most a few
+    items per worker are processed ahead of the consumer, so memory stays bounded even if
+    the results are consumed slowly.
+    :param path: Path to the raw file
+    :param items: Items to process (e.g. groups of scans)
+    :param fn: Function called as fn(accessor, item) on a worker thread
+    :param workers: Number of worker threads (defaults to the number of CPUs)
+    :param device: Device to read from
+    :param device_index: Stream number of the device (1 based)
+    :returns: Iterator over the results of fn in item order
+    """
+    workers = workers or os.cpu_count() or 1
+
+    with ThreadAccessorPool(path, device, device_index) as pool:
+
+        def process_item(item: S) -> T:
+            return fn(pool.get_accessor(), item)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            try:
+                for item in items:
+                    pending.append(executor.submit(process_item, item))
+                    if len(pending) >= 2 * workers:
+                        yield pending.popleft().result()
+                while len(pending) > 0:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+
+def parallel_scans(path: str, first_scan_number: int, last_scan_number: int, fn: Callable[[RawFileAccess, int], T], workers: int=None, chunk_size: int=16, device: Device=Device.MS, device_index: int=1) -> Iterator[T]:
+    """
+    Applies a function to every scan of a range using multiple threads. Each worker thread
+    reads from its own accessor and the results are yielded in scan order. At most a few
+    chunks per worker are processed ahead of the consumer, so memory stays bounded even
+    if the results are consumed slowly.
+    :param path: Path to the raw file
+    :param first_scan_number: First scan to process
+    :param last_scan_number: Last scan to process
+    :param fn: Function called as fn(accessor, scan_number) on a worker thread
+    :param workers: Number of worker threads (defaults to the number of CPUs)
+    :param chunk_size: Number of consecutive scans processed per task
+    :param device: Device to read from
+    :param device_index: Stream number of the device (1 based)
+    :returns: Iterator over the results of fn in scan order
+    """
+    assert type(first_scan_number) is int
+    assert type(last_scan_number) is int
+    assert chunk_size > 0
+
+    def process_chunk(accessor: RawFileAccess, chunk: range) -> List[T]:
+        return [fn(accessor, scan_number) for scan_number in chunk]
+
+    chunks = (range(start, min(start + chunk_size, last_scan_number + 1)) for start in range(first_scan_number, last_scan_number + 1, chunk_size))
+    for results in parallel_map(path, chunks, process_chunk, workers, device, device_index):
+        yield from results
@@ -7,18 +7,23 @@ from fisher_py.utils import datetime_net_to_py, is_number, to_net_list
 from fisher_py.data.business import (
     RunHeader, InstrumentSelection, SampleInformation, CentroidStream, ChromatogramTraceSettings,
     MassOptions, InstrumentData, ScanStatistics, SegmentedScan, LogEntry, HeaderItem, StatusLogValues,
-    TuneDataValues, Scan
+    TuneDataValues, Scan, GenericDataTypes
 )
 from fisher_py.data.business.chromatogram_signal import ChromatogramData
-from fisher_py.raw_file_reader.data_model import WrappedRunHeader
+from fisher_py.raw_file_reader.data_model import WrappedRunHeader, PackedScans, ScanEventTable, TrailerTable, StatusLogTable
+from fisher_py.raw_file_reader.data_model.log_table import to_log_columns
 from fisher_py.data import (
     Device, ScanFilter, ScanEvent, FtAverageOptions, FileError, FileHeader, ScanEvents, ErrorLogEntry
 )
 from fisher_py.net_wrapping import NetWrapperBase, ThermoFisher
+from fisher_py.net_wrapping.wrapped_net_array import WrappedNetArray
+from fisher_py.net_wrapping.wrapped_net_list import WrappedNetList
 from fisher_py.exceptions import RawFileException
 from datetime import datetime
+import numpy as np
 import os
 import System
+import System.Collections.Generic as generic
 
 
 class RawFileAccess(NetWrapperBase):
@@ -37,6 +42,7 @@ class RawFileAccess(NetWrapperBase):
         self._run_header = None
         self._instrument_selection = None
         self._sample_information = None
+        self._clear_filter_caches_()
 
         if file_path is None:
             return
@@ -305,6 +311,31 @@ class RawFileAccess(NetWrapperBase):
         assert type(last_scan_number) is int
         return [ScanEvent._get_wrapper_(e) for e in self._get_wrapped_object_().GetScanEvents(first_scan_number, last_scan_number)]
 
+    def get_scan_event_table(self, first_scan_number: int=None, last_scan_number: int=None) -> ScanEventTable:
+        """
+        Summary:
+            Reads the scan events of a range of scans as a block (see get_scan_events) into
+            a table. Events which are shared by several scans are stored only once and
+            their fields are copied to Python, so per-scan properties such as the MS order
+            are available as numpy arrays without further calls into the raw file.
+
+        Parameters:
+          first_scan_number:
+            The first scan (first scan of the file by default)
+
+          last_scan_number:
+            The last scan (last scan of the file by default)
+
+        Returns:
+            The scan event table
+        """
+        first_scan_number = self.run_header.first_spectrum if first_scan_number is None else first_scan_number
+        last_scan_number = self.run_header.last_spectrum if last_scan_number is None else last_scan_number
+        assert type(first_scan_number) is int
+        assert type(last_scan_number) is int
+        net_events = self._get_wrapped_object_().GetScanEvents(first_scan_number, last_scan_number)
+        return ScanEventTable.from_net_events(first_scan_number, net_events)
+
     def get_scan_event_string_for_scan_number(self, scan: int) -> List[str]:
         """
         Summary:
@@ -355,10 +386,15 @@ class RawFileAccess(NetWrapperBase):
         Exceptions:
         T:ThermoFisher.CommonCore.Data.Business.NoSelectedMsDeviceException:
         Thrown if this is called without first selecting an MS detector
+
+        Remarks:
+        The filters are calculated once per selected instrument and then cached.
         """
-        return self._get_wrapped_object_().GetAutoFilters()
+        if self._auto_filters is None:
+            self._auto_filters = [f for f in self._get_wrapped_object_().GetAutoFilters()]
+        return list(self._auto_filters)
 
-    def get_filters(self):
+    def get_filters(self) -> List[ScanFilter]:
         """
         Summary:
              Calculate the filters for this raw file, and return as an array.
@@ -369,8 +405,14 @@ class RawFileAccess(NetWrapperBase):
          Exceptions:
            T:ThermoFisher.CommonCore.Data.Business.NoSelectedMsDeviceException:
              Thrown if the selected device is not of type MS
+
+         Remarks:
+             The filters are calculated once per selected instrument and then cached. Each
+             call returns a new list, the filters are wrapped when they are accessed.
         """
-        return [ScanFilter(f) for f in self._get_wrapped_object_().GetFilters()]
+        if self._filters is None:
+            self._filters = self._get_wrapped_object_().GetFilters()
+        return WrappedNetList[ScanFilter](generic.List[ThermoFisher.CommonCore.Data.Interfaces.IScanFilter](self._filters), ScanFilter)
 
     def get_filter_for_scan_number(self, scan: int) -> ScanFilter:
         """
@@ -391,8 +433,21 @@ class RawFileAccess(NetWrapperBase):
         Exceptions:
           T:ThermoFisher.CommonCore.Data.Business.NoSelectedMsDeviceException:
             Thrown if the selected device is not of type MS
+
+        Remarks:
+            The scan event of the scan is looked up in the scan event table of the file (see
+            get_scan_event_table), which is read once per selected instrument. Each call
+            returns a new filter created from that event.
         """
-        return ScanFilter(self._get_wrapped_object_().GetFilterForScanNumber(scan))
+        assert type(scan) is int
+        if self._scan_event_table is None:
+            self._scan_event_table = self.get_scan_event_table()
+
+        event_table = self._scan_event_table
+        if not event_table.first_scan_number <= scan <= event_table.last_scan_number:
+            return ScanFilter(self._get_wrapped_object_().GetFilterForScanNumber(scan))
+        event = event_table.events[event_table.event_ids[scan - event_table.first_scan_number]]
+        return ScanFilter(self._get_wrapped_object_().CreateFilterFromScanEvent(event.scan_event._get_wrapped_object_()))
 
     def get_scan_event_for_scan_number(self, scan: int) -> ScanEvent:
         """
@@ -602,6 +657,76 @@ class RawFileAccess(NetWrapperBase):
         assert type(stats) is ScanStatistics
         return SegmentedScan._get_wrapper_(self._get_wrapped_object_().GetSegmentedScanFromScanNumber(scan_number, stats._get_wrapped_object_()))
 
+    def read_scans(self, first_scan_number: int, last_scan_number: int, prefer_centroids: bool=True, include_reference_and_exception_peaks: bool=False) -> PackedScans:
+        """
+        Summary:
+            Reads the spectra of a range of scans into one packed structure. The peaks of
+            all scans are concatenated into flat mass, intensity and charge arrays and
+            an offsets array marks where each scan starts.
+        
+        Parameters:
+          first_scan_number:
+            The first scan to read
+        
+          last_scan_number:
+            The last scan to read
+        
+          prefer_centroids:
+            If true, the centroid stream is used for scans which have one. Otherwise
+            (and for scans without centroid stream) the segmented scan data is used
+            and the charges are set to zero.
+        
+          include_reference_and_exception_peaks:
+            determines if peaks flagged as ref should be returned
+        
+        Returns:
+            The packed spectra together with scan numbers, retention times, MS orders, scan
+            statistics (TIC and base peak) and whether the peaks of a scan are centroids.
+        """
+        assert type(first_scan_number) is int
+        assert type(last_scan_number) is int
+        assert type(prefer_centroids) is bool
+        assert type(include_reference_and_exception_peaks) is bool
+
+        scan_numbers = np.arange(first_scan_number, last_scan_number + 1, dtype=np.int32)
+        retention_times = np.empty(len(scan_numbers), dtype=np.float64)
+        tics = np.empty(len(scan_numbers), dtype=np.float64)
+        base_peak_masses = np.empty(len(scan_numbers), dtype=np.float64)
+        base_peak_intensities = np.empty(len(scan_numbers), dtype=np.float64)
+        centroided = np.empty(len(scan_numbers), dtype=bool)
+        ms_orders = self.get_scan_event_table(first_scan_number, last_scan_number).ms_orders
+        offsets = np.zeros(len(scan_numbers) + 1, dtype=np.int64)
+        masses, intensities, charges = list(), list(), list()
+
+        for i, scan_number in enumerate(range(first_scan_number, last_scan_number + 1)):
+            stats = self.get_scan_stats_for_scan_number(scan_number)
+            retention_times[i] = stats.start_time
+            tics[i] = stats.tic
+            base_peak_masses[i] = stats.base_peak_mass
+            base_peak_intensities[i] = stats.base_peak_intensity
+
+            centroid_stream = self.get_centroid_stream(scan_number, include_reference_and_exception_peaks) if prefer_centroids else None
+            if centroid_stream is not None and centroid_stream.length > 0:
+                masses.append(centroid_stream.masses_as_numpy())
+                intensities.append(centroid_stream.intensities_as_numpy())
+                charges.append(centroid_stream.charges_as_numpy())
+                centroided[i] = True
+            else:
+                segmented_scan = self.get_segmented_scan_from_scan_number(scan_number, stats)
+                masses.append(segmented_scan.positions_as_numpy())
+                intensities.append(segmented_scan.intensities_as_numpy())
+                charges.append(np.zeros(len(masses[-1])))
+                centroided[i] = stats.is_centroid_scan
+            offsets[i + 1] = offsets[i] + len(masses[-1])
+
+        def concatenate(arrays: List[np.ndarray]) -> np.ndarray:
+            return np.concatenate(arrays) if len(arrays) > 0 else np.empty(0)
+
+        return PackedScans(
+            scan_numbers, retention_times, ms_orders, tics, base_peak_masses, base_peak_intensities, centroided,
+            offsets, concatenate(masses), concatenate(intensities), concatenate(charges)
+        )
+
     def get_segment_event_table(self) -> List[List[str]]:
         """
         Gets the segment event table for the current instrument. This table indicates
@@ -660,7 +785,7 @@ class RawFileAccess(NetWrapperBase):
         T:ThermoFisher.CommonCore.Data.Business.NoSelectedDeviceException:
         Thrown if no device has been selected
         """
-        return [HeaderItem._get_wrapper_(i) for i in self._get_wrapped_object_().GetStatusLogHeaderInformation()]
+        return WrappedNetArray[HeaderItem](self._get_wrapped_object_().GetStatusLogHeaderInformation(), HeaderItem._get_wrapper_)
 
     def get_status_log_values(self, status_log_index: int, if_formatted: bool) -> StatusLogValues:
         """
@@ -689,6 +814,38 @@ class RawFileAccess(NetWrapperBase):
         assert type(if_formatted) is bool
         return StatusLogValues._get_wrapper_(self._get_wrapped_object_().GetStatusLogValues(status_log_index, if_formatted))
 
+    def status_log_table(self, columns: List[str]=None) -> StatusLogTable:
+        """
+        Summary:
+            Reads all status log records of the current instrument into a table with one
+            typed numpy column per field, sorted by retention time. The types are taken
+            from the status log header (see get_status_log_header_information). Repeated
+            labels are numbered (e.g. 'Status:', 'Status: #2', 'Status: #3'). Use
+            StatusLogTable.lookup instead of get_status_log_for_retention_time to get the
+            readbacks for many retention times at once.
+
+        Parameters:
+          columns:
+            Labels of the fields to read (all fields by default)
+
+        Returns:
+            The status log table
+
+        Exceptions:
+          T:ThermoFisher.CommonCore.Data.Business.NoSelectedDeviceException:
+            Thrown if no device has been selected
+        """
+        headers = self._get_log_headers_(self.get_status_log_header_information(), columns)
+
+        raw_file = self._get_wrapped_object_()
+        records = [raw_file.GetStatusLogValues(i, False) for i in range(raw_file.GetStatusLogEntriesCount())]
+        retention_times = np.array([r.RetentionTime for r in records], dtype=np.float64)
+        order = np.argsort(retention_times, kind='stable')
+        rows = [records[i].Values for i in order]
+
+        table_columns, data_types, missing = to_log_columns(rows, headers)
+        return StatusLogTable(retention_times[order], table_columns, data_types, missing)
+
     def get_trailer_extra_header_information(self) -> List[HeaderItem]:
         """
         Gets the trailer extra header information. This is common across all scan numbers.
@@ -707,7 +864,7 @@ class RawFileAccess(NetWrapperBase):
         T:ThermoFisher.CommonCore.Data.Business.NoSelectedMsDeviceException:
         Thrown if the selected device is not of type MS
         """
-        return [HeaderItem._get_wrapper_(h) for h in self._get_wrapped_object_().GetTrailerExtraHeaderInformation()]
+        return WrappedNetArray[HeaderItem](self._get_wrapped_object_().GetTrailerExtraHeaderInformation(), HeaderItem._get_wrapper_)
 
     def get_trailer_extra_information(self, scan_number: int) -> LogEntry:
         """
@@ -751,6 +908,46 @@ class RawFileAccess(NetWrapperBase):
         assert type(if_formatted) is bool
         return self._get_wrapped_object_().GetTrailerExtraValues(scan_number, if_formatted)
 
+    def trailer_table(self, columns: List[str]=None, first_scan_number: int=None, last_scan_number: int=None) -> TrailerTable:
+        """
+        Summary:
+            Reads the trailer extra values of a range of scans into a table with one typed
+            numpy column per field. The types are taken from the trailer extra header
+            (see get_trailer_extra_header_information), so e.g. 'Charge State:' becomes an
+            integer column and 'Monoisotopic M/Z:' a float column.
+
+        Parameters:
+          columns:
+            Labels of the fields to read (all fields by default)
+
+          first_scan_number:
+            The first scan (first scan of the file by default)
+
+          last_scan_number:
+            The last scan (last scan of the file by default)
+
+        Returns:
+            The trailer table
+
+        Exceptions:
+          T:ThermoFisher.CommonCore.Data.Business.NoSelectedMsDeviceException:
+            Thrown if the selected device is not of type MS
+        """
+        first_scan_number = self.run_header.first_spectrum if first_scan_number is None else first_scan_number
+        last_scan_number = self.run_header.last_spectrum if last_scan_number is None else last_scan_number
+        assert type(first_scan_number) is int
+        assert type(last_scan_number) is int
+
+        headers = self._get_log_headers_(self.get_trailer_extra_header_information(), columns)
+
+        # one call per scan, the values are converted column-wise afterwards
+        raw_file = self._get_wrapped_object_()
+        rows = [raw_file.GetTrailerExtraValues(scan_number, False) for scan_number in range(first_scan_number, last_scan_number + 1)]
+        table_columns, data_types, missing = to_log_columns(rows, headers)
+
+        scan_numbers = np.arange(first_scan_number, last_scan_number + 1, dtype=np.int32)
+        return TrailerTable(scan_numbers, table_columns, data_types, missing)
+
     def get_scan_dependents(self, scan_number: int, filter_precision_decimals: int) -> ScanDependents:
         """
         Summary:
@@ -822,7 +1019,7 @@ class RawFileAccess(NetWrapperBase):
         T:ThermoFisher.CommonCore.Data.Business.NoSelectedMsDeviceException:
         Thrown if the selected device is not of type MS
         """
-        return [HeaderItem._get_wrapper_(i) for i in self._get_wrapped_object_().GetTuneDataHeaderInformation()]
+        return WrappedNetArray[HeaderItem](self._get_wrapped_object_().GetTuneDataHeaderInformation(), HeaderItem._get_wrapper_)
 
     def get_tune_data_values(self, tune_data_index: int, if_formatted: bool) -> TuneDataValues:
         """
@@ -882,6 +1079,7 @@ class RawFileAccess(NetWrapperBase):
         Returns:
         true, if refresh was OK.
         """
+        self._clear_filter_caches_()
         return self._get_wrapped_object_().RefreshViewOfFile()
 
     def retention_time_from_scan_number(self, scan_number: int) -> float:
@@ -933,6 +1131,7 @@ class RawFileAccess(NetWrapperBase):
         assert type(instrument_type) is Device
         assert type(instrument_index) is int
         self._get_wrapped_object_().SelectInstrument(instrument_type.value, instrument_index)
+        self._clear_filter_caches_()
 
     def default_mass_options(self) -> MassOptions:
         """
@@ -1039,7 +1238,8 @@ class RawFileAccess(NetWrapperBase):
             assert type(average_options) is FtAverageOptions
             average_options = average_options._get_wrapped_object_()
         scans = to_net_list(scans, int)
-        return Scan._get_wrapper_(ThermoFisher.CommonCore.Data.Extensions.AverageScans(self._get_wrapped_object_(), scans, options, average_options, always_merge_segments))
+        averaged_scan = ThermoFisher.CommonCore.Data.Extensions.AverageScans(self._get_wrapped_object_(), scans, options, average_options, always_merge_segments)
+        return Scan._get_wrapper_(averaged_scan) if averaged_scan is not None else None
     
     def get_error_log_item(self, index: int) -> ErrorLogEntry:
         """
@@ -1057,6 +1257,29 @@ class RawFileAccess(NetWrapperBase):
         net_entry = self._get_wrapped_object_().GetErrorLogItem(index)
         return ErrorLogEntry._get_wrapper_(net_entry) if net_entry else None
 
+    @staticmethod
+    def _get_log_headers_(header_items: List[HeaderItem], columns: List[str]) -> List[Tuple[int, str, GenericDataTypes]]:
+        # labels can repeat (e.g. the same readbacks of several pumps), repetitions are numbered
+        headers, label_counts = list(), dict()
+        for i, header_item in enumerate(header_items):
+            label = header_item.label
+            label_counts[label] = label_counts.get(label, 0) + 1
+            headers.append((i, label if label_counts[label] == 1 else f'{label} #{label_counts[label]}', header_item.data_type))
+
+        if columns is None:
+            return headers
+
+        header_by_label = {label: (i, label, data_type) for i, label, data_type in headers}
+        unknown_labels = [label for label in columns if label not in header_by_label]
+        if len(unknown_labels) > 0:
+            raise ValueError(f'The log fields {unknown_labels} do not exist.')
+        return [header_by_label[label] for label in columns]
+
+    def _clear_filter_caches_(self):
+        self._filters = None
+        self._auto_filters = None
+        self._scan_event_table = None
+
     def __enter__(self) -> RawFileAccess:
         return self
     
@@ -0,0 +1,223 @@
+from typing import List, Tuple
+from fisher_py.data.filter_enums import MsOrderType
+import numpy as np
+import re
+
+
+SCAN_INDEX_DTYPE = np.dtype([
+    ('scan_number', np.int32),
+    ('retention_time', np.float64),
+    ('ms_order', np.int8),
+    ('mass_analyzer', np.int8),
+    ('polarity', np.int8),
+    ('precursor_mz', np.float64),
+    ('isolation_width', np.float64),
+    ('activation', np.int8),
+    ('tic', np.float64),
+    ('base_peak_mass', np.float64),
+    ('base_peak_intensity', np.float64),
+])
+
+
+def get_ms_order_of_filter(ms_filter: str) -> MsOrderType:
+    """
+    Get the MS order selected by a filter consisting only of the MS order
+    :param ms_filter: The filter (ms, ms2, ..., ms10)
+    :returns: The MS order
+    """
+    match = re.fullmatch(r'ms(\d*)', ms_filter.strip().lower())
+    if match is None:
+        raise ValueError(f'The filter "{ms_filter}" is not supported by the XIC index (use ms, ms2, ..., ms10).')
+    return MsOrderType(int(match.group(1) or 1))
+
+
+class ScanIndexReader(object):
+    """
+    Base class of readers which keep an index of all scans (see SCAN_INDEX_DTYPE) and answer
+    retention time and precursor lookups from it. Subclasses provide first_scan, last_scan,
+    total_time_min, get_scan_from_scan_number, _get_scan_ and _get_scan_event_str_.
+    """
+
+    @property
+    def ms2_filter_masses(self) -> np.ndarray:
+        """
+        Available masses for MS2 filtering (precursor masses)
+        """
+        return self._ms2_filter_unique_filter_masses
+
+    @property
+    def scan_index(self) -> np.ndarray:
+        """
+        Columnar index of all scans (structured array, see SCAN_INDEX_DTYPE for the available fields)
+        """
+        return self._scan_index
+
+    def _set_scan_index_(self, scan_index: np.ndarray):
+        self._scan_index = scan_index
+        self._scan_numbers = self._scan_index['scan_number']
+        self._retention_times = self._scan_index['retention_time']
+
+        # retention times and scan numbers for MS1 only
+        ms1_index = self._scan_index[self._scan_index['ms_order'] == MsOrderType.Ms.value]
+        self._ms1_scan_numbers = ms1_index['scan_number']
+        self._ms1_retention_times = ms1_index['retention_time']
+
+        # retention times and scan numbers for MS2 only
+        ms2_index = self._scan_index[self._scan_index['ms_order'] == MsOrderType.Ms2.value]
+        self._ms2_scan_numbers = ms2_index['scan_number']
+        self._ms2_retention_times = ms2_index['retention_time']
+
+        # filters for MS2
+        ms2_index = ms2_index[~np.isnan(ms2_index['precursor_mz'])]
+        self._ms2_filter_scan_numbers = ms2_index['scan_number']
+        self._ms2_filter_masses = ms2_index['precursor_mz']
+        self._ms2_filter_unique_filter_masses = np.unique(self._ms2_filter_masses)
+
+        # MS2 scans sorted by precursor mass (stable, so scans of equal precursors stay in scan order)
+        self._ms2_precursor_index = ms2_index[np.argsort(self._ms2_filter_masses, kind='stable')]
+
+    def get_tic_ms2(self, precursor_mz: float, tolerance: float=10e-3, from_peaks: bool=False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get total ion current in MS2 for a given precursor mass.
+        NOTE: This method does not yet support all mass tolerance units
+        :param precursor_mz: Precursor mass
+        :param tolerance: Mass tolerance (absolute, in m/z)
+        :param from_peaks: If true, the total ion current is recomputed as the sum of the spectrum
+            intensities (centroids for FTMS scans) instead of using the scan statistics
+        :returns: Tuple of (retention_times, total_ion_current_intensities)
+        """
+        return self.get_tics_ms2([precursor_mz], tolerance, from_peaks)[0]
+
+    def get_tics_ms2(self, precursor_mzs: List[float], tolerance: float=10e-3, from_peaks: bool=False) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Get total ion current in MS2 for many precursor masses. The scans of each precursor are
+        looked up in the scan index sorted by precursor mass, so no scan has to be read unless
+        from_peaks is set.
+        :param precursor_mzs: Precursor masses
+        :param tolerance: Mass tolerance (absolute, in m/z)
+        :param from_peaks: If true, the total ion current is recomputed as the sum of the spectrum
+            intensities (centroids for FTMS scans) instead of using the scan statistics
+        :returns: List with a tuple of (retention_times, total_ion_current_intensities) per precursor mass
+        """
+        precursor_mzs = np.asarray(precursor_mzs, dtype=np.float64)
+        precursor_masses = self._ms2_precursor_index['precursor_mz']
+        starts = np.searchsorted(precursor_masses, precursor_mzs - tolerance, side='left')
+        ends = np.searchsorted(precursor_masses, precursor_mzs + tolerance, side='right')
+
+        tics = list()
+        for start, end in zip(starts, ends):
+            scans = np.sort(self._ms2_precursor_index[start:end], order='scan_number')
+            if from_peaks:
+                tic_intensities = np.array([np.sum(self._get_scan_(int(n))[1]) for n in scans['scan_number']])
+            else:
+                tic_intensities = scans['tic']
+            tics.append((scans['retention_time'], tic_intensities))
+        return tics
+
+    def get_scan_ms1(self, rt: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """
+        Gets MS1 (MS) spectrum for a given retention time value in minutes
+        :param rt: retention time value in minutes
+
+        :returns: Three arrays containing Mass/Charge values, intensity values and charge values as well as the actual retention time
+        """
+        scan_number, found_rt = self.get_ms1_scan_number_from_retention_time(rt)
+        rts, intensities, charges, _ = self.get_scan_from_scan_number(scan_number)
+        return rts, intensities, charges, found_rt
+
+    def get_scan_ms2(self, rt: float, precursor_mz: float=None) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Gets MS2 spectrum for a given retention time value in minutes
+        :param rt: retention time value in minutes
+        :param recursor_mz: Optional precursor mass value to filter spectra
+
+        :returns: Three arrays containing Mass/Charge values, intensity values and charge values as well as the actual retention time
+        """
+        scan_number, found_rt = self.get_ms2_scan_number_from_retention_time(rt, precursor_mz)
+        rts, intensities, charges, _ = self.get_scan_from_scan_number(scan_number)
+        return rts, intensities, charges, found_rt
+
+    def get_scan(self, rt: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, str]:
+        return self.get_scan_from_scan_number(self.get_scan_number_from_retention_time(rt))
+
+
+    def get_retention_time_from_scan_number(self, scan_number: int) -> float:
+        """
+        Get the retention time (in minutes) from a scan number
+        :param scan_number: The number of the scan
+        :returns: Retention time in minutes
+        """
+        if scan_number < self.first_scan or scan_number > self.last_scan:
+            raise ValueError(f'The scan number {scan_number} is out of bounds. Valid range {self.first_scan} - {self.last_scan}.')
+        
+        idx = np.argmin(np.abs(self._scan_numbers - scan_number))
+        return self._retention_times[idx]
+
+    def get_scan_number_from_retention_time(self, rt: float) -> int:
+        """
+        Get the closest scan number from a given retention time (in minutes). If the retention time is smaller than zero
+        this will always return the first scan number and if it is larger than the latest entry it will return the biggest
+        scan number.
+        :param rt: Retention time (in minutes)
+        :returns: Scan number
+        """
+        if rt < 0 or rt > self.total_time_min:
+            raise ValueError(f'The retiontion time {rt} is out of bounds. Valid range 0 - {self.total_time_min}.')
+
+        idx = np.argmin(np.abs(self._retention_times - rt))
+        return int(self._scan_numbers[idx])
+
+    def get_ms1_scan_number_from_retention_time(self, rt: float) -> Tuple[int, float]:
+        """
+        Get the closest scan number in MS1 spectra from a given retention time (in minutes). If the retention time is smaller than zero
+        this will always return the first scan number and if it is larger than the latest entry it will return the biggest
+        scan number.
+        :param rt: Retention time (in minutes)
+        :returns: Scan number
+        """
+        if rt < 0 or rt > self.total_time_min:
+            raise ValueError(f'The retiontion time {rt} is out of bounds. Valid range 0 - {self.total_time_min}.')
+
+        idx = np.argmin(np.abs(self._ms1_retention_times - rt))
+        found_rt = self._ms1_retention_times[idx]
+        found_scan_nr = self._ms1_scan_numbers[idx]
+        return int(found_scan_nr), found_rt
+
+    def get_ms2_scan_number_from_retention_time(self, rt: float, precursor_mz: float=None, tolerance_ppm = 10e-3) -> Tuple[int, float]:
+        """
+        Get the closest scan number in MS2 spectra from a given retention time (in minutes). If the retention time is smaller than zero
+        this will always return the first scan number and if it is larger than the latest entry it will return the biggest
+        scan number.
+        NOTE: This method does not yet support all mass tolerance units
+        :param rt: Retention time (in minutes)
+        :param precursor_mz: Precursor mass
+        :param tolerance: Mass tolerance to precursor (in ppm)
+        :returns: Scan number
+        """
+        if rt < 0 or rt > self.total_time_min:
+            raise ValueError(f'The retiontion time {rt} is out of bounds. Valid range 0 - {self.total_time_min}.')
+
+        if precursor_mz is None:
+            idx = np.argmin(np.abs(self._ms2_retention_times - rt))
+            found_rt = self._ms2_retention_times[idx]
+            found_scan_nr = int(self._ms2_scan_numbers[idx])
+            return found_scan_nr, found_rt
+        else:
+            ms2_idxs = np.abs(self._ms2_filter_masses - precursor_mz) <= tolerance_ppm
+            ms2_scans = self._ms2_filter_scan_numbers[ms2_idxs]
+            ms2_rts = self._retention_times[ms2_scans - self.first_scan]
+            idx = np.argmin(np.abs(ms2_rts - rt))
+            found_rt = ms2_rts[idx]
+            found_scan_nr = int(ms2_scans[idx])
+            return found_scan_nr, found_rt
+
+    def get_scan_event_str_from_scan_number(self, scan_number: int) -> str:
+        """
+        Get the scan event description text from a scan number.
+        :param scan_number: Scan number to retrieve the description from
+        :returns: Scan event description
+        """
+        if scan_number < self.first_scan or scan_number > self.last_scan:
+            raise ValueError(f'The scan number {scan_number} is out of bounds. Valid range {self.first_scan} - {self.last_scan}.')
+        
+        return self._get_scan_event_str_(scan_number)
@@ -0,0 +1,116 @@
+from typing import Optional
+import numpy as np
+import hashlib
+import json
+import os
+import tempfile
+
+
+SIDECAR_EXTENSION = '.fpyidx'
+_MAGIC = b'FPYIDX\n'
+_FORMAT_VERSION = 2
+
+
+def get_sidecar_path(raw_file_path: str, cache_dir: str=None) -> str:
+    """
+    Get the path of the index sidecar file for a raw file. Without cache directory the sidecar
+    is placed next to the raw file (e.g. my_file.raw.fpyidx). With a cache directory the name
+    also contains a hash of the absolute raw file path, so that files with the same name
+    from different folders do not collide.
+
+    :param raw_file_path: Path to the raw file
+    :param cache_dir: Optional central directory for sidecar files
+    :returns: Path to the sidecar file
+    """
+    raw_file_path = os.path.abspath(raw_file_path)
+    if cache_dir is None:
+        return f'{raw_file_path}{SIDECAR_EXTENSION}'
+
+    path_hash = hashlib.sha1(raw_file_path.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f'{os.path.basename(raw_file_path)}-{path_hash}{SIDECAR_EXTENSION}')
+
+
+def get_cache_key(raw_file_path: str, revision: int, modified: str) -> dict:
+    """
+    Create the key which identifies a raw file version. An index is only reused if the key
+    stored with it matches.
+
+    :param raw_file_path: Path to the raw file
+    :param revision: Revision from the raw file header
+    :param modified: Modification information from the raw file header
+    :returns: Key as dictionary
+    """
+    stat = os.stat(raw_file_path)
+    return {
+        'version': _FORMAT_VERSION,
+        'path': os.path.abspath(raw_file_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'revision': revision,
+        'modified': modified,
+    }
+
+
+def load_scan_index(sidecar_path: str, key: dict, dtype: np.dtype) -> Optional[np.ndarray]:
+    """
+    Load a scan index from a sidecar file as read-only memory-mapped array.
+
+    :param sidecar_path: Path to the sidecar file
+    :param key: Expected cache key (see get_cache_key)
+    :param dtype: Expected dtype of the index
+    :returns: The index or None if there is no valid sidecar for the given key
+    """
+    if not os.path.isfile(sidecar_path):
+        return None
+
+    try:
+        with open(sidecar_path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                return None
+            if json.loads(f.readline().decode('utf-8')) != key:
+                return None
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, stored_dtype = np.lib.format.read_array_header_1_0(f)
+            elif version == (2, 0):
+                shape, fortran_order, stored_dtype = np.lib.format.read_array_header_2_0(f)
+            else:
+                return None
+            offset = f.tell()
+    except (OSError, ValueError):
+        return None
+
+    if stored_dtype != dtype or fortran_order or len(shape) != 1:
+        return None
+    if shape[0] == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(sidecar_path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+
+def save_scan_index(sidecar_path: str, key: dict, scan_index: np.ndarray):
+    """
+    Save a scan index to a sidecar file. The file is written to a temporary file first and
+    then moved into place, so concurrent readers never see partially written data. Failing
+    to write the sidecar (e.g. because of a read-only folder) is not considered an error.
+
+    :param sidecar_path: Path to the sidecar file
+    :param key: Cache key (see get_cache_key)
+    :param scan_index: The index to store
+    """
+    folder = os.path.dirname(sidecar_path)
+    try:
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=SIDECAR_EXTENSION)
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(json.dumps(key).encode('utf-8') + b'\n')
+            np.lib.format.write_array(f, np.ascontiguousarray(scan_index), allow_pickle=False)
+        os.replace(tmp_path, sidecar_path)
+    except OSError:
+        if os.path.isfile(tmp_path):
+            os.remove(tmp_path)
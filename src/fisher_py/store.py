@@ -0,0 +1,411 @@
+"""
+Chunked, compressed store of the spectra of a raw file. write_store converts a raw file once
+(this needs the .NET runtime), SpectralStore then reads the spectra, the scan index, the
+trailer extra values and the status log from the store without it:
+
+    write_store('my_file.raw', 'my_file.fpystore')
+
+    with SpectralStore('my_file.fpystore') as store:
+        masses, intensities, charges, filter_string = store.get_scan_from_scan_number(1)
+
+The peaks of all scans are packed into flat arrays (as with RawFileAccess.read_scans) and
+split into chunks of scans, which are compressed individually, so reading a scan only
+decompresses its chunk. Two container formats are supported: 'directory' (a directory of
+NumPy files, no further dependencies) and 'hdf5' (a single HDF5 file, requires h5py).
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Tuple
+from fisher_py.scan_index import ScanIndexReader, get_ms_order_of_filter
+from fisher_py.xic_index import XicIndex
+from fisher_py.lru_cache import LruCache
+from fisher_py.data import ToleranceUnits
+from fisher_py.data.business import TraceType, GenericDataTypes
+from fisher_py.raw_file_reader.data_model.trailer_table import TrailerTable
+from fisher_py.raw_file_reader.data_model.status_log_table import StatusLogTable
+import numpy as np
+import json
+import os
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+FORMAT_VERSION = 1
+FORMATS = ('directory', 'hdf5')
+DEFAULT_CHUNK_SIZE = 256
+DEFAULT_CHUNK_CACHE_SIZE = 64 * 1024**2
+
+_META_FILE_NAME = 'meta.json'
+_PEAK_ARRAY_NAMES = ('masses', 'intensities', 'charges')
+
+
+class _DirectoryContainer(object):
+    """
+    Arrays stored as NumPy files in a directory. Compressed groups of arrays are stored as one
+    .npz file, uncompressed ones as .npy files which are memory-mapped when read.
+    """
+
+    def __init__(self, path: str, writable: bool=False):
+        self._path = path
+        if writable:
+            os.makedirs(path, exist_ok=True)
+
+    def write_meta(self, meta: dict):
+        with open(os.path.join(self._path, _META_FILE_NAME), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    def read_meta(self) -> dict:
+        with open(os.path.join(self._path, _META_FILE_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def write_arrays(self, name: str, arrays: Dict[str, np.ndarray], compress: bool):
+        path = os.path.join(self._path, name)
+        if compress:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            np.savez_compressed(f'{path}.npz', **arrays)
+        else:
+            os.makedirs(path, exist_ok=True)
+            for key, values in arrays.items():
+                np.save(os.path.join(path, f'{key}.npy'), values)
+
+    def read_arrays(self, name: str) -> Dict[str, np.ndarray]:
+        path = os.path.join(self._path, name)
+        if os.path.isfile(f'{path}.npz'):
+            with np.load(f'{path}.npz') as arrays:
+                return {key: arrays[key] for key in arrays.files}
+        return {file_name[:-4]: np.load(os.path.join(path, file_name), mmap_mode='r') for file_name in os.listdir(path) if file_name.endswith('.npy')}
+
+    def close(self):
+        pass
+
+
+class _Hdf5Container(object):
+    """
+    Arrays stored as datasets of an HDF5 file (one group per group of arrays). Compressed
+    datasets use gzip, text arrays are stored UTF-8 encoded.
+    """
+
+    def __init__(self, path: str, writable: bool=False):
+        if h5py is None:
+            raise ImportError('The HDF5 store format requires h5py, install it with "pip install h5py".')
+        self._file = h5py.File(path, 'w' if writable else 'r')
+
+    def write_meta(self, meta: dict):
+        self._file.attrs['meta'] = json.dumps(meta)
+
+    def read_meta(self) -> dict:
+        return json.loads(self._file.attrs['meta'])
+
+    def write_arrays(self, name: str, arrays: Dict[str, np.ndarray], compress: bool):
+        group = self._file.create_group(name)
+        for key, values in arrays.items():
+            is_text = values.dtype.kind == 'U'
+            data = np.char.encode(values, 'utf-8') if is_text else values
+            dataset = group.create_dataset(key, data=data, compression='gzip' if compress and data.size > 0 else None)
+            dataset.attrs['text'] = is_text
+
+    def read_arrays(self, name: str) -> Dict[str, np.ndarray]:
+        arrays = dict()
+        for key, dataset in self._file[name].items():
+            values = dataset[()]
+            arrays[key] = np.char.decode(values, 'utf-8') if dataset.attrs['text'] else values
+        return arrays
+
+    def close(self):
+        self._file.close()
+
+
+def _open_container(path: str, store_format: str, writable: bool=False):
+    if store_format == 'directory':
+        return _DirectoryContainer(path, writable)
+    elif store_format == 'hdf5':
+        return _Hdf5Container(path, writable)
+    raise ValueError(f'Unknown store format "{store_format}", use one of {FORMATS}.')
+
+
+def _get_chunk_name(chunk_index: int) -> str:
+    return f'peaks/{chunk_index:06d}'
+
+
+def _log_table_to_arrays(table) -> Tuple[Dict[str, np.ndarray], dict]:
+    # labels can contain any character, so the columns (and masks of values which could not be parsed) are stored by position
+    arrays = {f'c{i}': column for i, column in enumerate(table.columns.values())}
+    arrays.update({f'm{i}': table.missing[label] for i, label in enumerate(table.labels) if label in table.missing})
+    meta = {'labels': table.labels, 'data_types': [table.data_types[label].value for label in table.labels]}
+    return arrays, meta
+
+
+def _arrays_to_log_columns(arrays: Dict[str, np.ndarray], meta: dict) -> Tuple[Dict[str, np.ndarray], Dict[str, GenericDataTypes], Dict[str, np.ndarray]]:
+    columns = {label: np.asarray(arrays[f'c{i}']) for i, label in enumerate(meta['labels'])}
+    data_types = {label: GenericDataTypes(value) for label, value in zip(meta['labels'], meta['data_types'])}
+    missing = {label: np.asarray(arrays[f'm{i}']) for i, label in enumerate(meta['labels']) if f'm{i}' in arrays}
+    return columns, data_types, missing
+
+
+def write_store(raw_file_path: str, path: str, store_format: str='directory', chunk_size: int=DEFAULT_CHUNK_SIZE, compress: bool=True, centroids: bool=True) -> int:
+    """
+    Convert a raw file into a store (requires the .NET runtime)
+    :param raw_file_path: Path to the raw file
+    :param path: Path of the store (a directory for the 'directory' format, a file for 'hdf5')
+    :param store_format: 'directory' or 'hdf5' (requires h5py)
+    :param chunk_size: Number of scans per compressed chunk of peaks
+    :param compress: If true, the chunks of peaks and the log tables are compressed
+    :param centroids: If true, the centroid stream is stored for scans which have one (otherwise the segmented scan data)
+    :returns: Number of scans written
+    """
+    from fisher_py.raw_file import RawFile
+    from fisher_py.raw_file_reader import RawFileReaderAdapter
+    from fisher_py.data import Device
+
+    assert chunk_size > 0
+    scan_index = RawFile(raw_file_path, spectrum_cache_size=0).scan_index
+
+    with RawFileReaderAdapter.file_factory(raw_file_path) as access:
+        access.select_instrument(Device.MS, 1)
+        first_scan_number = access.run_header.first_spectrum
+        last_scan_number = access.run_header.last_spectrum
+
+        container = _open_container(path, store_format, writable=True)
+        try:
+            # offsets of the scans within the (virtual) concatenation of all chunks
+            offsets = np.zeros(last_scan_number - first_scan_number + 2, dtype=np.int64)
+            for chunk_index, start in enumerate(range(first_scan_number, last_scan_number + 1, chunk_size)):
+                end = min(start + chunk_size - 1, last_scan_number)
+                packed = access.read_scans(start, end, prefer_centroids=centroids)
+                container.write_arrays(_get_chunk_name(chunk_index), dict(zip(_PEAK_ARRAY_NAMES, (packed.masses, packed.intensities, packed.charges))), compress)
+
+                position = start - first_scan_number
+                offsets[position + 1:position + len(packed) + 1] = offsets[position] + packed.offsets[1:]
+
+            event_table = access.get_scan_event_table(first_scan_number, last_scan_number)
+            container.write_arrays('scans', {'scan_index': scan_index, 'offsets': offsets, 'filter_ids': event_table.filter_ids}, compress=False)
+
+            trailer_arrays, trailer_meta = _log_table_to_arrays(access.trailer_table())
+            container.write_arrays('trailer', trailer_arrays, compress)
+
+            status_log = access.status_log_table()
+            status_log_arrays, status_log_meta = _log_table_to_arrays(status_log)
+            status_log_arrays['retention_times'] = status_log.retention_times
+            container.write_arrays('status_log', status_log_arrays, compress)
+
+            container.write_meta({
+                'format_version': FORMAT_VERSION,
+                'source': os.path.basename(raw_file_path),
+                'first_scan': first_scan_number,
+                'last_scan': last_scan_number,
+                'total_time_min': access.run_header.end_time,
+                'chunk_size': chunk_size,
+                'centroids': centroids,
+                'filter_strings': event_table.filter_strings,
+                'trailer': trailer_meta,
+                'status_log': status_log_meta,
+            })
+        finally:
+            container.close()
+
+    return last_scan_number - first_scan_number + 1
+
+
+class SpectralStore(ScanIndexReader):
+    """
+    Reads a store created with write_store. Supports the scan, retention time, chromatogram
+    and TIC lookups of RawFile without the .NET runtime. Decompressed chunks of peaks are kept
+    in a cache, so reading neighbouring scans only decompresses their chunk once.
+    """
+
+    @property
+    def path(self) -> str:
+        """
+        Path of the store
+        """
+        return self._path
+
+    @property
+    def number_of_scans(self) -> int:
+        """
+        Number of scans / spectra
+        """
+        return len(self._scan_index)
+
+    @property
+    def first_scan(self) -> int:
+        """
+        First scan number
+        """
+        return self._meta['first_scan']
+
+    @property
+    def last_scan(self) -> int:
+        """
+        Last scan number
+        """
+        return self._meta['last_scan']
+
+    @property
+    def total_time_min(self) -> float:
+        """
+        Total time of experiment in minutes
+        """
+        return self._meta['total_time_min']
+
+    @property
+    def chunk_cache(self) -> LruCache:
+        """
+        Cache of decompressed chunks of peaks (see LruCache for hit/miss statistics)
+        """
+        return self._chunk_cache
+
+    def __init__(self, path: str, chunk_cache_size: int=DEFAULT_CHUNK_CACHE_SIZE):
+        """
+        Opens a store
+        :param path: Path of the store (directory or HDF5 file)
+        :param chunk_cache_size: Byte budget of the cache for decompressed chunks (0 disables the cache)
+        """
+        self._path = path
+        self._container = _open_container(path, 'directory' if os.path.isdir(path) else 'hdf5')
+        self._meta = self._container.read_meta()
+        if self._meta.get('format_version') != FORMAT_VERSION:
+            self._container.close()
+            raise ValueError(f'The store {path} has format version {self._meta.get("format_version")}, expected {FORMAT_VERSION}.')
+
+        scans = self._container.read_arrays('scans')
+        self._offsets = scans['offsets']
+        self._filter_ids = scans['filter_ids']
+        self._chunk_size = self._meta['chunk_size']
+        self._chunk_cache = LruCache(chunk_cache_size, lambda chunk: sum(a.nbytes for a in chunk))
+        self._xic_indices = dict()
+        self._set_scan_index_(scans['scan_index'])
+
+    def _read_chunk_(self, chunk_index: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        arrays = self._container.read_arrays(_get_chunk_name(chunk_index))
+        return tuple(arrays[name] for name in _PEAK_ARRAY_NAMES)
+
+    def _get_chunk_(self, chunk_index: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        chunk = self._chunk_cache.get(chunk_index)
+        if chunk is None:
+            chunk = self._read_chunk_(chunk_index)
+
+            # arrays are shared with the cache and therefore must not be modified
+            for array in chunk:
+                array.setflags(write=False)
+            self._chunk_cache.put(chunk_index, chunk)
+        return chunk
+
+    def _get_scan_(self, scan_number: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        position = scan_number - self.first_scan
+        chunk_index = position // self._chunk_size
+        chunk_offset = self._offsets[chunk_index * self._chunk_size]
+        start, end = self._offsets[position] - chunk_offset, self._offsets[position + 1] - chunk_offset
+        return tuple(array[start:end] for array in self._get_chunk_(chunk_index))
+
+    def _get_scan_event_str_(self, scan_number: int) -> str:
+        return self._meta['filter_strings'][self._filter_ids[scan_number - self.first_scan]]
+
+    def get_scan_from_scan_number(self, scan_number: int, copy: bool=True) -> Tuple[np.ndarray, np.ndarray, np.ndarray, str]:
+        """
+        Get scan data from a scan number. The data returned is structured in a tuple as follows:
+            (masses, intensities, ion_charges, scan_event_descriptions)
+
+        :param scan_number: The number of the scan
+        :param copy: If false, the arrays are views of the cached chunk (no copy) and are therefore read-only
+        :returns: Tuple organized as (masses, intensities, ion_charges, scan_event_descriptions)
+        """
+        if scan_number < self.first_scan or scan_number > self.last_scan:
+            raise ValueError(f'The scan number {scan_number} is out of bounds. Valid range {self.first_scan} - {self.last_scan}.')
+
+        spectrum = self._get_scan_(scan_number)
+        positions, intensities, charges = (array.copy() for array in spectrum) if copy else spectrum
+        return positions, intensities, charges, self._get_scan_event_str_(scan_number)
+
+    def get_xic_index(self, ms_filter: str='ms') -> XicIndex:
+        """
+        Gets the XIC index over the peaks of all scans of an MS order. The index is built from
+        the stored peaks on first use and kept in memory.
+        :param ms_filter: MS order of the scans as filter (ms, ms2, ..., ms10)
+        :returns: The index
+        """
+        ms_order = get_ms_order_of_filter(ms_filter)
+        xic_index = self._xic_indices.get(ms_order)
+        if xic_index is None:
+            is_selected = self._scan_index['ms_order'] == ms_order.value
+            positions = np.flatnonzero(is_selected)
+            peak_counts = np.diff(self._offsets)
+
+            # chunks are read directly (not through the cache, as every chunk is only needed once)
+            masses, intensities = list(), list()
+            for chunk_index in np.unique(positions // self._chunk_size).tolist():
+                start = chunk_index * self._chunk_size
+                end = min(start + self._chunk_size, len(self._scan_index))
+                peak_mask = np.repeat(is_selected[start:end], peak_counts[start:end])
+                chunk_masses, chunk_intensities, _ = self._read_chunk_(chunk_index)
+                masses.append(chunk_masses[peak_mask])
+                intensities.append(chunk_intensities[peak_mask])
+
+            xic_index = XicIndex.from_peaks(self._scan_numbers[positions], self._retention_times[positions], np.concatenate(masses + [np.empty(0)]),
+                                            np.concatenate(intensities + [np.empty(0)]), peak_counts[positions])
+            self._xic_indices[ms_order] = xic_index
+        return xic_index
+
+    def get_chromatogram(self, mz: float, tolerance: float, trace_type: TraceType=TraceType.MassRange, tolerance_units: ToleranceUnits=ToleranceUnits.ppm, ms_filter: str='ms') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gets chromatogram. Mass range chromatograms are extracted from the XIC index of the MS order
+        (see get_xic_index), TIC and base peak chromatograms are taken from the scan statistics.
+        :param mz: Mass/Charge value for mass range chromatogram
+        :param tolerance: Tolerance for mass range chromatogram
+        :param trace_type: Type of chromatogram (BasePeak, TIC (total ion current), MassRange (XIC))
+        :param tolerance_units: Units of the mass tolerance (ppm by default)
+        :param ms_filter: MS order of the scans as filter (ms, ms2, ..., ms10)
+        :returns: array containing retention times and array containing intensity values
+        """
+        if trace_type == TraceType.MassRange:
+            retention_times, intensities = self.get_xic_index(ms_filter).extract([mz], tolerance, tolerance_units)
+            return retention_times, intensities[0]
+
+        scans = self._scan_index[self._scan_index['ms_order'] == get_ms_order_of_filter(ms_filter).value]
+        if trace_type == TraceType.TIC:
+            return scans['retention_time'], scans['tic']
+        elif trace_type == TraceType.BasePeak:
+            return scans['retention_time'], scans['base_peak_intensity']
+        raise ValueError(f'The trace type {trace_type} is not supported by the store.')
+
+    def get_chromatograms(self, mzs: List[float], tolerance: float, tolerance_units: ToleranceUnits=ToleranceUnits.ppm, ms_filter: str='ms') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gets the mass range chromatograms (XICs) of many targets from the XIC index of the MS order
+        :param mzs: Mass/Charge values of the targets
+        :param tolerance: Tolerance of the mass ranges
+        :param tolerance_units: Units of the mass tolerance (ppm by default)
+        :param ms_filter: MS order of the scans as filter (ms, ms2, ..., ms10)
+        :returns: array containing the retention times shared by all chromatograms and matrix of shape (len(mzs), len(retention_times)) containing the intensity values
+        """
+        return self.get_xic_index(ms_filter).extract(mzs, tolerance, tolerance_units)
+
+    def trailer_table(self) -> TrailerTable:
+        """
+        Gets the trailer extra values of all scans (see RawFileAccess.trailer_table)
+        :returns: The trailer table
+        """
+        columns, data_types, missing = _arrays_to_log_columns(self._container.read_arrays('trailer'), self._meta['trailer'])
+        return TrailerTable(np.asarray(self._scan_numbers), columns, data_types, missing)
+
+    def status_log_table(self) -> StatusLogTable:
+        """
+        Gets the status log (see RawFileAccess.status_log_table)
+        :returns: The status log table
+        """
+        arrays = self._container.read_arrays('status_log')
+        columns, data_types, missing = _arrays_to_log_columns(arrays, self._meta['status_log'])
+        return StatusLogTable(np.asarray(arrays['retention_times']), columns, data_types, missing)
+
+    def close(self):
+        """
+        Close the store
+        """
+        self._container.close()
+
+    def __enter__(self) -> SpectralStore:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
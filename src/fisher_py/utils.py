@@ -1,15 +1,24 @@
 from typing import Any, List
 from datetime import datetime
+from fisher_py.net_wrapping.runtime import load_runtime
+import numpy as np
+
+load_runtime()
 import clr
 
 clr.AddReference('System')
-from System import DateTime, Double, Array
+from System import DateTime, Double, Single, Array, IntPtr, Int16, Int32, Int64
+from System.Runtime.InteropServices import Marshal
 import System.Collections.Generic as generic
 
 def is_number(arg: Any) -> bool:
     return type(arg) is int or type(arg) is float
 
 
+def is_array_like(arg: Any) -> bool:
+    return type(arg) is list or isinstance(arg, np.ndarray)
+
+
 def datetime_net_to_py(net_date_time: DateTime) -> datetime:
     """
     Convert .NET DateTime to python datetime
@@ -26,12 +35,13 @@ def datetime_py_to_net(py_date_time: datetime) -> DateTime:
 
 def to_net_list(py_list: List[Any], t) -> Any:
     """
-    Convert to .NET list
+    Convert to .NET list. Numeric values (numpy arrays or lists of numbers) are copied
+    as one block if t is a numeric type (float, int or a .NET primitive like Double).
     """
-    if type(t) is float:
-        t = Double
+    net_array = _to_net_numeric_array(py_list, t)
+    if net_array is not None:
+        return generic.List[t](net_array)
 
-    # return generic.List[t](py_list)
     net_list = generic.List[t]()
     for item in py_list:
         net_list.Add(item)
@@ -39,10 +49,12 @@ def to_net_list(py_list: List[Any], t) -> Any:
 
 def to_net_array(py_list: list, t) -> Any:
     """
-    Convert to .NET array
+    Convert to .NET array. Numeric values (numpy arrays or lists of numbers) are copied
+    as one block if t is a numeric type (float, int or a .NET primitive like Double).
     """
-    if type(t) is float:
-        t = Double
+    net_array = _to_net_numeric_array(py_list, t)
+    if net_array is not None:
+        return net_array
 
     net_array = Array[t](len(py_list))
     for i, item in enumerate(py_list):
@@ -50,5 +62,81 @@ def to_net_array(py_list: list, t) -> Any:
     return net_array
 
 
+def _to_net_numeric_array(values: Any, t) -> Any:
+    dtype = _numpy_types_of_net_types.get(t)
+    if dtype is None:
+        return None
+
+    values = np.asarray(values)
+
+    # no implicit float to int conversion and no flattening of nested values (the
+    # element-wise path raises in these cases)
+    if values.ndim != 1 or values.dtype.kind not in 'iuf' or not np.can_cast(values.dtype, dtype, 'same_kind'):
+        return None
+
+    # integers which do not fit the target type must not wrap around (the element-wise path raises)
+    if values.dtype.kind in 'iu' and np.dtype(dtype).kind in 'iu' and len(values) > 0:
+        limits = np.iinfo(dtype)
+        if values.min() < limits.min or values.max() > limits.max:
+            return None
+
+    values = np.ascontiguousarray(values, dtype=dtype)
+    net_array = Array[t](len(values))
+    if len(values) == 0:
+        return net_array
+
+    # pythonnet >= 3 exposes primitive arrays as writable buffers
+    try:
+        np.frombuffer(memoryview(net_array), dtype=dtype)[:] = values
+    except TypeError:
+        Marshal.Copy(IntPtr(Int64(values.ctypes.data)), net_array, 0, len(values))
+    return net_array
+
+
 def to_py_list(net_list) -> list:
     return [i for i in net_list]
+
+
+_net_to_numpy_types = {
+    'System.Double': np.float64,
+    'System.Single': np.float32,
+    'System.Int16': np.int16,
+    'System.Int32': np.int32,
+    'System.Int64': np.int64,
+}
+
+_numpy_types_of_net_types = {
+    float: np.float64,
+    int: np.int32,
+    Double: np.float64,
+    Single: np.float32,
+    Int16: np.int16,
+    Int32: np.int32,
+    Int64: np.int64,
+}
+
+
+def to_numpy_array(net_array, dtype=np.float64) -> np.ndarray:
+    """
+    Convert .NET array of primitive values (e.g. double[]) to numpy array. The data is
+    copied as one block instead of crossing the .NET boundary for every element.
+    """
+    if net_array is None:
+        return np.empty(0, dtype=dtype)
+
+    # pythonnet >= 3 exposes primitive arrays through the buffer protocol
+    try:
+        return np.array(memoryview(net_array), dtype=dtype)
+    except TypeError:
+        pass
+
+    # older pythonnet versions: copy into a preallocated buffer from the .NET side
+    length = net_array.Length
+    native_dtype = _net_to_numpy_types.get(net_array.GetType().GetElementType().FullName)
+    if native_dtype is None:
+        return np.fromiter(net_array, dtype=dtype, count=length)
+
+    result = np.empty(length, dtype=native_dtype)
+    if length > 0:
+        Marshal.Copy(net_array, 0, IntPtr(Int64(result.ctypes.data)), length)
+    return result.astype(dtype, copy=False)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from fisher_py.data import ToleranceUnits
+import numpy as np
+import json
+import os
+
+if TYPE_CHECKING:
+    from fisher_py.raw_file_reader import RawFileAccess
+    from fisher_py.raw_file_reader.data_model import PackedScans
+
+
+_ARRAY_NAMES = ('scan_numbers', 'retention_times', 'masses', 'intensities', 'scan_positions')
+_KEY_FILE_NAME = 'key.json'
+
+
+class XicIndex(object):
+    """
+    Index over the centroids of a set of scans for extracting mass range chromatograms (XICs)
+    without the raw file. All peaks are sorted by m/z, so the peaks of a mass range are found
+    with searchsorted and the cost of an extraction depends on the number of matching peaks
+    rather than on the number of scans.
+
+    The results equal the mass range chromatograms of the raw file reader (sum of the
+    centroid intensities within the range of each scan) apart from peaks lying exactly on a
+    range boundary, where rounding of the range limits can differ.
+    """
+
+    def __init__(self, scan_numbers: np.ndarray, retention_times: np.ndarray, masses: np.ndarray, intensities: np.ndarray, scan_positions: np.ndarray):
+        """
+        Create index from peaks which are already sorted by m/z
+        :param scan_numbers: Numbers of the indexed scans (ascending)
+        :param retention_times: Retention times of the indexed scans
+        :param masses: Masses of all peaks (ascending)
+        :param intensities: Intensities of all peaks
+        :param scan_positions: Position of the scan of each peak within scan_numbers
+        """
+        self.scan_numbers = scan_numbers
+        self.retention_times = retention_times
+        self.masses = masses
+        self.intensities = intensities
+        self.scan_positions = scan_positions
+
+    def __len__(self) -> int:
+        return len(self.masses)
+
+    @staticmethod
+    def from_packed_scans(packed_scans: List[PackedScans]) -> XicIndex:
+        """
+        Create index from packed spectra (see RawFileAccess.read_scans)
+        :param packed_scans: Packed spectra of the scans to index (in scan order)
+        :returns: The index
+        """
+        scan_numbers = np.concatenate([p.scan_numbers for p in packed_scans] + [np.empty(0, dtype=np.int32)])
+        retention_times = np.concatenate([p.retention_times for p in packed_scans] + [np.empty(0)])
+        masses = np.concatenate([p.masses for p in packed_scans] + [np.empty(0)])
+        intensities = np.concatenate([p.intensities for p in packed_scans] + [np.empty(0)])
+        peak_counts = np.concatenate([p.peak_counts for p in packed_scans] + [np.empty(0, dtype=np.int64)])
+        return XicIndex.from_peaks(scan_numbers, retention_times, masses, intensities, peak_counts)
+
+    @staticmethod
+    def from_peaks(scan_numbers: np.ndarray, retention_times: np.ndarray, masses: np.ndarray, intensities: np.ndarray, peak_counts: np.ndarray) -> XicIndex:
+        """
+        Create index from the concatenated peaks of a set of scans
+        :param scan_numbers: Numbers of the scans (ascending)
+        :param retention_times: Retention times of the scans
+        :param masses: Masses of the peaks of all scans (in scan order)
+        :param intensities: Intensities of the peaks of all scans
+        :param peak_counts: Number of peaks of each scan
+        :returns: The index
+        """
+        scan_positions = np.repeat(np.arange(len(scan_numbers), dtype=np.int32), peak_counts)
+        order = np.argsort(masses, kind='stable')
+        return XicIndex(scan_numbers, retention_times, masses[order], intensities[order], scan_positions[order])
+
+    @staticmethod
+    def build(raw_file_access: RawFileAccess, scan_numbers: np.ndarray, chunk_size: int=1000) -> XicIndex:
+        """
+        Read the centroids of a set of scans and index them
+        :param raw_file_access: Raw file access with selected MS device
+        :param scan_numbers: Numbers of the scans to index (ascending)
+        :param chunk_size: Maximum number of scans read at once
+        :returns: The index
+        """
+        scan_numbers = np.asarray(scan_numbers, dtype=np.int32)
+
+        # consecutive scans are read as one block
+        runs = np.split(scan_numbers, np.flatnonzero(np.diff(scan_numbers) != 1) + 1) if len(scan_numbers) > 0 else []
+        packed_scans = list()
+        for run in runs:
+            for start in range(0, len(run), chunk_size):
+                chunk = run[start:start + chunk_size]
+                packed_scans.append(raw_file_access.read_scans(int(chunk[0]), int(chunk[-1])))
+        return XicIndex.from_packed_scans(packed_scans)
+
+    def save(self, directory: str, key: dict=None):
+        """
+        Store index as one .npy file per array
+        :param directory: Target directory (created if needed)
+        :param key: Optional key identifying the source of the index (JSON serializable, see load)
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        # the key is written last, so that an interrupted save does not leave a valid index behind
+        key_path = os.path.join(directory, _KEY_FILE_NAME)
+        if os.path.exists(key_path):
+            os.remove(key_path)
+
+        for name in _ARRAY_NAMES:
+            np.save(os.path.join(directory, f'{name}.npy'), getattr(self, name))
+        if key is not None:
+            with open(key_path, 'w', encoding='utf-8') as f:
+                json.dump(key, f)
+
+    @staticmethod
+    def load(directory: str, memory_map: bool=True, key: dict=None) -> Optional[XicIndex]:
+        """
+        Load index stored with save
+        :param directory: Directory of the index
+        :param memory_map: If true, the arrays are memory-mapped (read-only) instead of loaded
+        :param key: Optional expected key, the index is only loaded if it was saved with the same key
+        :returns: The index (None if the key does not match)
+        """
+        if key is not None and XicIndex._load_key_(directory) != key:
+            return None
+
+        mmap_mode = 'r' if memory_map else None
+        return XicIndex(*[np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode) for name in _ARRAY_NAMES])
+
+    @staticmethod
+    def _load_key_(directory: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(directory, _KEY_FILE_NAME), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def extract(self, mzs: np.ndarray, tolerance: float, tolerance_units: ToleranceUnits=ToleranceUnits.ppm) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extract the mass range chromatograms of many targets
+        :param mzs: Mass/Charge values of the targets
+        :param tolerance: Tolerance of the mass ranges
+        :param tolerance_units: Units of the mass tolerance (ppm by default)
+        :returns: array containing the retention times of the indexed scans and matrix of shape (len(mzs), len(retention_times)) containing the intensity values
+        """
+        mzs = np.atleast_1d(np.asarray(mzs, dtype=np.float64))
+        if tolerance_units == ToleranceUnits.ppm:
+            deltas = mzs * tolerance * 1e-6
+        elif tolerance_units == ToleranceUnits.mmu:
+            deltas = np.full(len(mzs), tolerance * 1e-3)
+        else:
+            deltas = np.full(len(mzs), float(tolerance))
+
+        starts = np.searchsorted(self.masses, mzs - deltas, side='left')
+        ends = np.searchsorted(self.masses, mzs + deltas, side='right')
+        counts = np.maximum(ends - starts, 0)
+
+        # indices of all matching peaks, grouped by target
+        targets = np.repeat(np.arange(len(mzs)), counts)
+        peaks = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - starts, counts)
+
+        scan_count = len(self.scan_numbers)
+        cells = targets * scan_count + self.scan_positions[peaks]
+        intensities = np.bincount(cells, weights=self.intensities[peaks], minlength=len(mzs) * scan_count)
+        return np.asarray(self.retention_times), intensities.reshape(len(mzs), scan_count)
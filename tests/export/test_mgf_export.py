@@ -0,0 +1,54 @@
+from fisher_py.export.mgf import MgfSpectrum, MgfWriter, format_peaks, write_mgf
+from fisher_py.raw_file_reader import RawFileAccess
+from fisher_py.data import Device
+from tests import path_for
+import numpy as np
+import io
+
+TEST_FILE = 'Angiotensin_325-CID.raw'
+
+
+def test_format_peaks_formats_all_peaks():
+    assert format_peaks(np.array([100.0, 200.123456]), np.array([1.0, 2.5])) == '100.00000 1.000\n200.12346 2.500\n'
+    assert format_peaks(np.array([]), np.array([])) == ''
+
+def test_mgf_writer_writes_spectrum():
+    output = io.StringIO()
+    with MgfWriter(output) as writer:
+        writer.write(MgfSpectrum(5, 1.0, np.array([100.0]), np.array([10.0]), precursor_mz=500.5, charge=2))
+
+    assert output.getvalue() == 'BEGIN IONS\nTITLE=controllerType=0 controllerNumber=1 scan=5\nSCANS=5\nRTINSECONDS=60.0\nPEPMASS=500.5\nCHARGE=2+\n100.00000 10.000\nEND IONS\n'
+
+def test_write_mgf_exports_all_ms2_spectra():
+    output = io.StringIO()
+    assert write_mgf(path_for(TEST_FILE), output) == 10
+
+    content = output.getvalue()
+    assert content.count('BEGIN IONS') == 10
+    assert content.count('END IONS') == 10
+    assert content.count('PEPMASS=325.0\n') == 10
+
+    # segmented scan data as is (as in ThermoRawFileParser without native peak picking)
+    access = RawFileAccess(path_for(TEST_FILE))
+    access.select_instrument(Device.MS, 1)
+    access.include_reference_and_exception_data = True
+    segmented_scan = access.get_segmented_scan_from_scan_number(1, access.get_scan_stats_for_scan_number(1))
+    assert _count_peaks_of_first_spectrum(content) == segmented_scan.position_count
+
+def test_write_mgf_can_export_centroids():
+    output = io.StringIO()
+    write_mgf(path_for(TEST_FILE), output, centroids=True)
+
+    access = RawFileAccess(path_for(TEST_FILE))
+    access.select_instrument(Device.MS, 1)
+    assert _count_peaks_of_first_spectrum(output.getvalue()) == access.get_centroid_stream(1, False).length
+
+def _count_peaks_of_first_spectrum(content: str) -> int:
+    first_spectrum = content.split('END IONS')[0]
+    return len([l for l in first_spectrum.splitlines() if l[0].isdigit()])
+
+def test_write_mgf_output_is_independent_of_workers():
+    single_threaded, multi_threaded = io.StringIO(), io.StringIO()
+    write_mgf(path_for(TEST_FILE), single_threaded)
+    write_mgf(path_for(TEST_FILE), multi_threaded, workers=3)
+    assert single_threaded.getvalue() == multi_threaded.getvalue()
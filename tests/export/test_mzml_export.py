@@ -0,0 +1,103 @@
+from fisher_py.export.mzml import MzmlSpectrum, MzmlWriter, encode_binary_array, write_mzml, _read_precursor
+from fisher_py.export._common import get_trailer_indices
+from fisher_py.data.filter_enums import MsOrderType
+from fisher_py.raw_file_reader import RawFileAccess
+from fisher_py.data import Device
+from tests import path_for
+import xml.etree.ElementTree as ElementTree
+import numpy as np
+import hashlib
+import base64
+import zlib
+import re
+import io
+
+TEST_FILE = 'Angiotensin_325-CID.raw'
+NAMESPACE = {'mzml': 'http://psi.hupo.org/ms/mzml'}
+
+
+def test_encode_binary_array_zlib():
+    values = np.array([1.0, 2.0, 3.0])
+    text, accession, _ = encode_binary_array(values)
+    assert accession == 'MS:1000574'
+    assert np.array_equal(np.frombuffer(zlib.decompress(base64.b64decode(text)), dtype='<f8'), values)
+
+def test_mzml_writer_writes_index_and_checksum():
+    output = io.BytesIO()
+    with MzmlWriter(output, 1) as writer:
+        writer.write_spectrum(MzmlSpectrum(7, 1, 1.5, np.array([100.0, 200.0]), np.array([1.0, 2.0])))
+
+    content = output.getvalue()
+    offset = int(re.search(rb'<offset idRef="controllerType=0 controllerNumber=1 scan=7">(\d+)</offset>', content).group(1))
+    assert content[offset:].startswith(b'<spectrum index="0" id="controllerType=0 controllerNumber=1 scan=7"')
+
+    index_list_offset = int(re.search(rb'<indexListOffset>(\d+)</indexListOffset>', content).group(1))
+    assert content[index_list_offset:].startswith(b'<indexList count="1">')
+
+    checksum_end = content.index(b'<fileChecksum>') + len(b'<fileChecksum>')
+    assert content[checksum_end:checksum_end + 40].decode() == hashlib.sha1(content[:checksum_end]).hexdigest()
+    ElementTree.fromstring(content)
+
+def test_mzml_writer_offsets_are_relative_to_document_start():
+    output = io.BytesIO()
+    output.write(b'preamble')
+    with MzmlWriter(output, 1, ms_orders=[1]) as writer:
+        writer.write_spectrum(MzmlSpectrum(7, 1, 1.5, np.array([100.0, 200.0]), np.array([1.0, 2.0])))
+
+    content = output.getvalue()[len(b'preamble'):]
+    offset = int(re.search(rb'<offset idRef="controllerType=0 controllerNumber=1 scan=7">(\d+)</offset>', content).group(1))
+    assert content[offset:].startswith(b'<spectrum index="0"')
+    index_list_offset = int(re.search(rb'<indexListOffset>(\d+)</indexListOffset>', content).group(1))
+    assert content[index_list_offset:].startswith(b'<indexList count="1">')
+
+    file_content = ElementTree.fromstring(content).find('.//mzml:fileContent', NAMESPACE)
+    assert [p.get('accession') for p in file_content] == ['MS:1000579']
+
+def test_spectra_without_reaction_are_written_without_precursor():
+    class ScanEventWithoutReaction:
+        ms_order = MsOrderType.Ms2
+
+        def get_reaction(self, index):
+            raise IndexError(index)
+
+    access = RawFileAccess(path_for(TEST_FILE))
+    access.select_instrument(Device.MS, 1)
+    spectrum = MzmlSpectrum(1, 2, 0.5, np.array([100.0]), np.array([1.0]))
+    _read_precursor(access, spectrum, ScanEventWithoutReaction(), get_trailer_indices(access))
+    assert spectrum.selected_ion_mz is None
+
+    output = io.BytesIO()
+    with MzmlWriter(output, 1) as writer:
+        writer.write_spectrum(spectrum)
+    assert b'<precursorList' not in output.getvalue()
+
+def test_write_mzml_exports_all_spectra():
+    output = io.BytesIO()
+    assert write_mzml(path_for(TEST_FILE), output) == 10
+
+    root = ElementTree.fromstring(output.getvalue())
+    spectra = root.findall('.//mzml:spectrum', NAMESPACE)
+    assert len(spectra) == 10
+    assert len(root.findall('.//mzml:chromatogram', NAMESPACE)) == 1
+    assert [p.get('accession') for p in root.find('.//mzml:fileContent', NAMESPACE)] == ['MS:1000580']
+    assert spectra[0].get('defaultArrayLength') == '175'
+    assert spectra[0].find('.//mzml:selectedIon/mzml:cvParam[@accession="MS:1000744"]', NAMESPACE).get('value') == '325.0'
+
+    access = RawFileAccess(path_for(TEST_FILE))
+    access.select_instrument(Device.MS, 1)
+    binary = spectra[0].find('.//mzml:binaryDataArray/mzml:binary', NAMESPACE).text
+    masses = np.frombuffer(zlib.decompress(base64.b64decode(binary)), dtype='<f8')
+    assert np.array_equal(masses, access.get_centroid_stream(1, False).masses_as_numpy())
+
+    tic = root.find('.//mzml:chromatogram', NAMESPACE).findall('.//mzml:binary', NAMESPACE)[1].text
+    tics = np.frombuffer(zlib.decompress(base64.b64decode(tic)), dtype='<f4')
+    assert np.allclose(tics, [access.get_scan_stats_for_scan_number(s).tic for s in range(1, 11)])
+
+def test_write_mzml_with_numpress():
+    plain, compressed = io.BytesIO(), io.BytesIO()
+    write_mzml(path_for(TEST_FILE), plain)
+    write_mzml(path_for(TEST_FILE), compressed, use_numpress=True)
+
+    assert b'MS:1002746' in compressed.getvalue()
+    assert b'MS:1002748' in compressed.getvalue()
+    assert len(compressed.getvalue()) < len(plain.getvalue())
@@ -0,0 +1,18 @@
+from fisher_py.export.numpress import encode_linear, encode_slof, optimal_linear_fixed_point, optimal_slof_fixed_point
+import numpy as np
+
+
+def test_encode_linear_matches_reference_implementation():
+    data = np.array([100.0, 200.5, 300.25, 401.0, 401.0, 350.0])
+    assert encode_linear(data, 1000.0).hex() == '408f400000000000a0860100340f0300d21d58e3b2767ec8c830'
+
+def test_encode_linear_uses_optimal_fixed_point():
+    data = np.array([100.0, 200.5, 300.25])
+    fixed_point = optimal_linear_fixed_point(data)
+    assert encode_linear(data) == encode_linear(data, fixed_point)
+    assert np.frombuffer(encode_linear(data)[:8], dtype='>f8')[0] == fixed_point
+
+def test_encode_slof_matches_reference_implementation():
+    data = np.array([0.0, 10.0, 1e6])
+    assert optimal_slof_fixed_point(data) == 4743.0
+    assert encode_slof(data).hex() == '40b287000000000000006d2cf7ff'
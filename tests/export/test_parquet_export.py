@@ -0,0 +1,67 @@
+from fisher_py.raw_file_reader import RawFileAccess
+from fisher_py.data import Device
+from tests import path_for
+import numpy as np
+import pytest
+
+pq = pytest.importorskip('pyarrow.parquet')
+from fisher_py.export.parquet import read_spectra_batch, trailer_column_name, write_parquet, _get_trailer_column_names, _spectra_schema
+from fisher_py.export import parquet
+
+TEST_FILE = 'Angiotensin_325-CID.raw'
+
+
+def test_trailer_column_name():
+    assert trailer_column_name('Charge State:') == 'Charge State'
+    assert trailer_column_name('\x01') == ''
+
+
+def test_trailer_column_names_are_unique():
+    names = _get_trailer_column_names(['Charge State:', 'Charge State', '\x01', 'tic', 'Charge State #2'], ['scan_number', 'tic'])
+    assert names == ['Charge State', 'Charge State #2', '', 'tic #2', 'Charge State #2 #2']
+
+
+def test_spectra_schema_matches_batches():
+    access = RawFileAccess(path_for(TEST_FILE))
+    access.select_instrument(Device.MS, 1)
+    assert _spectra_schema(access).equals(read_spectra_batch(access, 1, 1).schema)
+    assert _spectra_schema(access, ['Charge State:'], True).equals(read_spectra_batch(access, 1, 1, trailer_columns=['Charge State:'], include_charges=True).schema)
+
+
+def test_read_spectra_batch_shares_peak_arrays():
+    access = RawFileAccess(path_for(TEST_FILE))
+    access.select_instrument(Device.MS, 1)
+    batch = read_spectra_batch(access, 1, 3, trailer_columns=['Charge State:'])
+
+    assert batch.column('scan_number').to_pylist() == [1, 2, 3]
+    assert batch.column('precursor_mz').to_pylist() == pytest.approx([325.0] * 3)
+    assert batch.column('Charge State').to_pylist() == [1, 1, 1]
+    centroid_stream = access.get_centroid_stream(2, False)
+    assert np.array_equal(batch.column('mz')[1].values.to_numpy(), centroid_stream.masses_as_numpy())
+
+
+def test_write_parquet_writes_row_group_per_chunk(tmp_path):
+    path = str(tmp_path / 'test.parquet')
+    assert write_parquet(path_for(TEST_FILE), path, chunk_size=4) == 10
+    assert pq.ParquetFile(path).metadata.num_row_groups == 3
+
+    table = pq.read_table(path, columns=['scan_number', 'ms_order', 'mz'], filters=[('scan_number', '>', 8)])
+    assert table.column('scan_number').to_pylist() == [9, 10]
+    assert table.column('ms_order').to_pylist() == [2, 2]
+
+
+def test_write_parquet_output_is_independent_of_workers(tmp_path):
+    single_threaded, multi_threaded = str(tmp_path / 'single.parquet'), str(tmp_path / 'multi.parquet')
+    write_parquet(path_for(TEST_FILE), single_threaded, chunk_size=3)
+    write_parquet(path_for(TEST_FILE), multi_threaded, chunk_size=3, workers=3)
+    assert pq.read_table(single_threaded).equals(pq.read_table(multi_threaded))
+
+
+def test_write_parquet_without_scans_writes_schema(tmp_path, monkeypatch):
+    path = str(tmp_path / 'empty.parquet')
+    monkeypatch.setattr(parquet, '_get_chunks', lambda first_scan_number, last_scan_number, chunk_size: [])
+    assert write_parquet(path_for(TEST_FILE), path, trailer_columns=[]) == 0
+
+    table = pq.read_table(path)
+    assert table.num_rows == 0
+    assert table.column_names[:3] == ['scan_number', 'retention_time', 'ms_order']
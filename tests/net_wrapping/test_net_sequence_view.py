@@ -0,0 +1,43 @@
+from fisher_py.net_wrapping.net_sequence_view import NetSequenceView
+from fisher_py.utils import to_net_array, to_net_list
+import numpy as np
+
+
+def test_views_convert_elements_on_access():
+    converted = []
+    def converter(value):
+        converted.append(value)
+        return value * 2
+
+    view = NetSequenceView[int](to_net_array([1, 2, 3, 4], int), converter)
+    assert len(view) == 4
+    assert converted == []
+    assert view[-1] == 8
+    assert converted == [4]
+
+def test_views_can_be_sliced():
+    view = NetSequenceView[int](to_net_list([3, 6, 8, 2], int))
+    assert view[1:3] == [6, 8]
+    assert view[::-1] == [2, 8, 6, 3]
+    assert view[::-1][1:] == [8, 6, 3]
+    assert view[1:][-1] == 2
+
+def test_views_can_be_converted_to_numpy():
+    values = [6.4, 7.7, 34.23, 1e-9]
+    view = NetSequenceView[float](to_net_array(values, float))
+    assert np.array_equal(view.to_numpy(), values)
+    assert np.array_equal(view[::-2].to_numpy(), [1e-9, 7.7])
+
+    view = NetSequenceView[int](to_net_list([3, 6, 8], int))
+    assert view.to_numpy().dtype == np.int32
+    assert np.array_equal(view[1:].to_numpy(), [6, 8])
+
+def test_views_follow_changes_of_net_lists():
+    net_list = to_net_list([3, 6], int)
+    view = NetSequenceView[int](net_list)
+    net_list.Add(9)
+    assert view.to_list() == [3, 6, 9]
+
+def test_view_repr_is_truncated():
+    view = NetSequenceView[int](to_net_array(list(range(100)), int))
+    assert repr(view) == 'NetSequenceView([0, 1, 2, 3, 4, 5, 6, 7, 8, 9, ...], length=100)'
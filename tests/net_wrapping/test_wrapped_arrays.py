@@ -85,3 +85,9 @@ def test_wrapped_arrays_can_use_python_indexing():
     assert result[0] == 6
     assert result[1] == 8
     assert result[2] == 2
+
+def test_wrapped_arrays_can_be_converted_to_numpy():
+    values = [6.4, 7.7, 34.23]
+    wrapped_list = WrappedNetArray[float](to_net_array(values, float))
+    assert wrapped_list.to_numpy().tolist() == values
+    assert wrapped_list[::-1] == values[::-1]
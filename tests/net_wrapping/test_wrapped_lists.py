@@ -1,7 +1,9 @@
 
 from fisher_py.net_wrapping.wrapped_net_list import WrappedNetList
 from fisher_py.utils import to_net_list
+import pickle
 import json
+import copy
 
 EPS = 1e-16
 
@@ -76,3 +78,24 @@ def test_wrapped_lists_can_use_python_indexing():
     assert result[0] == 6
     assert result[1] == 8
     assert result[2] == 2
+
+def test_wrapped_lists_read_from_the_net_list():
+    net_list = to_net_list([3, 6], int)
+    wrapped_list = WrappedNetList[int](net_list)
+    net_list.Add(9)
+    assert isinstance(wrapped_list, list)
+    assert wrapped_list == [3, 6, 9]
+    assert wrapped_list + [1] == [3, 6, 9, 1]
+    assert [1] + wrapped_list == [1, 3, 6, 9]
+    assert wrapped_list.pop() == 9
+    del wrapped_list[0]
+    assert list(net_list) == [6]
+    assert repr(wrapped_list) == '[6]'
+
+def test_wrapped_lists_are_copied_to_python_lists():
+    net_list = to_net_list([3, 6, 8], int)
+    wrapped_list = WrappedNetList[int](net_list)
+    for copied in [copy.copy(wrapped_list), copy.deepcopy(wrapped_list), pickle.loads(pickle.dumps(wrapped_list))]:
+        assert type(copied) is list
+        assert copied == [3, 6, 8]
+    assert list(net_list) == [3, 6, 8]
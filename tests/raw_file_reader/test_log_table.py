@@ -0,0 +1,31 @@
+import numpy as np
+from fisher_py.data.business import GenericDataTypes
+from fisher_py.raw_file_reader.data_model import TrailerTable
+from fisher_py.raw_file_reader.data_model.log_table import to_log_column, to_log_columns
+
+
+def test_log_columns_keep_the_type_of_the_field():
+    values, missing = to_log_column(['1', '2', '3'], GenericDataTypes.LONG)
+    assert values.dtype == np.int32
+    assert missing is None
+
+    values, missing = to_log_column(['1', 'n/a', '3'], GenericDataTypes.LONG)
+    assert values.dtype == np.int32
+    assert list(values) == [1, 0, 3]
+    assert list(missing) == [False, True, False]
+
+    values, missing = to_log_column(['0.5', '', '1.5'], GenericDataTypes.FLOAT)
+    assert values.dtype == np.float32
+    assert np.isnan(values[1])
+    assert list(missing) == [False, True, False]
+
+def test_log_table_reports_values_which_could_not_be_parsed():
+    headers = [(0, 'Charge State:', GenericDataTypes.LONG), (1, 'Scan Description:', GenericDataTypes.CHAR_STRING)]
+    columns, data_types, missing = to_log_columns([['2', ' a '], ['?', 'b']], headers)
+    trailer_table = TrailerTable(np.array([1, 2]), columns, data_types, missing)
+
+    assert trailer_table['Charge State:'].dtype == np.int32
+    assert list(trailer_table.get_missing('Charge State:')) == [False, True]
+    assert list(trailer_table.get_missing('Scan Description:')) == [False, False]
+    assert trailer_table.get_row(1) == {'Charge State:': 2, 'Scan Description:': 'a'}
+    assert trailer_table.get_row(2) == {'Charge State:': None, 'Scan Description:': 'b'}
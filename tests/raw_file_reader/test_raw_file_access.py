@@ -1,8 +1,11 @@
 import pytest
 from fisher_py.data.device import Device
+from fisher_py.data.filter_enums import MsOrderType
 from fisher_py.exceptions import RawFileException
 from fisher_py.exceptions.raw_file_exception import NoSelectedDeviceException, NoSelectedMsDeviceException
-from fisher_py.raw_file_reader import RawFileAccess
+from fisher_py.raw_file_reader import RawFileAccess, parallel_scans
+from fisher_py.net_wrapping.wrapped_net_array import WrappedNetArray
+from fisher_py.net_wrapping.wrapped_net_list import WrappedNetList
 from tests import assert_attributes, path_for
 
 REFERENCE_RAW_FILE = 'Angiotensin_325-CID.raw'
@@ -52,4 +55,134 @@ def test_instrument_dependent_attribute_matches_expected_data(attribute: str):
     access = RawFileAccess(path_for(REFERENCE_RAW_FILE))
     access.select_instrument(Device.MS, 1)
     assert_attributes(access, attribute)
-    
\ No newline at end of file
+    
+def test_centroid_stream_numpy_arrays_match_lists():
+    access = RawFileAccess(path_for(REFERENCE_RAW_FILE))
+    access.select_instrument(Device.MS, 1)
+    centroid_stream = access.get_centroid_stream(1, False)
+
+    assert list(centroid_stream.masses_as_numpy()) == centroid_stream.masses
+    assert list(centroid_stream.intensities_as_numpy()) == centroid_stream.intensities
+    assert list(centroid_stream.charges_as_numpy()) == centroid_stream.charges
+    assert list(centroid_stream.noises_as_numpy()) == centroid_stream.noises
+    assert list(centroid_stream.resolutions_as_numpy()) == centroid_stream.resolutions
+    assert list(centroid_stream.baselines_as_numpy()) == centroid_stream.baselines
+
+def test_segmented_scan_numpy_arrays_match_lists():
+    access = RawFileAccess(path_for(REFERENCE_RAW_FILE))
+    access.select_instrument(Device.MS, 1)
+    stats = access.get_scan_stats_for_scan_number(1)
+    segmented_scan = access.get_segmented_scan_from_scan_number(1, stats)
+
+    assert list(segmented_scan.positions_as_numpy()) == list(segmented_scan.positions)
+    assert list(segmented_scan.intensities_as_numpy()) == list(segmented_scan.intensities)
+
+def test_read_scans_packs_all_spectra():
+    access = RawFileAccess(path_for(REFERENCE_RAW_FILE))
+    access.select_instrument(Device.MS, 1)
+    packed_scans = access.read_scans(1, 10)
+
+    assert len(packed_scans) == 10
+    assert list(packed_scans.scan_numbers) == list(range(1, 11))
+    assert packed_scans.offsets[-1] == len(packed_scans.masses) == len(packed_scans.intensities) == len(packed_scans.charges)
+    assert packed_scans.retention_times[2] == access.retention_time_from_scan_number(3)
+
+    masses, intensities, charges = packed_scans.get_scan_from_scan_number(3)
+    centroid_stream = access.get_centroid_stream(3, False)
+    assert list(masses) == centroid_stream.masses
+    assert list(intensities) == centroid_stream.intensities
+    assert list(charges) == centroid_stream.charges
+
+def test_parallel_scans_processes_chunks_in_scan_order():
+    results = list(parallel_scans(path_for(REFERENCE_RAW_FILE), 1, 10, lambda access, scan_number: (scan_number, access.retention_time_from_scan_number(scan_number)), workers=3, chunk_size=2))
+    access = RawFileAccess(path_for(REFERENCE_RAW_FILE))
+    access.select_instrument(Device.MS, 1)
+
+    assert [sn for sn, _ in results] == list(range(1, 11))
+    assert all(rt == access.retention_time_from_scan_number(sn) for sn, rt in results)
+
+def test_scan_event_table_deduplicates_events():
+    access = RawFileAccess(path_for(REFERENCE_RAW_FILE))
+    access.select_instrument(Device.MS, 1)
+    event_table = access.get_scan_event_table()
+
+    assert len(event_table) == 10
+    assert len(event_table.events) == 1
+    assert list(event_table.ms_orders) == [MsOrderType.Ms2.value] * 10
+    assert list(event_table.find_scans(ms_order=MsOrderType.Ms2)) == list(range(1, 11))
+    assert len(event_table.find_scans(ms_order=MsOrderType.Ms)) == 0
+
+    event = event_table.get_event(3)
+    assert event.precursor_masses == (325.0,)
+    assert event.filter_string == access.get_scan_event_string_for_scan_number(3)
+
+def test_filters_are_looked_up_by_scan_event():
+    access = RawFileAccess(path_for(REFERENCE_RAW_FILE))
+    access.select_instrument(Device.MS, 1)
+
+    scan_filter = access.get_filter_for_scan_number(1)
+    assert str(scan_filter) == access.get_scan_event_string_for_scan_number(1)
+    assert str(scan_filter) == str(access.get_filters()[0])
+
+    # every call returns a filter of its own
+    other_filter = access.get_filter_for_scan_number(2)
+    assert other_filter is not scan_filter
+    other_filter.ms_order = MsOrderType.Ms
+    assert str(access.get_filter_for_scan_number(1)) == str(scan_filter)
+
+    filters = access.get_filters()
+    filters.append(filters[0])
+    assert len(access.get_filters()) == 1
+
+    event_table = access.get_scan_event_table()
+    assert event_table.filter_strings == [str(scan_filter)]
+    assert list(event_table.filter_ids) == [0] * 10
+
+def test_trailer_table_has_typed_columns():
+    access = RawFileAccess(path_for(REFERENCE_RAW_FILE))
+    access.select_instrument(Device.MS, 1)
+    trailer_table = access.trailer_table(['Charge State:', 'Monoisotopic M/Z:', 'Ion Injection Time (ms):'])
+
+    assert len(trailer_table) == 10
+    assert trailer_table.labels == ['Charge State:', 'Monoisotopic M/Z:', 'Ion Injection Time (ms):']
+    assert trailer_table['Charge State:'].dtype.kind == 'u'
+    assert trailer_table['Monoisotopic M/Z:'].dtype.kind == 'f'
+
+    labels = [h.label for h in access.get_trailer_extra_header_information()]
+    for scan_number in (1, 10):
+        values = access.get_trailer_extra_values(scan_number, False)
+        row = trailer_table.get_row(scan_number)
+        assert row['Charge State:'] == int(values[labels.index('Charge State:')])
+        assert row['Ion Injection Time (ms):'] == pytest.approx(float(values[labels.index('Ion Injection Time (ms):')]))
+
+    with pytest.raises(ValueError):
+        access.trailer_table(['Not A Field:'])
+
+def test_header_and_filter_lists_are_read_lazily():
+    access = RawFileAccess(path_for(REFERENCE_RAW_FILE))
+    access.select_instrument(Device.MS, 1)
+
+    headers = access.get_trailer_extra_header_information()
+    assert isinstance(headers, WrappedNetArray)
+    assert isinstance(headers, list)
+    assert headers[-1].label == headers.to_list()[-1].label
+    assert isinstance(access.get_status_log_header_information(), WrappedNetArray)
+    assert isinstance(access.get_filters(), WrappedNetList)
+
+    entry = access.get_trailer_extra_information(1)
+    assert isinstance(entry.labels, WrappedNetArray)
+    assert entry.labels[:2] == [h.label for h in headers[:2]]
+
+def test_status_log_table_matches_status_log_for_retention_time():
+    access = RawFileAccess(path_for(REFERENCE_RAW_FILE))
+    access.select_instrument(Device.MS, 1)
+    status_log = access.status_log_table()
+
+    assert len(status_log) == access.get_status_log_entries_count()
+    assert len(status_log.labels) == len(access.get_status_log_header_information())
+
+    label = status_log.labels[0]
+    retention_times = [access.retention_time_from_scan_number(scan_number) for scan_number in range(1, 11)]
+    for retention_time, value in zip(retention_times, status_log.lookup(label, retention_times)):
+        entry = access.get_status_log_for_retention_time(retention_time)
+        assert value == pytest.approx(float(entry.values[0]), rel=1e-3)
@@ -0,0 +1,14 @@
+import numpy as np
+from fisher_py.data.business import GenericDataTypes
+from fisher_py.raw_file_reader.data_model import StatusLogTable
+
+
+def test_status_log_table_looks_up_nearest_records():
+    retention_times = np.array([0.0, 1.0, 2.0, 4.0])
+    temperatures = np.array([20.0, 21.0, 22.0, 24.0])
+    status_log = StatusLogTable(retention_times, {'Temperature': temperatures}, {'Temperature': GenericDataTypes.FLOAT})
+
+    query = np.array([-1.0, 0.4, 0.6, 2.9, 3.1, 10.0])
+    assert list(status_log.get_indices_for_retention_times(query)) == [0, 0, 1, 2, 3, 3]
+    assert list(status_log.lookup('Temperature', query)) == [20.0, 20.0, 21.0, 22.0, 24.0, 24.0]
+    assert status_log.get_row_for_retention_time(1.2) == {'Temperature': 21.0}
@@ -0,0 +1,43 @@
+from fisher_py.async_raw_file import AsyncRawFile
+from fisher_py.raw_file import RawFile
+from tests import path_for
+import numpy as np
+import asyncio
+
+TEST_FILE = 'Angiotensin_325-CID.raw'
+
+
+def test_async_raw_file_serves_concurrent_requests():
+    raw_file = RawFile(path_for(TEST_FILE))
+
+    async def read():
+        async with AsyncRawFile(path_for(TEST_FILE), workers=2, max_pending=3) as async_raw_file:
+            spectra = await asyncio.gather(*[async_raw_file.get_spectrum(n) for n in range(1, 11)])
+            chromatogram = await async_raw_file.get_chromatogram(464.2491, 10, ms_filter='ms2')
+            iterated = [spectrum async for spectrum in async_raw_file.iterate_scans(1, 10, chunk_size=3)]
+            return spectra, chromatogram, iterated
+
+    spectra, chromatogram, iterated = asyncio.run(read())
+    for scan_number, (masses, intensities, _), (iterated_masses, _, _) in zip(range(1, 11), spectra, iterated):
+        expected_masses, expected_intensities, _, _ = raw_file.get_scan_from_scan_number(scan_number)
+        assert np.array_equal(masses, expected_masses)
+        assert np.array_equal(intensities, expected_intensities)
+        assert np.array_equal(iterated_masses, expected_masses)
+
+    expected_times, expected_intensities = raw_file.get_chromatogram(464.2491, 10, ms_filter='ms2')
+    assert np.array_equal(chromatogram[0], expected_times)
+    assert np.array_equal(chromatogram[1], expected_intensities)
+
+
+def test_async_raw_file_can_be_used_from_several_event_loops():
+    async_raw_file = AsyncRawFile(path_for(TEST_FILE), workers=2, max_pending=2)
+
+    async def read():
+        return await asyncio.gather(*[async_raw_file.get_spectrum(n) for n in range(1, 6)])
+
+    try:
+        first, second = asyncio.run(read()), asyncio.run(read())
+    finally:
+        async_raw_file.close()
+    for (first_masses, _, _), (second_masses, _, _) in zip(first, second):
+        assert np.array_equal(first_masses, second_masses)
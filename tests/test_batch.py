@@ -0,0 +1,21 @@
+from fisher_py.batch import process_files
+from tests import path_for
+
+TEST_FILE = 'Angiotensin_325-CID.raw'
+
+
+def count_scans(path: str) -> int:
+    from fisher_py import RawFile
+    return RawFile(path).number_of_scans
+
+
+def test_batch_processes_files_and_isolates_errors():
+    progress = list()
+    paths = [path_for(TEST_FILE), 'non-existent.raw', path_for(TEST_FILE)]
+    results = process_files(paths, count_scans, workers=2, progress=lambda completed, total, _: progress.append((completed, total)))
+
+    assert [r.path for r in results] == paths
+    assert results[0].succeeded and results[0].result == 10
+    assert not results[1].succeeded and 'FileNotFoundError' in results[1].error
+    assert results[2].succeeded and results[2].result == 10
+    assert progress == [(1, 3), (2, 3), (3, 3)]
@@ -0,0 +1,16 @@
+from benchmarks.suite import run_benchmarks, compare_results
+from tests import path_for
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(path_for('Angiotensin_325-CID.raw'), ['scan_reads', 'tic_ms2', 'synthetic_xic_extract'], repeat=1)
+    assert set(results['results'].keys()) == {'scan_reads', 'tic_ms2', 'synthetic_xic_extract'}
+    assert results['results']['scan_reads']['items'] == 10
+    assert results['meta']['raw_file'] == 'Angiotensin_325-CID.raw'
+
+
+def test_compare_results():
+    baseline = {'results': {'a': {'median': 1.0, 'median_per_item': 1.0}, 'b': {'median': 1.0, 'median_per_item': 0.5}}}
+    current = {'results': {'a': {'median': 1.05, 'median_per_item': 1.05}, 'b': {'median': 2.0, 'median_per_item': 1.0}, 'c': {'median': 1.0, 'median_per_item': 1.0}}}
+    rows = compare_results(current, baseline, threshold=0.1)
+    assert [(r['name'], r['regressed']) for r in rows] == [('a', False), ('b', True)]
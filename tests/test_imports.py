@@ -0,0 +1,29 @@
+import subprocess
+import sys
+import os
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+
+@pytest.mark.parametrize('statement', ['import fisher_py', 'import fisher_py.scan_index_cache', 'import fisher_py.export.numpress', 'import fisher_py.xic_index', 'import fisher_py.store',
+                                       'from fisher_py.data.business import TraceType'])
+def test_import_does_not_load_net_runtime(statement: str):
+    code = f'{statement}\nimport sys\nassert "clr" not in sys.modules and "pythonnet" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], env=dict(os.environ, PYTHONPATH=SRC_DIR), check=True)
+
+
+def test_lazy_attribute_is_imported_on_access():
+    import fisher_py
+    from fisher_py.raw_file import RawFile
+    from fisher_py.net_wrapping import is_runtime_loaded
+    assert fisher_py.RawFile is RawFile
+    assert is_runtime_loaded()
+
+
+def test_star_import_of_lazy_package():
+    namespace = dict()
+    exec('from fisher_py.raw_file_reader import *', namespace)
+    from fisher_py.raw_file_reader.raw_file_access import RawFileAccess
+    assert namespace['RawFileAccess'] is RawFileAccess
+    assert 'parallel_map' in namespace
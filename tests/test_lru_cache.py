@@ -0,0 +1,34 @@
+from fisher_py.lru_cache import LruCache
+
+
+def test_lru_cache_returns_cached_values():
+    cache = LruCache(100, len)
+    cache.put(1, 'abc')
+    assert cache.get(1) == 'abc'
+    assert cache.get(2) is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+def test_lru_cache_evicts_least_recently_used_entries():
+    cache = LruCache(10, len)
+    cache.put(1, 'aaaa')
+    cache.put(2, 'bbbb')
+    cache.get(1)
+    cache.put(3, 'cccc')
+
+    assert 1 in cache
+    assert 2 not in cache
+    assert 3 in cache
+    assert cache.size_bytes == 8
+    assert cache.evictions == 1
+
+def test_lru_cache_ignores_entries_larger_than_budget():
+    cache = LruCache(3, len)
+    cache.put(1, 'abcd')
+    assert len(cache) == 0
+    assert cache.size_bytes == 0
+
+def test_lru_cache_with_zero_budget_is_disabled():
+    cache = LruCache(0, len)
+    cache.put(1, 'a')
+    assert cache.get(1) is None
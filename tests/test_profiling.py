@@ -0,0 +1,28 @@
+from fisher_py import profiling
+from fisher_py.raw_file_reader import RawFileAccess
+from fisher_py.data.business import CentroidStream
+from fisher_py.data import Device
+from tests import path_for
+
+
+def test_profile_records_wrapped_members():
+    masses_property = CentroidStream.masses
+    access = RawFileAccess(path_for('Angiotensin_325-CID.raw'))
+    access.select_instrument(Device.MS, 1)
+
+    with profiling.profile() as stats:
+        for scan_number in range(1, 4):
+            access.get_centroid_stream(scan_number, False).masses
+            access.get_scan_event_for_scan_number(scan_number)
+
+    assert stats['CentroidStream.masses'].calls == 3
+    assert stats['RawFileAccess.get_scan_event_for_scan_number'].calls == 3
+    assert sum(stats['RawFileAccess.get_centroid_stream'].histogram) == 3
+    assert 'CentroidStream.masses' in profiling.report()
+
+    # members are restored when profiling ends
+    assert not profiling.is_enabled()
+    assert CentroidStream.masses is masses_property
+    access.get_scan_event_for_scan_number(1)
+    assert profiling.get_stats()['RawFileAccess.get_scan_event_for_scan_number'].calls == 3
+    access.dispose()
@@ -1,7 +1,10 @@
 
 from fisher_py.exceptions.raw_file_exception import RawFileException
-from fisher_py.raw_file import RawFile
+from fisher_py.raw_file import RawFile, AveragingWindow
 from tests import path_for
+import numpy as np
+import shutil
+import os
 
 TEST_FILE = 'Angiotensin_325-CID.raw'
 PRECURSOR_MZ = 325
@@ -52,15 +55,60 @@ def test_raw_file_chromatogram_can_be_retrieved():
     assert len(t) == 0
     assert len(c) == 0
 
+def test_raw_file_chromatograms_match_single_chromatograms():
+    file = RawFile(path_for(TEST_FILE))
+    mzs = [464.2491, 382.2159, 463.7476, 500.0]
+    t, c = file.get_chromatograms(mzs, 10, ms_filter='ms2', chunk_size=3)
+    assert c.shape == (len(mzs), len(TIMES))
+    assert np.all(c[3] == 0)
+
+    for i, mz in enumerate(mzs):
+        single_t, single_c = file.get_chromatogram(mz, 10, ms_filter='ms2')
+        assert np.array_equal(single_t, t)
+        assert np.array_equal(single_c, c[i])
+
+def test_raw_file_index_chromatograms_match_net_chromatograms(tmp_path):
+    file = RawFile(path_for(TEST_FILE))
+    mzs = [464.2491, 382.2159, 463.7476, 500.0]
+    net_t, net_c = file.get_chromatograms(mzs, 10, ms_filter='ms2')
+    index_t, index_c = file.get_chromatograms(mzs, 10, ms_filter='ms2', engine='index')
+    assert np.allclose(index_t, net_t)
+    assert np.allclose(index_c, net_c)
+
+    t, c = file.get_chromatogram(mzs[0], 10, ms_filter='ms2', engine='index')
+    assert np.allclose(c, net_c[0])
+    assert len(file.get_chromatogram(PRECURSOR_MZ, TOLERANCE, engine='index')[0]) == 0
+
+    assert not isinstance(RawFile(path_for(TEST_FILE)).get_xic_index('ms2', str(tmp_path / 'xic')).masses, np.memmap)
+    mapped_file = RawFile(path_for(TEST_FILE))
+    mapped_index = mapped_file.get_xic_index('ms2', str(tmp_path / 'xic'))
+    assert isinstance(mapped_index.masses, np.memmap)
+    assert np.allclose(mapped_file.get_chromatograms(mzs, 10, ms_filter='ms2', engine='index')[1], net_c)
+
+    # indices of another MS order or without source key are not reused
+    assert not isinstance(RawFile(path_for(TEST_FILE)).get_xic_index('ms', str(tmp_path / 'xic')).masses, np.memmap)
+    file.get_xic_index('ms2').save(str(tmp_path / 'unkeyed'))
+    assert not isinstance(RawFile(path_for(TEST_FILE)).get_xic_index('ms2', str(tmp_path / 'unkeyed')).masses, np.memmap)
+
 def test_raw_file_tic_ms2_can_be_retrieved():
     file = RawFile(path_for(TEST_FILE))
-    times, total_ion_current = file.get_tic_ms2(PRECURSOR_MZ, TOLERANCE)
+    times, total_ion_current = file.get_tic_ms2(PRECURSOR_MZ, TOLERANCE, from_peaks=True)
 
     expected_ion_currents = [37451832.53613281, 37663065.91699219, 45855594.28125, 30816050.90820312, 41055303.14746094, 34280428.34375, 35895350.90429688, 33482430.11523438, 36745244.81738281, 35045496.85644531]
     for t_actual, t_expected, tic_actual, tic_expected in zip(times, TIMES, total_ion_current, expected_ion_currents):
         assert abs(t_actual - t_expected) < TOLERANCE
         assert abs(tic_actual - tic_expected) < TOLERANCE
 
+def test_raw_file_tic_ms2_uses_scan_statistics_by_default():
+    file = RawFile(path_for(TEST_FILE))
+    times, total_ion_current = file.get_tic_ms2(PRECURSOR_MZ, TOLERANCE)
+    assert np.allclose(times, TIMES)
+    assert np.array_equal(total_ion_current, file.scan_index['tic'])
+
+    (times_a, tic_a), (times_b, tic_b) = file.get_tics_ms2([PRECURSOR_MZ, 500], TOLERANCE)
+    assert np.array_equal(times_a, times) and np.array_equal(tic_a, total_ion_current)
+    assert len(times_b) == 0 and len(tic_b) == 0
+
 def test_raw_file_scan_ms2_can_be_retrieved():
     file = RawFile(path_for(TEST_FILE))
     lenths = [175, 199, 163, 150, 142, 186, 174, 114, 203]
@@ -98,4 +146,102 @@ def test_raw_file_ms2_getting_scan_number_from_retention_time_works_as_expected(
 def test_raw_file_get_scan_event_str_from_scan_number_works_as_expected():
     file = RawFile(path_for(TEST_FILE))
     desc = file.get_scan_event_str_from_scan_number(1)
-    assert desc == 'FTMS + p ESI Full ms2 325.0000@cid35.00 [150.0000-2000.0000]'
\ No newline at end of file
+    assert desc == 'FTMS + p ESI Full ms2 325.0000@cid35.00 [150.0000-2000.0000]'
+
+def test_raw_file_scan_index_matches_expected_values():
+    file = RawFile(path_for(TEST_FILE))
+    scan_index = file.scan_index
+    assert list(scan_index['scan_number']) == list(range(1, 11))
+    assert all(scan_index['ms_order'] == 2)
+    assert all(abs(scan_index['precursor_mz'] - PRECURSOR_MZ) < TOLERANCE)
+
+    for rt_actual, rt_expected in zip(scan_index['retention_time'], TIMES):
+        assert abs(rt_actual - rt_expected) < TOLERANCE
+
+def test_raw_file_scan_index_matches_scan_event_table():
+    file = RawFile(path_for(TEST_FILE))
+    event_table = file._raw_file_access.get_scan_event_table()
+    assert np.array_equal(file.scan_index['precursor_mz'], event_table.precursor_masses, equal_nan=True)
+    assert np.array_equal(file.scan_index['isolation_width'], event_table.isolation_widths, equal_nan=True)
+    assert np.array_equal(file.scan_index['activation'], event_table.activation_types)
+
+def test_raw_file_ms2_getting_scan_number_from_retention_time_with_precursor_works_as_expected():
+    file = RawFile(path_for(TEST_FILE))
+
+    for i, rt in enumerate(TIMES[:-1]):
+        sn, found_rt = file.get_ms2_scan_number_from_retention_time(rt, PRECURSOR_MZ)
+        assert sn == i + 1
+        assert abs(found_rt - rt) < TOLERANCE
+
+def test_raw_file_scan_index_is_reused_from_cache(tmp_path):
+    file = RawFile(path_for(TEST_FILE), index_cache_dir=str(tmp_path))
+    sidecar_files = list(tmp_path.glob('*.fpyidx'))
+    assert len(sidecar_files) == 1
+
+    cached_file = RawFile(path_for(TEST_FILE), index_cache_dir=str(tmp_path))
+    assert isinstance(cached_file.scan_index, np.memmap)
+    assert (cached_file.scan_index == file.scan_index).all()
+    assert (cached_file.ms2_filter_masses == file.ms2_filter_masses).all()
+
+def test_raw_file_scan_index_cache_is_invalidated_when_file_changes(tmp_path):
+    raw_file_path = tmp_path / TEST_FILE
+    shutil.copy(path_for(TEST_FILE), raw_file_path)
+    RawFile(str(raw_file_path), use_index_cache=True)
+    assert os.path.isfile(f'{raw_file_path}.fpyidx')
+
+    stat = os.stat(raw_file_path)
+    os.utime(raw_file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    file = RawFile(str(raw_file_path), use_index_cache=True)
+    assert not isinstance(file.scan_index, np.memmap)
+
+def test_raw_file_spectra_are_cached():
+    file = RawFile(path_for(TEST_FILE))
+    masses, _, _, desc = file.get_scan_from_scan_number(2)
+    cached_masses, _, _, cached_desc = file.get_scan_from_scan_number(2)
+    shared_masses, _, _, _ = file.get_scan_from_scan_number(2, copy=False)
+
+    assert np.array_equal(cached_masses, masses)
+    assert cached_desc == desc
+    assert masses.flags.writeable
+    assert shared_masses is file.get_scan_from_scan_number(2, copy=False)[0]
+    assert not shared_masses.flags.writeable
+    assert file.spectrum_cache.hits == 3
+    assert file.spectrum_cache.misses == 1
+    assert file.event_string_cache.hits == 3
+
+def test_raw_file_spectrum_cache_can_be_disabled():
+    file = RawFile(path_for(TEST_FILE), spectrum_cache_size=0)
+    masses, _, _, _ = file.get_scan_from_scan_number(2)
+    other_masses, _, _, _ = file.get_scan_from_scan_number(2)
+
+    assert other_masses is not masses
+    assert masses.flags.writeable
+    assert len(file.spectrum_cache) == 0
+    assert file.event_string_cache.hits == 1
+
+    file = RawFile(path_for(TEST_FILE), event_string_cache_size=0)
+    file.get_scan_from_scan_number(2)
+    assert len(file.event_string_cache) == 0
+
+def test_raw_file_parallel_scans_yields_results_in_scan_order():
+    file = RawFile(path_for(TEST_FILE))
+    lengths = list(file.parallel_scans(lambda access, scan_number: (scan_number, access.get_centroid_stream(scan_number, False).length), workers=4))
+
+    assert [sn for sn, _ in lengths] == list(range(1, 11))
+    assert [l for _, l in lengths][:9] == [175, 199, 163, 150, 142, 186, 174, 114, 203]
+
+def test_raw_file_averaged_scan_groups_match_serial_averages():
+    file = RawFile(path_for(TEST_FILE))
+    groups = [[1, 2, 3], [4, 5, 6, 7], AveragingWindow(TIMES[0], TIMES[-2], PRECURSOR_MZ)]
+    averages = file.get_averaged_scan_groups(groups, workers=2, merge_in_parallel=True, merge_task_batching=3)
+    assert len(averages) == len(groups)
+
+    for group, (masses, intensities, charges) in zip(groups[:2], averages):
+        averaged_scan = file._raw_file_access.average_scans(group)
+        assert len(masses) > 0
+        assert np.allclose(masses, averaged_scan.preferred_masses_as_numpy())
+        assert np.allclose(intensities, averaged_scan.preferred_intensities_as_numpy())
+
+    window_masses, window_intensities, _ = file.get_average_ms2_scans_by_rt(TIMES[0], TIMES[-2], PRECURSOR_MZ)
+    assert np.array_equal(averages[2][0], window_masses)
+    assert np.array_equal(averages[2][1], window_intensities)
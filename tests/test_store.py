@@ -0,0 +1,66 @@
+from fisher_py.raw_file import RawFile
+from fisher_py.store import SpectralStore, write_store
+from fisher_py.data.business import TraceType
+from fisher_py.raw_file_reader import RawFileAccess
+from fisher_py.data import Device
+from tests import path_for
+import numpy as np
+import subprocess
+import pytest
+import sys
+import os
+
+TEST_FILE = 'Angiotensin_325-CID.raw'
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+
+def _write_store(tmp_path, store_format: str) -> str:
+    path = str(tmp_path / ('store.h5' if store_format == 'hdf5' else 'store'))
+    assert write_store(path_for(TEST_FILE), path, store_format, chunk_size=3) == 10
+    return path
+
+
+@pytest.mark.parametrize('store_format', ['directory', 'hdf5'])
+def test_store_round_trip(tmp_path, store_format: str):
+    if store_format == 'hdf5':
+        pytest.importorskip('h5py')
+    raw_file = RawFile(path_for(TEST_FILE))
+
+    with SpectralStore(_write_store(tmp_path, store_format)) as store:
+        assert (store.first_scan, store.last_scan) == (raw_file.first_scan, raw_file.last_scan)
+        assert store.total_time_min == pytest.approx(raw_file.total_time_min)
+        assert np.array_equal(store.scan_index, raw_file.scan_index)
+
+        for scan_number in (10, 1, 4, 3):
+            masses, intensities, charges, filter_string = store.get_scan_from_scan_number(scan_number)
+            expected = raw_file.get_scan_from_scan_number(scan_number)
+            assert np.array_equal(masses, expected[0])
+            assert np.array_equal(intensities, expected[1])
+            assert np.array_equal(charges, expected[2])
+            assert filter_string == expected[3]
+        assert store.get_scan_from_scan_number(1)[0].flags.writeable
+        assert not store.get_scan_from_scan_number(1, copy=False)[0].flags.writeable
+
+        rt = raw_file.get_retention_time_from_scan_number(5)
+        assert store.get_ms2_scan_number_from_retention_time(rt) == raw_file.get_ms2_scan_number_from_retention_time(rt)
+        assert store.get_tic_ms2(325.0)[1].tolist() == pytest.approx(raw_file.get_tic_ms2(325.0)[1].tolist())
+
+        rts, intensities = store.get_chromatogram(500.0, 10000, ms_filter='ms2')
+        expected_rts, expected_intensities = raw_file.get_xic_index('ms2').extract([500.0], 10000)
+        assert np.allclose(rts, expected_rts)
+        assert np.allclose(intensities, expected_intensities[0])
+        assert np.array_equal(store.get_chromatogram(0, 0, TraceType.TIC, ms_filter='ms2')[1], raw_file.scan_index['tic'])
+
+        access = RawFileAccess(path_for(TEST_FILE))
+        access.select_instrument(Device.MS, 1)
+        trailer_table = store.trailer_table()
+        assert trailer_table.labels == access.trailer_table().labels
+        assert np.array_equal(trailer_table['Charge State:'], access.trailer_table()['Charge State:'])
+        assert np.allclose(store.status_log_table().retention_times, access.status_log_table().retention_times)
+
+
+def test_store_is_read_without_net_runtime(tmp_path):
+    path = _write_store(tmp_path, 'directory')
+    code = f'from fisher_py import SpectralStore\nimport sys\nstore = SpectralStore({path!r})\nstore.get_scan_from_scan_number(2)\nstore.get_chromatogram(500.0, 10, ms_filter="ms2")\n' \
+           'assert "clr" not in sys.modules and "pythonnet" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], env=dict(os.environ, PYTHONPATH=SRC_DIR), check=True)
@@ -0,0 +1,44 @@
+from fisher_py.utils import to_net_array, to_net_list, to_numpy_array
+from fisher_py.data.business import CentroidStream, ChromatogramSignal
+import numpy as np
+import pytest
+
+
+def test_numeric_values_are_converted_as_block():
+    values = np.linspace(0, 1, 1000)
+    net_array = to_net_array(values, float)
+    assert net_array.Length == 1000
+    assert np.array_equal(to_numpy_array(net_array), values)
+
+    net_list = to_net_list([3, 6, 8], int)
+    assert net_list.Count == 3
+    assert list(net_list) == [3, 6, 8]
+
+
+def test_non_numeric_values_are_converted_element_wise():
+    assert list(to_net_array(['a', 'b'], str)) == ['a', 'b']
+    assert to_net_list([], float).Count == 0
+
+    # floats are not silently truncated to integers
+    with pytest.raises(TypeError):
+        to_net_list([1.5], int)
+
+    # integers are not silently wrapped around and nested values are not flattened
+    with pytest.raises(OverflowError):
+        to_net_array([2**31 + 5, 1], int)
+    with pytest.raises(TypeError):
+        to_net_list([[1.0, 2.0], [3.0, 4.0]], float)
+
+
+def test_setters_accept_numpy_arrays():
+    centroid_stream = CentroidStream()
+    centroid_stream.masses = np.array([100.0, 200.0])
+    assert np.array_equal(centroid_stream.masses_as_numpy(), [100.0, 200.0])
+
+    signal = ChromatogramSignal.from_time_intensity_scan(np.array([1.0, 2.0]), np.array([3.0, 4.0]), np.array([1, 2]))
+    assert list(signal.signal_scans) == [1, 2]
+
+    signal.signal_scans = np.array([5, 6])
+    assert list(signal.signal_scans) == [5, 6]
+    signal.signal_scans = [7, 8]
+    assert list(signal.signal_scans) == [7, 8]